@@ -2,11 +2,11 @@
 
 from __future__ import annotations
 
-import hashlib
 import shutil
 import urllib.request
 from pathlib import Path
 
+from better11.hash_cache import hash_file
 from better11.media_catalog import MediaCatalog, MediaEntry
 
 
@@ -52,12 +52,7 @@ class ApplicationManager:
     def _verify_checksum(self, file_path: Path, expected_checksum: str) -> None:
         """Validate the SHA256 checksum of *file_path* against *expected_checksum*."""
 
-        digest = hashlib.sha256()
-        with file_path.open("rb") as file_handle:
-            for chunk in iter(lambda: file_handle.read(8192), b""):
-                digest.update(chunk)
-
-        actual_checksum = digest.hexdigest()
+        actual_checksum = hash_file(file_path, "sha256")
         if actual_checksum.lower() != expected_checksum.lower():
             raise ValueError(
                 f"Checksum mismatch for {file_path}: expected {expected_checksum}, got {actual_checksum}"
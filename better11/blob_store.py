@@ -0,0 +1,132 @@
+"""
+Content-Addressed Blob Store
+
+Deduplicated storage for package installers:
+- Blobs are stored once under ``blobs/<aa>/<sha256>`` regardless of how
+  many package ids or versions refer to them
+- Ingest hashes and copies a file in a single read
+- Logical paths are hardlinked to the blob, falling back to a copy where
+  links are not supported (other volume, FAT/exFAT)
+- Blobs are read-only, so writing through one hardlink cannot corrupt
+  every package that shares it
+"""
+
+import os
+import stat
+import shutil
+import hashlib
+import tempfile
+from typing import Iterator, Tuple
+
+
+# Read size used while hashing and copying into the store
+INGEST_CHUNK_SIZE = 1024 * 1024
+
+_READ_ONLY = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+
+
+class BlobStore:
+    """SHA-256 addressed file store"""
+
+    def __init__(self, root: str):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def path_for(self, digest: str) -> str:
+        """Location of the blob for digest"""
+        return os.path.join(self.root, digest[:2], digest)
+
+    def contains(self, digest: str) -> bool:
+        """Whether a blob with this digest is stored"""
+        return os.path.exists(self.path_for(digest))
+
+    def ingest(self, source_path: str) -> Tuple[str, int]:
+        """Copy a file into the store, returning (sha256, size)
+
+        The file is hashed while it is copied to a temporary file in the
+        store, which is then renamed to its digest. If the blob already
+        exists the copy is discarded.
+        """
+        sha256 = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.root, suffix=".ingest")
+
+        try:
+            with open(source_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                for chunk in iter(lambda: src.read(INGEST_CHUNK_SIZE), b""):
+                    sha256.update(chunk)
+                    dst.write(chunk)
+                    size += len(chunk)
+
+            digest = sha256.hexdigest()
+            blob_path = self.path_for(digest)
+            if os.path.exists(blob_path):
+                os.remove(temp_path)
+            else:
+                os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+                shutil.copystat(source_path, temp_path)
+                os.chmod(temp_path, _READ_ONLY)
+                os.replace(temp_path, blob_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        return digest, size
+
+    def link(self, digest: str, dest_path: str):
+        """Materialize a blob at dest_path"""
+        blob_path = self.path_for(digest)
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        if os.path.lexists(dest_path):
+            self.unlink(dest_path)
+
+        # Also covers blobs stored before they were made read-only
+        self.seal(digest)
+        try:
+            os.link(blob_path, dest_path)
+        except OSError:
+            shutil.copy2(blob_path, dest_path)
+
+    def seal(self, digest: str):
+        """Make a blob, and with it every hardlink to it, read-only"""
+        blob_path = self.path_for(digest)
+        if os.path.exists(blob_path) and os.stat(blob_path).st_mode & 0o222:
+            os.chmod(blob_path, _READ_ONLY)
+
+    @staticmethod
+    def unlink(path: str):
+        """Remove a read-only link or copy of a blob
+
+        Windows refuses to delete read-only files. Clearing the attribute
+        also clears it on the other hardlinks, so callers reseal the blob
+        with :meth:`seal` if it is still referenced.
+        """
+        try:
+            os.remove(path)
+        except PermissionError:
+            os.chmod(path, os.stat(path).st_mode | stat.S_IWUSR)
+            os.remove(path)
+
+    def remove(self, digest: str) -> int:
+        """Delete a blob, returning the bytes freed"""
+        blob_path = self.path_for(digest)
+        try:
+            size = os.path.getsize(blob_path)
+            self.unlink(blob_path)
+        except FileNotFoundError:
+            return 0
+        return size
+
+    def iter_blobs(self) -> Iterator[Tuple[str, int]]:
+        """Yield (digest, size) for every stored blob"""
+        for prefix in os.scandir(self.root):
+            if not prefix.is_dir(follow_symlinks=False):
+                continue
+            for entry in os.scandir(prefix.path):
+                if entry.is_file(follow_symlinks=False):
+                    yield entry.name, entry.stat().st_size
+
+    def total_size(self) -> int:
+        """Bytes used by all blobs"""
+        return sum(size for _, size in self.iter_blobs())
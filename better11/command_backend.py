@@ -0,0 +1,343 @@
+"""
+Command Execution Backends
+
+Pluggable process execution for the package managers:
+- ``AsyncioBackend`` runs commands on a private event loop thread with
+  per-command timeouts, line-by-line streaming of stdout and stderr,
+  cancellation through the returned future and a bound on concurrent
+  processes
+- ``FakeBackend`` replays recorded transcripts, so every package manager
+  can be exercised and benchmarked without the real tools installed
+
+Both return ``subprocess.CompletedProcess`` with text output, like
+``subprocess.run(..., capture_output=True, text=True)``. A command that
+times out is killed and reported with ``TIMEOUT_RETURNCODE``.
+``CancelScope`` groups the commands of one call so a caller that gives up
+on it can kill them without touching other users of a shared backend.
+"""
+
+import os
+import json
+import time
+import locale
+import asyncio
+import threading
+import subprocess
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+# Return code reported for commands killed after their timeout
+TIMEOUT_RETURNCODE = 124
+# Return code reported by FakeBackend for commands without a transcript
+NOT_FOUND_RETURNCODE = 127
+# Processes the default backend runs at once
+DEFAULT_MAX_CONCURRENCY = 8
+# Longest output line read in one piece
+STREAM_LIMIT = 1024 * 1024
+
+# Called with ("stdout" | "stderr", line) as output arrives
+LineCallback = Callable[[str, str], None]
+
+
+def _translate_newlines(text: str) -> str:
+    """Universal newline translation, as ``text=True`` does"""
+    return text.replace('\r\n', '\n').replace('\r', '\n')
+
+
+class CancelScope:
+    """Commands started on behalf of one call
+
+    Cancelling the scope cancels, and so kills, every command still running
+    in it; commands submitted afterwards are cancelled immediately.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    def add(self, future: Future):
+        """Track a command's future"""
+        with self._lock:
+            if not self.cancelled:
+                self._futures.add(future)
+                return
+        future.cancel()
+
+    def discard(self, future: Future):
+        """Stop tracking a finished command"""
+        with self._lock:
+            self._futures.discard(future)
+
+    def cancel(self):
+        """Cancel every tracked command and any submitted later"""
+        with self._lock:
+            self.cancelled = True
+            futures, self._futures = list(self._futures), set()
+        for future in futures:
+            future.cancel()
+
+
+class CommandBackend(ABC):
+    """Runs commands for a package manager"""
+
+    @abstractmethod
+    def submit(
+        self,
+        cmd: Sequence[str],
+        timeout: Optional[float] = None,
+        on_line: Optional[LineCallback] = None
+    ) -> Future:
+        """Start a command; the future resolves to a CompletedProcess
+
+        Cancelling the future kills the process.
+        """
+
+    def run(
+        self,
+        cmd: Sequence[str],
+        timeout: Optional[float] = None,
+        on_line: Optional[LineCallback] = None
+    ) -> subprocess.CompletedProcess:
+        """Run a command and wait for it"""
+        return self.submit(cmd, timeout, on_line).result()
+
+    async def run_async(
+        self,
+        cmd: Sequence[str],
+        timeout: Optional[float] = None,
+        on_line: Optional[LineCallback] = None
+    ) -> subprocess.CompletedProcess:
+        """Await a command from any event loop"""
+        return await asyncio.wrap_future(self.submit(cmd, timeout, on_line))
+
+    def cancel_all(self):
+        """Cancel every command still running"""
+
+
+class AsyncioBackend(CommandBackend):
+    """Run commands as asyncio subprocesses on a background loop"""
+
+    def __init__(self, max_concurrency: int = DEFAULT_MAX_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._futures = set()
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+
+                def serve():
+                    asyncio.set_event_loop(loop)
+                    self._semaphore = asyncio.Semaphore(self.max_concurrency)
+                    loop.call_soon(ready.set)
+                    loop.run_forever()
+
+                threading.Thread(target=serve, name="command-backend", daemon=True).start()
+                ready.wait()
+                self._loop = loop
+            return self._loop
+
+    async def _pump(self, stream, name: str, sink: List[str], on_line: Optional[LineCallback]):
+        encoding = locale.getpreferredencoding(False)
+        while True:
+            line = await stream.readline()
+            if not line:
+                return
+            text = _translate_newlines(line.decode(encoding, errors='replace'))
+            sink.append(text)
+            if on_line:
+                on_line(name, text.rstrip('\n'))
+
+    async def _execute(
+        self,
+        cmd: Sequence[str],
+        timeout: Optional[float],
+        on_line: Optional[LineCallback]
+    ) -> subprocess.CompletedProcess:
+        async with self._semaphore:
+            try:
+                process = await asyncio.create_subprocess_exec(
+                    *cmd,
+                    stdin=asyncio.subprocess.DEVNULL,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=asyncio.subprocess.PIPE,
+                    limit=STREAM_LIMIT
+                )
+            except OSError as e:
+                return subprocess.CompletedProcess(list(cmd), NOT_FOUND_RETURNCODE, "", str(e))
+
+            stdout: List[str] = []
+            stderr: List[str] = []
+            try:
+                await asyncio.wait_for(asyncio.gather(
+                    self._pump(process.stdout, "stdout", stdout, on_line),
+                    self._pump(process.stderr, "stderr", stderr, on_line),
+                    process.wait()
+                ), timeout)
+            except asyncio.TimeoutError:
+                self._kill(process)
+                await process.wait()
+                stderr.append(f"Timed out after {timeout} seconds\n")
+                return subprocess.CompletedProcess(
+                    list(cmd), TIMEOUT_RETURNCODE, ''.join(stdout), ''.join(stderr)
+                )
+            except asyncio.CancelledError:
+                self._kill(process)
+                await process.wait()
+                raise
+
+            return subprocess.CompletedProcess(list(cmd), process.returncode, ''.join(stdout), ''.join(stderr))
+
+    @staticmethod
+    def _kill(process):
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+
+    def submit(
+        self,
+        cmd: Sequence[str],
+        timeout: Optional[float] = None,
+        on_line: Optional[LineCallback] = None
+    ) -> Future:
+        """Start a command on the backend loop"""
+        future = asyncio.run_coroutine_threadsafe(self._execute(cmd, timeout, on_line), self._ensure_loop())
+        with self._lock:
+            self._futures.add(future)
+        future.add_done_callback(self._forget)
+        return future
+
+    def _forget(self, future: Future):
+        with self._lock:
+            self._futures.discard(future)
+
+    def cancel_all(self):
+        """Cancel every command still running"""
+        with self._lock:
+            futures = list(self._futures)
+        for future in futures:
+            future.cancel()
+
+
+@dataclass
+class Transcript:
+    """Recorded output of one command"""
+    command: List[str]
+    stdout: str = ""
+    stderr: str = ""
+    returncode: int = 0
+    duration: float = 0.0
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Transcript":
+        return cls(
+            command=list(data['command']),
+            stdout=data.get('stdout', ""),
+            stderr=data.get('stderr', ""),
+            returncode=data.get('returncode', 0),
+            duration=data.get('duration', 0.0)
+        )
+
+
+class FakeBackend(CommandBackend):
+    """Replay recorded transcripts instead of running processes
+
+    A command matches the transcript with the same arguments, or failing
+    that the longest transcript whose arguments are a prefix of it.
+    Commands without a transcript return ``NOT_FOUND_RETURNCODE``. Every
+    command run is recorded in ``calls``.
+    """
+
+    def __init__(self, transcripts: Iterable[Transcript] = ()):
+        self._transcripts: Dict[Tuple[str, ...], Transcript] = {}
+        self.calls: List[List[str]] = []
+        self._lock = threading.Lock()
+        for transcript in transcripts:
+            self.add(transcript)
+
+    @classmethod
+    def from_directory(cls, directory: str) -> "FakeBackend":
+        """Load every ``*.json`` transcript in directory
+
+        A file holds one transcript object or a list of them.
+        """
+        backend = cls()
+        for name in sorted(os.listdir(directory)):
+            if not name.endswith(".json"):
+                continue
+            with open(os.path.join(directory, name), 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            for item in data if isinstance(data, list) else [data]:
+                backend.add(Transcript.from_dict(item))
+        return backend
+
+    def add(self, transcript: Transcript):
+        """Register a transcript, replacing one for the same command"""
+        self._transcripts[tuple(transcript.command)] = transcript
+
+    def _match(self, cmd: Sequence[str]) -> Optional[Transcript]:
+        key = tuple(cmd)
+        if key in self._transcripts:
+            return self._transcripts[key]
+        for length in range(len(key) - 1, 0, -1):
+            if key[:length] in self._transcripts:
+                return self._transcripts[key[:length]]
+        return None
+
+    def submit(
+        self,
+        cmd: Sequence[str],
+        timeout: Optional[float] = None,
+        on_line: Optional[LineCallback] = None
+    ) -> Future:
+        """Replay a transcript synchronously and return a completed future"""
+        with self._lock:
+            self.calls.append(list(cmd))
+        transcript = self._match(cmd)
+        future: Future = Future()
+
+        if transcript is None:
+            future.set_result(subprocess.CompletedProcess(
+                list(cmd), NOT_FOUND_RETURNCODE, "", f"No transcript for: {' '.join(cmd)}"
+            ))
+            return future
+
+        if timeout is not None and transcript.duration > timeout:
+            time.sleep(timeout)
+            future.set_result(subprocess.CompletedProcess(
+                list(cmd), TIMEOUT_RETURNCODE, "", f"Timed out after {timeout} seconds\n"
+            ))
+            return future
+
+        time.sleep(transcript.duration)
+        stdout = _translate_newlines(transcript.stdout)
+        stderr = _translate_newlines(transcript.stderr)
+        if on_line:
+            for name, text in (("stdout", stdout), ("stderr", stderr)):
+                for line in text.splitlines():
+                    on_line(name, line)
+
+        future.set_result(subprocess.CompletedProcess(list(cmd), transcript.returncode, stdout, stderr))
+        return future
+
+
+_default_backend: Optional[AsyncioBackend] = None
+_default_lock = threading.Lock()
+
+
+def get_default_backend() -> AsyncioBackend:
+    """Process-wide backend shared by package managers"""
+    global _default_backend
+    with _default_lock:
+        if _default_backend is None:
+            _default_backend = AsyncioBackend()
+        return _default_backend
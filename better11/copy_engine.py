@@ -0,0 +1,574 @@
+"""
+Parallel Copy Engine
+
+Multi-threaded file copying for non-Windows hosts, modelled on robocopy /MT:
+- Kernel-side copies with ``os.copy_file_range`` or ``os.sendfile`` where
+  the platform supports them, falling back to buffered reads
+- A worker pool that copies many files at once
+- An optional aggregate byte-rate limit shared by all workers
+- Throughput reporting through a progress callback
+- Incremental, resumable directory sync with optional hash verification
+
+Tree copies follow symlinked directories and copy their contents, as
+``shutil.copytree`` and robocopy do; a link back to one of its own
+ancestors is skipped. Links inside the destination are never followed:
+cleanup and sync deletions remove the link itself, not what it points to.
+"""
+
+import os
+import json
+import time
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from better11.file_walker import FileRecord, scan_directories
+from better11.hash_cache import hash_file
+
+
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+# Suffix for files still being written
+PARTIAL_SUFFIX = ".b11partial"
+
+
+def remove_partials(root: str) -> int:
+    """Delete partial files left in root by an interrupted copy; returns the count
+
+    Symlinked directories are not followed, so files outside root are left alone.
+    """
+    removed = 0
+    if not os.path.isdir(root):
+        return removed
+    for _, files in scan_directories(root):
+        for record in files:
+            if record.name.endswith(PARTIAL_SUFFIX):
+                try:
+                    os.remove(record.path)
+                    removed += 1
+                except OSError:
+                    pass
+    return removed
+
+
+@dataclass
+class CopyProgress:
+    """Snapshot of a running copy"""
+    files_done: int
+    files_total: int
+    bytes_done: int
+    bytes_total: int
+    elapsed: float
+    current_file: str = ""
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Aggregate throughput so far"""
+        return self.bytes_done / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class CopyResult:
+    """Outcome of a copy"""
+    files_copied: int = 0
+    bytes_copied: int = 0
+    elapsed: float = 0.0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        """Whether every file was copied"""
+        return not self.errors
+
+    @property
+    def bytes_per_second(self) -> float:
+        """Average throughput"""
+        return self.bytes_copied / self.elapsed if self.elapsed > 0 else 0.0
+
+
+class RateLimiter:
+    """Token bucket shared between copy workers"""
+
+    def __init__(self, bytes_per_second: float):
+        self.rate = float(bytes_per_second)
+        self._allowance = self.rate
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def consume(self, nbytes: int):
+        """Block until nbytes may be transferred"""
+        with self._lock:
+            now = time.monotonic()
+            self._allowance = min(self.rate, self._allowance + (now - self._last) * self.rate)
+            self._last = now
+            self._allowance -= nbytes
+            delay = -self._allowance / self.rate if self._allowance < 0 else 0.0
+        if delay:
+            time.sleep(delay)
+
+
+class CopyEngine:
+    """Copy files and trees with a pool of workers"""
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        max_bytes_per_second: Optional[float] = None,
+        progress_callback: Optional[Callable[[CopyProgress], None]] = None,
+        verbose: bool = False
+    ):
+        self.max_workers = max_workers
+        self.buffer_size = buffer_size
+        self.limiter = RateLimiter(max_bytes_per_second) if max_bytes_per_second else None
+        self.progress_callback = progress_callback
+        self.verbose = verbose
+
+        self._lock = threading.Lock()
+        self._progress = CopyProgress(0, 0, 0, 0, 0.0)
+        self._started = 0.0
+
+    def _reset_progress(self, files_total: int, bytes_total: int):
+        self._started = time.monotonic()
+        self._progress = CopyProgress(0, files_total, 0, bytes_total, 0.0)
+
+    def _advance(self, nbytes: int, path: str, file_done: bool = False):
+        """Account for copied bytes and notify the progress callback"""
+        with self._lock:
+            progress = self._progress
+            progress.bytes_done += nbytes
+            progress.files_done += int(file_done)
+            progress.elapsed = time.monotonic() - self._started
+            progress.current_file = path
+            snapshot = CopyProgress(**progress.__dict__)
+        if self.progress_callback:
+            self.progress_callback(snapshot)
+
+    def _transfer(self, src_fd: int, dst_fd: int, path: str) -> int:
+        """Move bytes between descriptors using the fastest available call"""
+        copied = 0
+        size = os.fstat(src_fd).st_size
+        strategies = []
+        if hasattr(os, "copy_file_range"):
+            strategies.append(lambda n, off: os.copy_file_range(src_fd, dst_fd, n))
+        if hasattr(os, "sendfile"):
+            strategies.append(lambda n, off: os.sendfile(dst_fd, src_fd, off, n))
+
+        for strategy in strategies:
+            try:
+                while True:
+                    sent = strategy(self.buffer_size, copied)
+                    if sent == 0:
+                        if copied or not size:
+                            return copied
+                        # Nothing copied from a non-empty source: the call
+                        # is a no-op for this file system, so try the next
+                        break
+                    copied += sent
+                    if self.limiter:
+                        self.limiter.consume(sent)
+                    self._advance(sent, path)
+            except OSError:
+                # Unsupported for this pair of files; only safe to switch
+                # strategy before any bytes were written
+                if copied:
+                    raise
+
+        while True:
+            chunk = os.read(src_fd, self.buffer_size)
+            if not chunk:
+                return copied
+            view = memoryview(chunk)
+            while view:
+                view = view[os.write(dst_fd, view):]
+            copied += len(chunk)
+            if self.limiter:
+                self.limiter.consume(len(chunk))
+            self._advance(len(chunk), path)
+
+    def _copy_one(self, src: str, dst: str) -> int:
+        """Copy one file's data and metadata
+
+        Data is written beside dst under a ``PARTIAL_SUFFIX`` name and moved
+        into place once complete, so an interrupted copy never leaves a
+        truncated file at dst.
+        """
+        partial = dst + PARTIAL_SUFFIX
+        src_fd = os.open(src, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+        try:
+            dst_fd = os.open(
+                partial,
+                os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0),
+                0o666
+            )
+            try:
+                copied = self._transfer(src_fd, dst_fd, src)
+            finally:
+                os.close(dst_fd)
+            shutil.copystat(src, partial)
+            os.replace(partial, dst)
+        except OSError:
+            try:
+                os.remove(partial)
+            except OSError:
+                pass
+            raise
+        finally:
+            os.close(src_fd)
+
+        self._advance(0, src, file_done=True)
+        return copied
+
+    def copy_file(self, src: str, dst: str) -> CopyResult:
+        """Copy a single file; dst may be a directory"""
+        if os.path.isdir(dst):
+            dst = os.path.join(dst, os.path.basename(src))
+
+        result = CopyResult()
+        self._reset_progress(1, os.path.getsize(src))
+        try:
+            result.bytes_copied = self._copy_one(src, dst)
+            result.files_copied = 1
+        except OSError as e:
+            result.errors.append((src, str(e)))
+        result.elapsed = time.monotonic() - self._started
+        return result
+
+    def copy_files(
+        self,
+        pairs: List[Tuple[str, str, int]],
+        on_file_copied: Optional[Callable[[str, str], None]] = None
+    ) -> CopyResult:
+        """Copy (src, dst, size) pairs concurrently
+
+        ``on_file_copied(src, dst)`` runs on the calling thread as each copy
+        completes.
+        """
+        result = CopyResult()
+        self._reset_progress(len(pairs), sum(size for _, _, size in pairs))
+
+        def worker(pair: Tuple[str, str, int]):
+            src, dst = pair[0], pair[1]
+            try:
+                return src, self._copy_one(src, dst), None
+            except OSError as e:
+                if self.verbose:
+                    print(f"Error copying {src}: {e}")
+                return src, 0, str(e)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(worker, pair): pair for pair in pairs}
+            for future in as_completed(futures):
+                src, copied, error = future.result()
+                if error is None:
+                    result.files_copied += 1
+                    result.bytes_copied += copied
+                    if on_file_copied:
+                        on_file_copied(src, futures[future][1])
+                else:
+                    result.errors.append((src, error))
+
+        result.elapsed = time.monotonic() - self._started
+        return result
+
+    def plan_tree(self, src: str, dst: str) -> List[Tuple[str, str, int]]:
+        """Create dst's directory structure and list the files to copy"""
+        pairs = []
+        for directory, files in scan_directories(src, follow_symlinks=True):
+            target_dir = os.path.join(dst, os.path.relpath(directory, src))
+            os.makedirs(target_dir, exist_ok=True)
+            for record in files:
+                pairs.append((record.path, os.path.join(target_dir, record.name), record.size))
+        return pairs
+
+    def copy_tree(self, src: str, dst: str) -> CopyResult:
+        """Copy a directory tree, merging into dst if it exists"""
+        remove_partials(dst)
+        result = self.copy_files(self.plan_tree(src, dst))
+
+        # Directory timestamps change as files land, so restore them last
+        for directory, _ in scan_directories(src, follow_symlinks=True):
+            try:
+                shutil.copystat(directory, os.path.join(dst, os.path.relpath(directory, src)))
+            except OSError:
+                pass
+
+        return result
+
+
+# Journal written into the destination while a sync runs
+JOURNAL_NAME = ".better11-sync.journal"
+
+# Allowed mtime difference; FAT volumes store times at 2 second resolution
+MTIME_TOLERANCE = 2.0
+
+
+class SyncAction(Enum):
+    """What a sync does with one path"""
+    COPY = "copy"
+    UPDATE = "update"
+    DELETE = "delete"
+    SKIP = "skip"
+
+
+@dataclass
+class SyncEntry:
+    """Planned action for one relative path"""
+    path: str
+    action: SyncAction
+    size: int = 0
+    reason: str = ""
+
+    def to_dict(self) -> Dict:
+        """Convert to dictionary"""
+        return {
+            'path': self.path,
+            'action': self.action.value,
+            'size': self.size,
+            'reason': self.reason
+        }
+
+
+@dataclass
+class SyncReport:
+    """Per-file outcome of a sync"""
+    entries: List[SyncEntry] = field(default_factory=list)
+    copy_result: CopyResult = field(default_factory=CopyResult)
+    resumed: int = 0
+    dry_run: bool = False
+
+    @property
+    def success(self) -> bool:
+        """Whether every planned copy succeeded"""
+        return self.copy_result.success
+
+    def summary(self) -> Dict[str, int]:
+        """Counts per action and bytes to transfer"""
+        counts = {action.value: 0 for action in SyncAction}
+        for entry in self.entries:
+            counts[entry.action.value] += 1
+        counts['bytes_to_copy'] = sum(
+            e.size for e in self.entries if e.action in (SyncAction.COPY, SyncAction.UPDATE)
+        )
+        counts['resumed'] = self.resumed
+        return counts
+
+
+class DirectorySync:
+    """Bring a destination tree in line with a source tree
+
+    Files are compared by size and mtime, or by SHA-256 when ``verify`` is
+    set, and only new or changed files are copied. Progress is journaled in
+    the destination so an interrupted sync resumes where it stopped; a
+    journaled file is skipped only while the source still has the size,
+    mtime and, when verifying, the hash recorded for the copy.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[CopyEngine] = None,
+        verify: bool = False,
+        delete_extras: bool = False,
+        journal_path: Optional[str] = None,
+        verbose: bool = False
+    ):
+        self.engine = engine or CopyEngine(verbose=verbose)
+        self.verify = verify
+        self.delete_extras = delete_extras
+        self.journal_path = journal_path
+        self.verbose = verbose
+
+    def _journal_file(self, dst: str) -> str:
+        return self.journal_path or os.path.join(dst, JOURNAL_NAME)
+
+    def _load_journal(self, src: str, dst: str) -> Dict[str, Dict]:
+        """Records of files completed by an interrupted sync of src into dst
+
+        Maps relative paths to the source size and mtime at copy time, plus
+        the SHA-256 of the copy when the sync verified content.
+        """
+        path = self._journal_file(dst)
+        if not os.path.exists(path):
+            return {}
+
+        done = {}
+        try:
+            with open(path, 'r') as f:
+                header = json.loads(f.readline() or "{}")
+                if header.get('source') != src or header.get('destination') != dst:
+                    return {}
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        done[record['done']] = record
+                    except (ValueError, KeyError, TypeError):
+                        # A torn final line from the interruption
+                        break
+        except (OSError, ValueError):
+            return {}
+
+        return done
+
+    @staticmethod
+    def _list_tree(
+        root: str,
+        follow_symlinks: bool = True
+    ) -> Tuple[Dict[str, FileRecord], Set[str], Set[str]]:
+        """Map relative file paths to records and collect relative directories
+
+        Also returns the relative paths of links that were not followed,
+        such as symlinked directories when follow_symlinks is off.
+        """
+        files: Dict[str, FileRecord] = {}
+        directories: Set[str] = set()
+        links: Set[str] = set()
+        if not os.path.isdir(root):
+            return files, directories, links
+
+        def add_link(path: str):
+            links.add(os.path.relpath(path, root))
+
+        for directory, records in scan_directories(root, follow_symlinks=follow_symlinks, on_link=add_link):
+            relative_dir = os.path.relpath(directory, root)
+            if relative_dir != os.curdir:
+                directories.add(relative_dir)
+            for record in records:
+                if record.name == JOURNAL_NAME or record.name.endswith(PARTIAL_SUFFIX):
+                    continue
+                files[os.path.normpath(os.path.join(relative_dir, record.name))] = record
+
+        return files, directories, links
+
+    @staticmethod
+    def _same_content(src: str, dst: str) -> bool:
+        # Verification reads both files; cached digests trust size and mtime
+        return hash_file(src) == hash_file(dst)
+
+    def _journaled_copy_current(self, record: FileRecord, journaled: Dict) -> bool:
+        """Whether a copy recorded in the journal still matches the source"""
+        if journaled.get('size') != record.size or 'mtime' not in journaled:
+            return False
+        if abs(journaled['mtime'] - record.modified) > MTIME_TOLERANCE:
+            return False
+        if self.verify:
+            return journaled.get('sha256') == hash_file(record.path)
+        return True
+
+    def plan(self, src: str, dst: str) -> List[SyncEntry]:
+        """Compare the trees and decide an action for every path"""
+        src = os.path.abspath(src)
+        dst = os.path.abspath(dst)
+        return self._plan(src, dst, self._load_journal(src, dst))[0]
+
+    def _plan(self, src: str, dst: str, completed: Dict[str, Dict]) -> Tuple[List[SyncEntry], Set[str]]:
+        """Build sync entries; also returns the source's relative directories"""
+        src_files, src_dirs, _ = self._list_tree(src)
+        # The destination is listed without following links, so deleting
+        # extras never reaches outside it
+        dst_files, dst_dirs, dst_links = self._list_tree(dst, follow_symlinks=False)
+        entries = []
+
+        for relative, record in sorted(src_files.items()):
+            existing = dst_files.get(relative)
+            if existing is None:
+                entries.append(SyncEntry(relative, SyncAction.COPY, record.size, "new"))
+            elif (relative in completed and existing.size == record.size
+                  and self._journaled_copy_current(record, completed[relative])):
+                entries.append(SyncEntry(relative, SyncAction.SKIP, record.size, "completed before interruption"))
+            elif existing.size != record.size:
+                entries.append(SyncEntry(relative, SyncAction.UPDATE, record.size, "size changed"))
+            elif self.verify:
+                if self._same_content(record.path, existing.path):
+                    entries.append(SyncEntry(relative, SyncAction.SKIP, record.size, "identical"))
+                else:
+                    entries.append(SyncEntry(relative, SyncAction.UPDATE, record.size, "content changed"))
+            elif abs(existing.modified - record.modified) > MTIME_TOLERANCE:
+                entries.append(SyncEntry(relative, SyncAction.UPDATE, record.size, "modified time changed"))
+            else:
+                entries.append(SyncEntry(relative, SyncAction.SKIP, record.size, "unchanged"))
+
+        if self.delete_extras:
+            for relative in sorted(set(dst_files) - set(src_files)):
+                entries.append(SyncEntry(relative, SyncAction.DELETE, dst_files[relative].size, "not in source"))
+            for relative in sorted(dst_links - set(src_files) - src_dirs):
+                entries.append(SyncEntry(relative, SyncAction.DELETE, 0, "link not in source"))
+            # Deepest first so parents are empty by the time they are removed
+            for relative in sorted(dst_dirs - src_dirs, key=lambda d: d.count(os.sep), reverse=True):
+                entries.append(SyncEntry(relative + os.sep, SyncAction.DELETE, 0, "directory not in source"))
+
+        return entries, src_dirs
+
+    def sync(self, src: str, dst: str, dry_run: bool = False) -> SyncReport:
+        """Synchronize src into dst"""
+        src = os.path.abspath(src)
+        dst = os.path.abspath(dst)
+        completed = self._load_journal(src, dst)
+        entries, src_dirs = self._plan(src, dst, completed)
+        report = SyncReport(
+            entries=entries,
+            resumed=sum(1 for e in entries if e.reason == "completed before interruption"),
+            dry_run=dry_run
+        )
+        if dry_run:
+            return report
+
+        os.makedirs(dst, exist_ok=True)
+        remove_partials(dst)
+        for relative in sorted(src_dirs):
+            os.makedirs(os.path.join(dst, relative), exist_ok=True)
+
+        journal_file = self._journal_file(dst)
+        with open(journal_file, 'a' if completed else 'w') as journal:
+            if not completed:
+                journal.write(json.dumps({'source': src, 'destination': dst}) + "\n")
+                journal.flush()
+
+            def record_done(file_src: str, file_dst: str):
+                # The copy carries the source's size and, via copystat, its mtime
+                copied = os.stat(file_dst)
+                done = {
+                    'done': os.path.relpath(file_src, src),
+                    'size': copied.st_size,
+                    'mtime': copied.st_mtime
+                }
+                if self.verify:
+                    done['sha256'] = hash_file(file_dst)
+                journal.write(json.dumps(done) + "\n")
+                journal.flush()
+
+            pairs = [
+                (os.path.join(src, e.path), os.path.join(dst, e.path), e.size)
+                for e in entries if e.action in (SyncAction.COPY, SyncAction.UPDATE)
+            ]
+            report.copy_result = self.engine.copy_files(pairs, on_file_copied=record_done)
+
+        for entry in entries:
+            if entry.action != SyncAction.DELETE:
+                continue
+            target = os.path.join(dst, entry.path)
+            try:
+                if os.path.islink(target):
+                    os.unlink(target)
+                elif entry.path.endswith(os.sep):
+                    shutil.rmtree(target)
+                else:
+                    os.remove(target)
+            except OSError as e:
+                report.copy_result.errors.append((target, str(e)))
+
+        # Directory timestamps change as files land, so restore them last
+        for relative in [os.curdir] + sorted(src_dirs):
+            try:
+                shutil.copystat(os.path.join(src, relative), os.path.join(dst, relative))
+            except OSError:
+                pass
+
+        if report.success:
+            try:
+                os.remove(journal_file)
+            except OSError:
+                pass
+
+        return report
@@ -0,0 +1,199 @@
+"""
+Aggregated Directory Size Tree
+
+Bottom-up directory size analysis for WinDirStat-style views:
+- Recursive byte and file subtotals for every directory in one pass
+- Depth of every directory relative to the scan root
+- JSON snapshots so a later rescan only relists directories whose mtime
+  changed; unchanged directories are rebuilt from the snapshot
+
+Rewriting or appending to a file does not change its directory's mtime, so
+the files of a reused directory are still stat'ed and their new sizes
+counted. Use ``scan(full=True)`` to relist everything.
+"""
+
+import os
+import json
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+
+@dataclass
+class DirectoryNode:
+    """Directory with its own and recursive totals"""
+    path: str
+    name: str
+    depth: int
+    own_bytes: int = 0
+    own_files: int = 0
+    total_bytes: int = 0
+    total_files: int = 0
+    children: List["DirectoryNode"] = field(default_factory=list)
+
+    def to_dict(self, max_depth: Optional[int] = None) -> Dict:
+        """Convert to dictionary, children sorted largest first"""
+        children = []
+        if max_depth is None or self.depth < max_depth:
+            children = [
+                child.to_dict(max_depth)
+                for child in sorted(self.children, key=lambda c: c.total_bytes, reverse=True)
+            ]
+
+        return {
+            'path': self.path,
+            'name': self.name,
+            'is_directory': True,
+            'depth': self.depth,
+            'size': self.total_bytes,
+            'file_count': self.total_files,
+            'own_size': self.own_bytes,
+            'own_file_count': self.own_files,
+            'children': children
+        }
+
+    def iter_nodes(self):
+        """Yield this node and every descendant"""
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            yield node
+            stack.extend(node.children)
+
+
+class DirectorySizeAnalyzer:
+    """Build directory size trees, optionally reusing a saved snapshot"""
+
+    def __init__(self, snapshot_path: Optional[str] = None, verbose: bool = False):
+        self.snapshot_path = snapshot_path
+        self.verbose = verbose
+        self.last_stats: Dict[str, int] = {}
+
+    def _load_snapshot(self, root: str) -> Dict[str, Dict]:
+        """Load per-directory entries saved for root"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return {}
+
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        if data.get('root') != root:
+            return {}
+        return data.get('directories', {})
+
+    def _save_snapshot(self, root: str, directories: Dict[str, Dict]):
+        """Atomically write the snapshot"""
+        if not self.snapshot_path:
+            return
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.snapshot_path)), exist_ok=True)
+        temp_path = self.snapshot_path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'root': root, 'directories': directories}, f)
+        os.replace(temp_path, self.snapshot_path)
+
+    def _list_directory(self, path: str) -> Dict:
+        """List one directory's own files and subdirectory names"""
+        entry = {'own_bytes': 0, 'own_files': 0, 'children': [], 'files': {}}
+
+        with os.scandir(path) as entries:
+            for item in entries:
+                try:
+                    if item.is_dir(follow_symlinks=False):
+                        entry['children'].append(item.name)
+                    elif item.is_file():
+                        stat = item.stat()
+                        entry['files'][item.name] = [stat.st_size, stat.st_mtime_ns]
+                        entry['own_bytes'] += stat.st_size
+                        entry['own_files'] += 1
+                except OSError:
+                    pass
+
+        return entry
+
+    @staticmethod
+    def _restat_directory(path: str, cached: Dict) -> Optional[Dict]:
+        """Refresh the file sizes of a directory whose listing is unchanged
+
+        Returns None when a recorded file is gone and the directory must be
+        relisted.
+        """
+        files = {}
+        for name in cached['files']:
+            try:
+                stat = os.stat(os.path.join(path, name))
+            except FileNotFoundError:
+                return None
+            except OSError:
+                continue
+            files[name] = [stat.st_size, stat.st_mtime_ns]
+
+        return {
+            'own_bytes': sum(size for size, _ in files.values()),
+            'own_files': len(files),
+            'children': cached['children'],
+            'files': files,
+            'mtime_ns': cached['mtime_ns']
+        }
+
+    def scan(self, root_path: str, full: bool = False) -> DirectoryNode:
+        """Build the size tree for root_path"""
+        root = os.path.abspath(root_path)
+        previous = {} if full else self._load_snapshot(root)
+        current: Dict[str, Dict] = {}
+        stats = {'directories_listed': 0, 'directories_reused': 0}
+
+        root_node = DirectoryNode(path=root, name=os.path.basename(root) or root, depth=0)
+        order: List[DirectoryNode] = []
+        parents: Dict[int, DirectoryNode] = {}
+        stack = [root_node]
+
+        # Top-down: list changed directories, reuse the listing of unchanged ones
+        while stack:
+            node = stack.pop()
+            try:
+                mtime_ns = os.stat(node.path).st_mtime_ns
+                cached = previous.get(node.path)
+                entry = None
+                if cached and cached['mtime_ns'] == mtime_ns and 'files' in cached:
+                    entry = self._restat_directory(node.path, cached)
+                if entry is not None:
+                    stats['directories_reused'] += 1
+                else:
+                    entry = self._list_directory(node.path)
+                    entry['mtime_ns'] = mtime_ns
+                    stats['directories_listed'] += 1
+            except OSError as e:
+                if self.verbose:
+                    print(f"Error scanning {node.path}: {e}")
+                if node is not root_node:
+                    parents[id(node)].children.remove(node)
+                continue
+
+            current[node.path] = entry
+            node.own_bytes = node.total_bytes = entry['own_bytes']
+            node.own_files = node.total_files = entry['own_files']
+            order.append(node)
+
+            for name in entry['children']:
+                child = DirectoryNode(
+                    path=os.path.join(node.path, name),
+                    name=name,
+                    depth=node.depth + 1
+                )
+                node.children.append(child)
+                parents[id(child)] = node
+                stack.append(child)
+
+        # Bottom-up: reversed pre-order visits every child before its parent
+        for node in reversed(order):
+            parent = parents.get(id(node))
+            if parent is not None:
+                parent.total_bytes += node.total_bytes
+                parent.total_files += node.total_files
+
+        self._save_snapshot(root, current)
+        self.last_stats = stats
+        return root_node
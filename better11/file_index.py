@@ -0,0 +1,377 @@
+"""
+Persistent File Index Module
+
+SQLite-backed index of file metadata:
+- Paths, sizes, timestamps, extensions and MIME types
+- Incremental rescans that only revisit directories whose mtime changed
+- Queries by glob, extension, size range and mtime range without walking the tree
+
+A directory's mtime changes when entries are added, removed or renamed, but
+not when an existing file is rewritten in place. Use ``update(full=True)`` to
+pick up in-place modifications.
+"""
+
+import os
+import sqlite3
+import fnmatch
+import mimetypes
+from typing import List, Dict, Iterable, Optional, Tuple
+
+from better11.file_manager import FileInfo
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS directories (
+    path TEXT PRIMARY KEY,
+    parent TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_directories_parent ON directories(parent);
+
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    directory TEXT NOT NULL,
+    name TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    modified REAL NOT NULL,
+    accessed REAL NOT NULL,
+    extension TEXT NOT NULL,
+    mime_type TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_files_directory ON files(directory);
+CREATE INDEX IF NOT EXISTS idx_files_extension ON files(extension);
+CREATE INDEX IF NOT EXISTS idx_files_size ON files(size);
+CREATE INDEX IF NOT EXISTS idx_files_modified ON files(modified);
+"""
+
+
+def _subtree_bounds(path: str) -> Tuple[str, str]:
+    """Return the half-open string range covering every path below path"""
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+def _matches_path(relative: str, pattern_parts: List[str], recursive: bool, case_sensitive: bool) -> bool:
+    """Match a path relative to the search root against a glob, one component at a time
+
+    As with ``Path.rglob``, a recursive match may start at any directory
+    below the root but only at a component boundary, and ``*`` never
+    crosses a separator. A non-recursive match is anchored at the root.
+    """
+    parts = relative.split(os.sep)
+    if not case_sensitive:
+        parts = [part.lower() for part in parts]
+    if len(parts) < len(pattern_parts) or (not recursive and len(parts) != len(pattern_parts)):
+        return False
+    tail = parts[len(parts) - len(pattern_parts):]
+    return all(fnmatch.fnmatchcase(part, glob) for part, glob in zip(tail, pattern_parts))
+
+
+class FileIndex:
+    """On-disk index of file metadata"""
+
+    def __init__(self, db_path: Optional[str] = None, verbose: bool = False):
+        self.verbose = verbose
+        self.db_path = db_path or os.path.join(os.path.expanduser("~"), ".better11", "file_index.db")
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(self.db_path)
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the database connection"""
+        self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def is_indexed(self, root_path: str) -> bool:
+        """Check whether root_path has been scanned"""
+        row = self._conn.execute(
+            "SELECT 1 FROM directories WHERE path = ?", (os.path.abspath(root_path),)
+        ).fetchone()
+        return row is not None
+
+    def update(self, root_path: str, full: bool = False) -> Dict[str, int]:
+        """Scan root_path, rescanning only directories whose mtime changed"""
+        root = os.path.abspath(root_path)
+        stats = {
+            'directories_scanned': 0,
+            'directories_skipped': 0,
+            'directories_removed': 0,
+            'files_indexed': 0
+        }
+
+        with self._conn:
+            stack = [root]
+            while stack:
+                directory = stack.pop()
+                try:
+                    mtime_ns = os.stat(directory).st_mtime_ns
+                except OSError:
+                    self._remove_tree(directory)
+                    stats['directories_removed'] += 1
+                    continue
+
+                known_children = self._child_directories(directory)
+                row = self._conn.execute(
+                    "SELECT mtime_ns FROM directories WHERE path = ?", (directory,)
+                ).fetchone()
+
+                if row and row[0] == mtime_ns and not full:
+                    stats['directories_skipped'] += 1
+                    stack.extend(known_children)
+                    continue
+
+                try:
+                    subdirs, files = self._scan_directory(directory)
+                except OSError as e:
+                    if self.verbose:
+                        print(f"Error scanning {directory}: {e}")
+                    continue
+
+                stats['directories_scanned'] += 1
+                stats['files_indexed'] += len(files)
+
+                self._conn.execute("DELETE FROM files WHERE directory = ?", (directory,))
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", files
+                )
+
+                for gone in set(known_children) - set(subdirs):
+                    self._remove_tree(gone)
+                    stats['directories_removed'] += 1
+
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO directories VALUES (?, ?, ?)",
+                    (directory, os.path.dirname(directory), mtime_ns)
+                )
+                stack.extend(subdirs)
+
+        return stats
+
+    def _scan_directory(self, directory: str) -> Tuple[List[str], List[Tuple]]:
+        """List one directory, returning subdirectories and file rows"""
+        subdirs = []
+        files = []
+
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        stat = entry.stat()
+                        mime_type, _ = mimetypes.guess_type(entry.name)
+                        files.append((
+                            entry.path,
+                            directory,
+                            entry.name,
+                            stat.st_size,
+                            stat.st_ctime,
+                            stat.st_mtime,
+                            stat.st_atime,
+                            os.path.splitext(entry.name)[1].lower(),
+                            mime_type
+                        ))
+                except OSError:
+                    pass
+
+        return subdirs, files
+
+    def _child_directories(self, directory: str) -> List[str]:
+        """Indexed subdirectories of directory"""
+        rows = self._conn.execute(
+            "SELECT path FROM directories WHERE parent = ? AND path != ?", (directory, directory)
+        )
+        return [row[0] for row in rows]
+
+    def _remove_tree(self, directory: str):
+        """Drop a directory and everything below it from the index"""
+        low, high = _subtree_bounds(directory)
+        self._conn.execute(
+            "DELETE FROM files WHERE directory = ? OR (directory >= ? AND directory < ?)",
+            (directory, low, high)
+        )
+        self._conn.execute(
+            "DELETE FROM directories WHERE path = ? OR (path >= ? AND path < ?)",
+            (directory, low, high)
+        )
+
+    def search(
+        self,
+        root_path: Optional[str] = None,
+        pattern: str = "*",
+        recursive: bool = True,
+        case_sensitive: bool = False,
+        extensions: Optional[Iterable[str]] = None,
+        min_size: Optional[int] = None,
+        max_size: Optional[int] = None,
+        modified_after: Optional[float] = None,
+        modified_before: Optional[float] = None,
+        limit: Optional[int] = None,
+        include_directories: bool = False
+    ) -> List[FileInfo]:
+        """Query indexed files
+
+        ``pattern`` is a glob matched against the file name, or, when it
+        contains a path separator, against the path relative to root_path
+        component by component, as ``Path.rglob``/``Path.glob`` would
+        (without a root_path, at any component boundary).
+        With include_directories, matching directories below root_path are
+        returned too, stat'ed at query time; they are left out when a
+        size or extension filter is given.
+        """
+        clauses = []
+        params: List = []
+        root = os.path.abspath(root_path) if root_path is not None else None
+
+        pattern_parts: List[str] = []
+        if pattern and ("/" in pattern or os.sep in pattern):
+            pattern_parts = [part for part in pattern.replace("/", os.sep).split(os.sep) if part]
+            if not case_sensitive:
+                pattern_parts = [part.lower() for part in pattern_parts]
+        name_pattern = pattern_parts[-1] if pattern_parts else pattern
+
+        if root is not None:
+            # Path patterns decide the depth themselves
+            if recursive or pattern_parts:
+                low, high = _subtree_bounds(root)
+                clauses.append("(directory = ? OR (directory >= ? AND directory < ?))")
+                params.extend([root, low, high])
+            else:
+                clauses.append("directory = ?")
+                params.append(root)
+
+        if name_pattern and name_pattern != "*":
+            if case_sensitive:
+                clauses.append("name GLOB ?")
+                params.append(name_pattern)
+            else:
+                clauses.append("lower(name) GLOB ?")
+                params.append(name_pattern.lower())
+
+        if extensions:
+            exts = [e.lower() if e.startswith(".") else "." + e.lower() for e in extensions]
+            clauses.append(f"extension IN ({', '.join('?' * len(exts))})")
+            params.extend(exts)
+
+        for column, op, value in (
+            ("size", ">=", min_size),
+            ("size", "<=", max_size),
+            ("modified", ">=", modified_after),
+            ("modified", "<=", modified_before)
+        ):
+            if value is not None:
+                clauses.append(f"{column} {op} ?")
+                params.append(value)
+
+        # Path patterns and directories are filtered here, so the limit is too
+        limit_in_sql = limit is not None and not pattern_parts and not include_directories
+        sql = "SELECT path, name, size, created, modified, accessed, extension, mime_type FROM files"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY path"
+        if limit_in_sql:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        results = [
+            FileInfo(
+                path=row[0],
+                name=row[1],
+                size=row[2],
+                created=row[3],
+                modified=row[4],
+                accessed=row[5],
+                is_directory=False,
+                extension=os.path.splitext(row[1])[1],
+                mime_type=row[7]
+            )
+            for row in self._conn.execute(sql, params)
+            if not pattern_parts
+            or self._path_matches(row[0], root, pattern_parts, recursive, case_sensitive)
+        ]
+
+        if include_directories and root is not None and not (extensions or min_size is not None
+                                                             or max_size is not None):
+            results.extend(self._search_directories(
+                root, name_pattern, pattern_parts, recursive, case_sensitive,
+                modified_after, modified_before
+            ))
+            results.sort(key=lambda info: info.path)
+
+        if limit is not None and not limit_in_sql:
+            results = results[:limit]
+        return results
+
+    @staticmethod
+    def _path_matches(
+        path: str,
+        root: Optional[str],
+        pattern_parts: List[str],
+        recursive: bool,
+        case_sensitive: bool
+    ) -> bool:
+        """Match a path pattern relative to root, or anywhere without one"""
+        if root is None:
+            return _matches_path(path, pattern_parts, True, case_sensitive)
+        return _matches_path(os.path.relpath(path, root), pattern_parts, recursive, case_sensitive)
+
+    def _search_directories(
+        self,
+        root: str,
+        name_pattern: str,
+        pattern_parts: List[str],
+        recursive: bool,
+        case_sensitive: bool,
+        modified_after: Optional[float],
+        modified_before: Optional[float]
+    ) -> List[FileInfo]:
+        """Indexed directories below root matching a search"""
+        if recursive or pattern_parts:
+            low, high = _subtree_bounds(root)
+            rows = self._conn.execute(
+                "SELECT path FROM directories WHERE path >= ? AND path < ? ORDER BY path", (low, high)
+            )
+        else:
+            rows = self._conn.execute(
+                "SELECT path FROM directories WHERE parent = ? AND path != ? ORDER BY path", (root, root)
+            )
+
+        name_glob = name_pattern if case_sensitive else name_pattern.lower()
+        directories = []
+        for (path,) in rows:
+            name = os.path.basename(path)
+            if pattern_parts:
+                if not self._path_matches(path, root, pattern_parts, recursive, case_sensitive):
+                    continue
+            elif not fnmatch.fnmatchcase(name if case_sensitive else name.lower(), name_glob or "*"):
+                continue
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            if modified_after is not None and stat.st_mtime < modified_after:
+                continue
+            if modified_before is not None and stat.st_mtime > modified_before:
+                continue
+            directories.append(FileInfo(
+                path=path,
+                name=name,
+                size=stat.st_size,
+                created=stat.st_ctime,
+                modified=stat.st_mtime,
+                accessed=stat.st_atime,
+                is_directory=True,
+                extension=""
+            ))
+        return directories
+
+    def count(self) -> int:
+        """Number of indexed files"""
+        return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
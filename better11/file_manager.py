@@ -13,16 +13,34 @@ File management with performance optimization:
 """
 
 import os
+import heapq
 import shutil
 import hashlib
 import mimetypes
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Set
+from typing import Callable, List, Dict, Iterator, Optional, Tuple, Set
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from enum import Enum
 import tempfile
 import subprocess
 
+from better11.copy_engine import CopyEngine, CopyProgress, DirectorySync
+from better11.directory_sizes import DirectorySizeAnalyzer
+from better11.file_walker import FileRecord, TreeScan, scan_directories, walk_files
+from better11.hash_cache import HASH_CHUNK_SIZE, HashCache, get_hash_cache
+from better11.zip_engine import (
+    CompressionProgress,
+    ExtractionResult,
+    ParallelZipExtractor,
+    ParallelZipWriter,
+    default_level_for,
+)
+
+
+# Bytes hashed from each end of a file when pre-filtering duplicate candidates
+PARTIAL_HASH_SIZE = 64 * 1024
+
 
 class FileOperation(Enum):
     """File operations"""
@@ -65,10 +83,15 @@ class FileInfo:
 
 
 class FastFileManager:
-    """High-performance file operations"""
+    """High-performance file operations
 
-    def __init__(self, verbose: bool = False):
+    When constructed with a ``FileIndex`` (see ``better11.file_index``),
+    searches are answered from the index instead of walking the tree.
+    """
+
+    def __init__(self, verbose: bool = False, index=None):
         self.verbose = verbose
+        self.index = index
 
     def get_file_info(self, path: str) -> FileInfo:
         """Get detailed file information"""
@@ -126,25 +149,65 @@ class FastFileManager:
                 # Robocopy returns 0-7 for success
                 return result.returncode < 8
             else:
-                shutil.copy2(src, dst)
-                return True
+                engine = CopyEngine(buffer_size=buffer_size, verbose=self.verbose)
+                return engine.copy_file(src, dst).success
         except Exception as e:
             if self.verbose:
                 print(f"Error copying file: {e}")
             return False
 
-    def copy_directory_fast(self, src: str, dst: str) -> bool:
-        """Fast directory copy"""
+    def copy_directory_fast(
+        self,
+        src: str,
+        dst: str,
+        threads: int = 8,
+        max_bytes_per_second: Optional[float] = None,
+        progress_callback: Optional[Callable[[CopyProgress], None]] = None,
+        sync: bool = False,
+        verify: bool = False,
+        delete_extras: bool = False
+    ) -> bool:
+        """Fast directory copy
+
+        Outside Windows, files are copied by a pool of ``threads`` workers
+        using kernel-side copies where available. ``max_bytes_per_second``
+        caps aggregate throughput and ``progress_callback`` receives a
+        ``CopyProgress`` as bytes land.
+
+        With ``sync`` only new or changed files are copied (compared by
+        SHA-256 when ``verify`` is set), extras are removed when
+        ``delete_extras`` is set, and an interrupted run resumes from its
+        journal. Use ``DirectorySync`` directly for the per-file report.
+        """
         try:
-            if os.name == 'nt':
+            if sync:
+                engine = CopyEngine(
+                    max_workers=threads,
+                    max_bytes_per_second=max_bytes_per_second,
+                    progress_callback=progress_callback,
+                    verbose=self.verbose
+                )
+                syncer = DirectorySync(
+                    engine,
+                    verify=verify,
+                    delete_extras=delete_extras,
+                    verbose=self.verbose
+                )
+                return syncer.sync(src, dst).success
+            elif os.name == 'nt':
                 result = subprocess.run(
-                    ["robocopy", src, dst, "/E", "/MT:8", "/NFL", "/NDL", "/NJH", "/NJS"],
+                    ["robocopy", src, dst, "/E", f"/MT:{threads}", "/NFL", "/NDL", "/NJH", "/NJS"],
                     capture_output=True
                 )
                 return result.returncode < 8
             else:
-                shutil.copytree(src, dst)
-                return True
+                engine = CopyEngine(
+                    max_workers=threads,
+                    max_bytes_per_second=max_bytes_per_second,
+                    progress_callback=progress_callback,
+                    verbose=self.verbose
+                )
+                return engine.copy_tree(src, dst).success
         except Exception as e:
             if self.verbose:
                 print(f"Error copying directory: {e}")
@@ -187,7 +250,22 @@ class FastFileManager:
         recursive: bool = True,
         case_sensitive: bool = False
     ) -> List[FileInfo]:
-        """Search for files"""
+        """Search for files and directories
+
+        With an index attached, root_path is brought up to date with an
+        incremental ``index.update`` (only directories whose mtime changed
+        are rescanned) before the index is queried.
+        """
+        if self.index is not None:
+            self.index.update(root_path)
+            return self.index.search(
+                root_path,
+                pattern,
+                recursive=recursive,
+                case_sensitive=case_sensitive,
+                include_directories=True
+            )
+
         results = []
 
         if recursive:
@@ -205,64 +283,245 @@ class FastFileManager:
         return results
 
 
+class SizeGroupCollector:
+    """Group walked files by size; usable as a TreeScan subscriber"""
+
+    def __init__(self):
+        self.files_by_size: Dict[int, List[str]] = {}
+
+    def add(self, record: FileRecord):
+        """Record one file"""
+        self.files_by_size.setdefault(record.size, []).append(record.path)
+
+    def __call__(self, directory: str, records: List[FileRecord]):
+        for record in records:
+            self.add(record)
+
+
+class LargeFileCollector:
+    """Keep the N largest files at or above a size threshold
+
+    Backed by a bounded min-heap, so a full walk costs O(n log k) time and
+    O(k) memory. Usable as a TreeScan subscriber.
+    """
+
+    def __init__(self, min_size_bytes: int, limit: int = 100):
+        self.min_size_bytes = min_size_bytes
+        self.limit = limit
+        self._heap: List[Tuple[int, str, FileRecord]] = []
+
+    @property
+    def records(self) -> List[FileRecord]:
+        """Collected records in no particular order"""
+        return [item[2] for item in self._heap]
+
+    def _push(self, item: Tuple[int, str, FileRecord]):
+        if len(self._heap) < self.limit:
+            heapq.heappush(self._heap, item)
+        elif item > self._heap[0]:
+            heapq.heapreplace(self._heap, item)
+
+    def add(self, record: FileRecord):
+        """Consider one file"""
+        if record.size >= self.min_size_bytes and self.limit > 0:
+            self._push((record.size, record.path, record))
+
+    def merge(self, other: "LargeFileCollector"):
+        """Fold another collector's heap into this one"""
+        for item in other._heap:
+            self._push(item)
+
+    def __call__(self, directory: str, records: List[FileRecord]):
+        for record in records:
+            self.add(record)
+
+    def results(self) -> List[FileInfo]:
+        """Collected files, largest first"""
+        ordered = sorted(self._heap, reverse=True)
+        return [
+            FileInfo(
+                path=r.path,
+                name=r.name,
+                size=r.size,
+                created=r.created,
+                modified=r.modified,
+                accessed=r.accessed,
+                is_directory=False,
+                extension=r.extension
+            )
+            for _, _, r in ordered
+        ]
+
+
+class DirectorySizeCollector:
+    """Sum the bytes directly inside each directory; usable as a TreeScan subscriber"""
+
+    def __init__(self):
+        self.sizes: Dict[str, int] = {}
+
+    def __call__(self, directory: str, records: List[FileRecord]):
+        self.sizes[directory] = sum(record.size for record in records)
+
+
+@dataclass
+class DuplicateGroup:
+    """Set of files with identical content"""
+    digest: str
+    size: int
+    paths: List[str]
+
+    @property
+    def wasted_bytes(self) -> int:
+        """Space taken by every copy except the first"""
+        return self.size * (len(self.paths) - 1)
+
+
 class DuplicateFileFinder:
-    """Find duplicate files"""
+    """Find duplicate files
 
-    def __init__(self, verbose: bool = False):
+    Candidates are narrowed in stages: files are grouped by size, then by a
+    hash of their first and last ``PARTIAL_HASH_SIZE`` bytes, and only the
+    survivors are hashed in full. Both hashing stages run on a bounded
+    thread pool. Full hashes go through the shared ``HashCache`` unless
+    another cache is given.
+    """
+
+    def __init__(
+        self,
+        verbose: bool = False,
+        max_workers: Optional[int] = None,
+        chunk_size: int = HASH_CHUNK_SIZE,
+        hash_cache: Optional[HashCache] = None
+    ):
         self.verbose = verbose
+        self.max_workers = max_workers
+        self.chunk_size = chunk_size
+        self.hash_cache = hash_cache
 
-    def calculate_hash(self, file_path: str, hash_type: str = "md5") -> str:
-        """Calculate file hash"""
+    @staticmethod
+    def _new_hasher(hash_type: str):
+        """Create hash object for hash type"""
         if hash_type == "md5":
-            hasher = hashlib.md5()
+            return hashlib.md5()
         elif hash_type == "sha256":
-            hasher = hashlib.sha256()
-        else:
-            hasher = hashlib.sha1()
+            return hashlib.sha256()
+        return hashlib.sha1()
+
+    def calculate_hash(self, file_path: str, hash_type: str = "md5") -> str:
+        """Calculate file hash"""
+        if hash_type not in ("md5", "sha256"):
+            hash_type = "sha1"
+        cache = self.hash_cache or get_hash_cache()
+        return cache.get_hash(file_path, hash_type)
+
+    def _hash_contents(self, file_path: str, hash_type: str) -> str:
+        """Hash a file directly, bypassing the cache"""
+        hasher = self._new_hasher(hash_type)
 
         with open(file_path, 'rb') as f:
-            for chunk in iter(lambda: f.read(4096), b""):
+            for chunk in iter(lambda: f.read(self.chunk_size), b""):
                 hasher.update(chunk)
 
         return hasher.hexdigest()
 
-    def find_duplicates(self, root_path: str) -> Dict[str, List[str]]:
-        """Find duplicate files in directory"""
-        files_by_size = {}
-        duplicates = {}
+    def calculate_partial_hash(self, file_path: str, size: int, hash_type: str = "md5") -> str:
+        """Hash the first and last PARTIAL_HASH_SIZE bytes of a file
 
-        # First pass: group by size
-        for root, dirs, files in os.walk(root_path):
-            for file in files:
-                path = os.path.join(root, file)
-                try:
-                    size = os.path.getsize(path)
-                    if size not in files_by_size:
-                        files_by_size[size] = []
-                    files_by_size[size].append(path)
-                except:
-                    pass
+        Files no larger than two blocks are hashed whole, so for them the
+        result equals ``calculate_hash``.
+        """
+        if size <= 2 * PARTIAL_HASH_SIZE:
+            return self._hash_contents(file_path, hash_type)
+
+        hasher = self._new_hasher(hash_type)
+        with open(file_path, 'rb') as f:
+            hasher.update(f.read(PARTIAL_HASH_SIZE))
+            f.seek(-PARTIAL_HASH_SIZE, os.SEEK_END)
+            hasher.update(f.read(PARTIAL_HASH_SIZE))
+
+        return hasher.hexdigest()
 
-        # Second pass: hash files with same size
-        for size, paths in files_by_size.items():
-            if len(paths) > 1:
-                files_by_hash = {}
+    def group_by_size(self, root_path: str) -> Dict[int, List[str]]:
+        """Group files under root_path by size"""
+        collector = SizeGroupCollector()
+        for record in walk_files(root_path):
+            collector.add(record)
+        return collector.files_by_size
 
+    def iter_duplicates(
+        self,
+        root_path: str,
+        hash_type: str = "md5",
+        files_by_size: Optional[Dict[int, List[str]]] = None
+    ) -> Iterator[DuplicateGroup]:
+        """Yield duplicate groups as soon as each one is confirmed
+
+        Pass ``files_by_size`` from a ``SizeGroupCollector`` that already
+        took part in a ``TreeScan`` to skip walking root_path again.
+        """
+        if files_by_size is None:
+            files_by_size = self.group_by_size(root_path)
+        candidates = {
+            size: paths for size, paths in files_by_size.items()
+            if len(paths) > 1
+        }
+        if not candidates:
+            return
+
+        pool = ThreadPoolExecutor(max_workers=self.max_workers)
+        pending = {}
+        # Outstanding hashes per bucket; buckets are keyed by size for the
+        # partial stage and by (size, partial digest) for the full stage
+        remaining: Dict[object, int] = {}
+        digests: Dict[object, Dict[str, List[str]]] = {}
+
+        def submit(bucket, size: int, path: str, full: bool):
+            if full:
+                future = pool.submit(self.calculate_hash, path, hash_type)
+            else:
+                future = pool.submit(self.calculate_partial_hash, path, size, hash_type)
+            pending[future] = (bucket, size, path, full)
+
+        try:
+            for size, paths in candidates.items():
+                remaining[size] = len(paths)
+                digests[size] = {}
                 for path in paths:
-                    try:
-                        file_hash = self.calculate_hash(path)
-                        if file_hash not in files_by_hash:
-                            files_by_hash[file_hash] = []
-                        files_by_hash[file_hash].append(path)
-                    except:
-                        pass
+                    submit(size, size, path, full=False)
 
-                # Record duplicates
-                for file_hash, duplicate_paths in files_by_hash.items():
-                    if len(duplicate_paths) > 1:
-                        duplicates[file_hash] = duplicate_paths
+            while pending:
+                done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+                for future in done:
+                    bucket, size, path, full = pending.pop(future)
+                    try:
+                        digests[bucket].setdefault(future.result(), []).append(path)
+                    except OSError as e:
+                        if self.verbose:
+                            print(f"Error hashing {path}: {e}")
+
+                    remaining[bucket] -= 1
+                    if remaining[bucket]:
+                        continue
+
+                    groups = digests.pop(bucket)
+                    del remaining[bucket]
+                    for digest, paths in groups.items():
+                        if len(paths) < 2:
+                            continue
+                        if full or size <= 2 * PARTIAL_HASH_SIZE:
+                            yield DuplicateGroup(digest=digest, size=size, paths=sorted(paths))
+                        else:
+                            full_bucket = (size, digest)
+                            remaining[full_bucket] = len(paths)
+                            digests[full_bucket] = {}
+                            for candidate in paths:
+                                submit(full_bucket, size, candidate, full=True)
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
 
-        return duplicates
+    def find_duplicates(self, root_path: str) -> Dict[str, List[str]]:
+        """Find duplicate files in directory"""
+        return {group.digest: group.paths for group in self.iter_duplicates(root_path)}
 
 
 class LargeFileAnalyzer:
@@ -275,59 +534,70 @@ class LargeFileAnalyzer:
         self,
         root_path: str,
         min_size_mb: int = 100,
-        limit: int = 100
+        limit: int = 100,
+        parallel: bool = False,
+        max_workers: Optional[int] = None
     ) -> List[FileInfo]:
-        """Find large files"""
-        large_files = []
+        """Find the largest files, biggest first
+
+        With ``parallel`` each top-level subdirectory is walked on its own
+        worker thread and the per-worker heaps are merged at the end.
+        """
         min_size_bytes = min_size_mb * 1024 * 1024
 
-        for root, dirs, files in os.walk(root_path):
-            for file in files:
-                path = os.path.join(root, file)
-                try:
-                    size = os.path.getsize(path)
-                    if size >= min_size_bytes:
-                        stat = os.stat(path)
-                        info = FileInfo(
-                            path=path,
-                            name=file,
-                            size=size,
-                            created=stat.st_ctime,
-                            modified=stat.st_mtime,
-                            accessed=stat.st_atime,
-                            is_directory=False,
-                            extension=os.path.splitext(file)[1]
-                        )
-                        large_files.append(info)
-
-                        if len(large_files) >= limit:
-                            break
-                except:
-                    pass
+        if not parallel:
+            collector = LargeFileCollector(min_size_bytes, limit)
+            for record in walk_files(root_path):
+                collector.add(record)
+            return collector.results()
 
-            if len(large_files) >= limit:
-                break
+        collector = LargeFileCollector(min_size_bytes, limit)
+        subdirs = []
+        try:
+            with os.scandir(root_path) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            subdirs.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            collector.add(FileRecord(
+                                entry.path, entry.name, root_path, stat.st_size,
+                                stat.st_mtime, stat.st_ctime, stat.st_atime
+                            ))
+                    except OSError:
+                        pass
+        except OSError as e:
+            if self.verbose:
+                print(f"Error scanning {root_path}: {e}")
+            return []
 
-        # Sort by size
-        large_files.sort(key=lambda x: x.size, reverse=True)
+        def scan_subtree(subdir: str) -> LargeFileCollector:
+            partial = LargeFileCollector(min_size_bytes, limit)
+            for record in walk_files(subdir):
+                partial.add(record)
+            return partial
 
-        return large_files
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for partial in pool.map(scan_subtree, subdirs):
+                collector.merge(partial)
 
-    def analyze_directory_size(self, path: str) -> Dict[str, int]:
-        """Analyze directory sizes"""
-        sizes = {}
+        return collector.results()
 
-        for root, dirs, files in os.walk(path):
-            size = 0
-            for file in files:
-                try:
-                    size += os.path.getsize(os.path.join(root, file))
-                except:
-                    pass
+    def analyze_directory_size(self, path: str, recursive: bool = False) -> Dict[str, int]:
+        """Analyze directory sizes
 
-            sizes[root] = size
+        By default each directory reports only the bytes directly inside it;
+        with ``recursive`` it reports the subtotal of its whole subtree.
+        """
+        if recursive:
+            root = DirectorySizeAnalyzer(verbose=self.verbose).scan(path)
+            return {node.path: node.total_bytes for node in root.iter_nodes()}
 
-        return sizes
+        scan = TreeScan(path, self.verbose)
+        collector = scan.subscribe(DirectorySizeCollector())
+        scan.run()
+        return collector.sizes
 
 
 class FileCompressor:
@@ -335,6 +605,8 @@ class FileCompressor:
 
     def __init__(self, verbose: bool = False):
         self.verbose = verbose
+        self.last_progress: Optional[CompressionProgress] = None
+        self.last_extraction: Optional[ExtractionResult] = None
 
     def compress_file(self, src: str, dst: Optional[str] = None) -> Optional[str]:
         """Compress file to ZIP"""
@@ -352,37 +624,78 @@ class FileCompressor:
                 print(f"Error compressing: {e}")
             return None
 
-    def compress_directory(self, src: str, dst: Optional[str] = None) -> Optional[str]:
-        """Compress directory to ZIP"""
-        import zipfile
-
+    def compress_directory(
+        self,
+        src: str,
+        dst: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        level_for: Optional[Callable[[str], int]] = None,
+        progress_callback: Optional[Callable[[CompressionProgress], None]] = None
+    ) -> Optional[str]:
+        """Compress directory to ZIP
+
+        Members are deflated on ``max_workers`` threads and written in path
+        order. ``level_for(path)`` picks each file's compression level, with
+        0 meaning STORE; by default already-compressed formats are stored.
+        Final byte counts are kept in ``last_progress``.
+        """
         if dst is None:
             dst = src + ".zip"
 
         try:
-            with zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED) as zipf:
-                for root, dirs, files in os.walk(src):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arcname = os.path.relpath(file_path, src)
-                        zipf.write(file_path, arcname)
+            members = []
+            for directory, files in scan_directories(src):
+                for record in files:
+                    members.append((record.path, os.path.relpath(record.path, src)))
+            members.sort(key=lambda m: m[1])
+
+            writer = ParallelZipWriter(
+                max_workers=max_workers,
+                level_for=level_for or default_level_for,
+                progress_callback=progress_callback
+            )
+            self.last_progress = writer.write(dst, members)
             return dst
         except Exception as e:
             if self.verbose:
                 print(f"Error compressing: {e}")
             return None
 
-    def decompress_file(self, src: str, dst: Optional[str] = None) -> bool:
-        """Decompress ZIP file"""
-        import zipfile
-
+    def decompress_file(
+        self,
+        src: str,
+        dst: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        max_total_size: Optional[int] = None,
+        skip_existing: bool = True
+    ) -> bool:
+        """Decompress ZIP file
+
+        Members are extracted on ``max_workers`` threads, each with its own
+        archive handle. ``include``/``exclude`` globs select members,
+        ``max_total_size`` rejects archives that expand past the limit, and
+        files whose size and CRC already match are skipped. Archives with
+        entries outside dst are refused. Counts are kept in ``last_extraction``.
+        """
         if dst is None:
-            dst = os.path.dirname(src)
+            dst = os.path.dirname(src) or os.curdir
 
         try:
-            with zipfile.ZipFile(src, 'r') as zipf:
-                zipf.extractall(dst)
-            return True
+            extractor = ParallelZipExtractor(
+                max_workers=max_workers,
+                include=include,
+                exclude=exclude,
+                max_total_size=max_total_size,
+                skip_existing=skip_existing,
+                verbose=self.verbose
+            )
+            self.last_extraction = extractor.extract(src, dst)
+            if self.verbose:
+                for name, error in self.last_extraction.errors:
+                    print(f"Error decompressing {name}: {error}")
+            return self.last_extraction.success
         except Exception as e:
             if self.verbose:
                 print(f"Error decompressing: {e}")
@@ -411,8 +724,23 @@ class AdvancedFileManager:
         self.large_file_analyzer = LargeFileAnalyzer(verbose)
         self.compressor = FileCompressor(verbose)
 
-    def get_directory_tree(self, path: str, max_depth: int = 3) -> Dict:
-        """Get directory tree structure"""
+    def get_directory_tree(
+        self,
+        path: str,
+        max_depth: int = 3,
+        with_sizes: bool = False,
+        snapshot_path: Optional[str] = None
+    ) -> Dict:
+        """Get directory tree structure
+
+        With ``with_sizes`` the tree lists directories only, each carrying
+        recursive size and file count subtotals, largest first. Passing
+        ``snapshot_path`` lets later calls rescan only changed branches.
+        """
+        if with_sizes:
+            analyzer = DirectorySizeAnalyzer(snapshot_path, self.verbose)
+            return analyzer.scan(path).to_dict(max_depth)
+
         def build_tree(current_path: str, depth: int = 0) -> Dict:
             if depth > max_depth:
                 return {}
@@ -471,18 +799,19 @@ class AdvancedFileManager:
             'compression_enabled': False
         }
 
-        # Find duplicates
-        duplicates = self.duplicate_finder.find_duplicates(path)
-        results['duplicates_found'] = len(duplicates)
+        # One traversal feeds both the duplicate and large file analyses
+        scan = TreeScan(path, self.verbose)
+        sizes = scan.subscribe(SizeGroupCollector())
+        large_files = scan.subscribe(LargeFileCollector(100 * 1024 * 1024))
+        scan.run()
 
-        for hash_val, paths in duplicates.items():
-            if paths:
-                file_size = os.path.getsize(paths[0])
-                results['space_wasted'] += file_size * (len(paths) - 1)
+        # Find duplicates
+        for group in self.duplicate_finder.iter_duplicates(path, files_by_size=sizes.files_by_size):
+            results['duplicates_found'] += 1
+            results['space_wasted'] += group.wasted_bytes
 
         # Find large files
-        large_files = self.large_file_analyzer.find_large_files(path)
-        results['large_files'] = len(large_files)
+        results['large_files'] = len(large_files.records)
 
         # Enable NTFS compression
         if self.compressor.enable_ntfs_compression(path):
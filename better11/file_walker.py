@@ -0,0 +1,132 @@
+"""
+Single-Pass Tree Walker
+
+``os.scandir``-based traversal shared by the file analyzers:
+- Reuses ``DirEntry`` type and stat data instead of separate stat calls
+- Yields compact ``FileRecord`` tuples
+- ``TreeScan`` fans one traversal out to any number of subscribers, so
+  several analyses of the same tree cost a single walk
+"""
+
+import os
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+
+class FileRecord(NamedTuple):
+    """Compact file record produced by the walker"""
+    path: str
+    name: str
+    directory: str
+    size: int
+    modified: float
+    created: float
+    accessed: float
+
+    @property
+    def extension(self) -> str:
+        """File extension including the dot"""
+        return os.path.splitext(self.name)[1]
+
+
+# Called once per directory with the files directly inside it
+Subscriber = Callable[[str, List[FileRecord]], None]
+
+
+def scan_directories(
+    root_path: str,
+    on_error: Optional[Callable[[OSError], None]] = None,
+    follow_symlinks: bool = False,
+    on_link: Optional[Callable[[str], None]] = None
+) -> Iterator[Tuple[str, List[FileRecord]]]:
+    """Yield (directory, files) for root_path and every directory below it
+
+    Symlinked directories are not followed unless follow_symlinks is set,
+    in which case their contents are yielded under the link's path and a
+    link back to one of its own ancestors is skipped to avoid cycles.
+    Links that are neither followed nor yielded as files (unfollowed
+    directory links, dangling links) are passed to on_link by path.
+    Directories are yielded top-down; entries that cannot be read are
+    skipped.
+    """
+    stack = [(root_path, frozenset())]
+
+    while stack:
+        directory, ancestors = stack.pop()
+        files = []
+        subdirs = []
+
+        try:
+            if follow_symlinks:
+                stat = os.stat(directory)
+                identity = (stat.st_dev, stat.st_ino)
+                if identity in ancestors:
+                    continue
+                ancestors = ancestors | {identity}
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=follow_symlinks):
+                            subdirs.append(entry.path)
+                        elif entry.is_file():
+                            stat = entry.stat()
+                            files.append(FileRecord(
+                                entry.path,
+                                entry.name,
+                                directory,
+                                stat.st_size,
+                                stat.st_mtime,
+                                stat.st_ctime,
+                                stat.st_atime
+                            ))
+                        elif on_link and entry.is_symlink():
+                            on_link(entry.path)
+                    except OSError as e:
+                        if on_error:
+                            on_error(e)
+        except OSError as e:
+            if on_error:
+                on_error(e)
+            continue
+
+        yield directory, files
+        stack.extend((subdir, ancestors) for subdir in reversed(subdirs))
+
+
+def walk_files(
+    root_path: str,
+    on_error: Optional[Callable[[OSError], None]] = None
+) -> Iterator[FileRecord]:
+    """Yield a FileRecord for every file below root_path"""
+    for _, files in scan_directories(root_path, on_error):
+        yield from files
+
+
+class TreeScan:
+    """Run several analyses over one traversal of a tree"""
+
+    def __init__(self, root_path: str, verbose: bool = False):
+        self.root_path = root_path
+        self.verbose = verbose
+        self._subscribers: List[Subscriber] = []
+
+    def subscribe(self, subscriber: Subscriber) -> Subscriber:
+        """Register a per-directory callback and return it"""
+        self._subscribers.append(subscriber)
+        return subscriber
+
+    def _on_error(self, error: OSError):
+        if self.verbose:
+            print(f"Error scanning: {error}")
+
+    def run(self) -> dict:
+        """Walk the tree once, feeding every subscriber"""
+        stats = {'directories': 0, 'files': 0, 'bytes': 0}
+
+        for directory, files in scan_directories(self.root_path, self._on_error):
+            stats['directories'] += 1
+            stats['files'] += len(files)
+            stats['bytes'] += sum(record.size for record in files)
+            for subscriber in self._subscribers:
+                subscriber(directory, files)
+
+        return stats
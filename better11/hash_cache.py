@@ -0,0 +1,206 @@
+"""
+Persistent Content-Hash Cache
+
+Shared cache of file digests used by duplicate detection and the package
+cache:
+- Keyed by file identity (device, inode), size and mtime
+- Several algorithms per file, computed together in a single read
+- SQLite storage with least-recently-used eviction
+
+A file whose identity, size and mtime are unchanged is never read twice.
+Integrity checks (downloads, ISO verification) must not trust metadata and
+use :func:`hash_file`, which always reads the file. The cache location
+defaults to ``~/.better11/hash_cache.db`` and can be overridden with the
+``BETTER11_HASH_CACHE`` environment variable.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+
+# Read size used when hashing whole files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS hashes (
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    algorithm TEXT NOT NULL,
+    digest TEXT NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (device, inode, path, algorithm)
+);
+CREATE INDEX IF NOT EXISTS idx_hashes_last_used ON hashes(last_used);
+"""
+
+
+class HashCache:
+    """Persistent file digest cache with LRU eviction"""
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        max_entries: int = 100000,
+        chunk_size: int = HASH_CHUNK_SIZE
+    ):
+        self.db_path = db_path or os.environ.get("BETTER11_HASH_CACHE") or os.path.join(
+            os.path.expanduser("~"), ".better11", "hash_cache.db"
+        )
+        self.max_entries = max_entries
+        self.chunk_size = chunk_size
+        if self.db_path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        # Every lookup and insert commits; WAL with NORMAL sync keeps those
+        # commits from forcing an fsync each
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+        self.hits = 0
+        self.misses = 0
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _identity(file_path: str, stat: os.stat_result) -> Tuple[int, int, str]:
+        """Key a file by device and inode, falling back to its path"""
+        if stat.st_ino:
+            return stat.st_dev, stat.st_ino, ""
+        return stat.st_dev, 0, os.path.abspath(file_path)
+
+    def get_hashes(self, file_path: str, algorithms: Iterable[str] = ("sha256",)) -> Dict[str, str]:
+        """Return digests of file_path, reading it only for algorithms not cached"""
+        algorithms = [a.lower() for a in algorithms]
+        stat = os.stat(file_path)
+        device, inode, path = self._identity(file_path, stat)
+        key = (device, inode, path)
+
+        digests = {}
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT algorithm, digest FROM hashes WHERE device = ? AND inode = ? AND path = ?"
+                " AND size = ? AND mtime_ns = ?",
+                key + (stat.st_size, stat.st_mtime_ns)
+            ).fetchall()
+            cached = dict(rows)
+            for algorithm in algorithms:
+                if algorithm in cached:
+                    digests[algorithm] = cached[algorithm]
+            if digests:
+                self._conn.execute(
+                    "UPDATE hashes SET last_used = ? WHERE device = ? AND inode = ? AND path = ?",
+                    (time.time(),) + key
+                )
+                self._conn.commit()
+
+            missing = [a for a in algorithms if a not in digests]
+            self.hits += len(digests)
+            self.misses += len(missing)
+
+        if not missing:
+            return digests
+
+        fresh = hash_file_multi(file_path, missing, self.chunk_size)
+
+        # Skip caching if the file changed while it was being read
+        after = os.stat(file_path)
+        digests.update(fresh)
+        if (after.st_size, after.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+            return digests
+
+        now = time.time()
+        with self._lock:
+            # Entries for an older version of the file are stale
+            stale = self._conn.execute(
+                "DELETE FROM hashes WHERE device = ? AND inode = ? AND path = ?"
+                " AND (size != ? OR mtime_ns != ?)",
+                key + (stat.st_size, stat.st_mtime_ns)
+            ).rowcount
+            for algorithm, digest in fresh.items():
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    key + (stat.st_size, stat.st_mtime_ns, algorithm, digest, now)
+                )
+            self._entries += len(fresh) - stale
+            self._evict()
+            self._conn.commit()
+
+        return digests
+
+    def get_hash(self, file_path: str, algorithm: str = "sha256") -> str:
+        """Return a single digest of file_path"""
+        return self.get_hashes(file_path, (algorithm,))[algorithm.lower()]
+
+    def _evict(self):
+        """Drop least recently used entries beyond max_entries"""
+        if self._entries <= self.max_entries:
+            return
+
+        # Trim to 90% so eviction does not run on every insert
+        target = int(self.max_entries * 0.9)
+        self._conn.execute(
+            "DELETE FROM hashes WHERE rowid IN "
+            "(SELECT rowid FROM hashes ORDER BY last_used LIMIT ?)",
+            (self._entries - target,)
+        )
+        self._entries = target
+
+    def clear(self):
+        """Remove every cached digest"""
+        with self._lock:
+            self._conn.execute("DELETE FROM hashes")
+            self._conn.commit()
+            self._entries = 0
+
+    def __len__(self) -> int:
+        return self._entries
+
+
+def hash_file_multi(
+    file_path: str,
+    algorithms: Iterable[str] = ("sha256",),
+    chunk_size: int = HASH_CHUNK_SIZE
+) -> Dict[str, str]:
+    """Compute several digests of file_path in one read, bypassing the cache"""
+    hashers = {a.lower(): hashlib.new(a) for a in algorithms}
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            for hasher in hashers.values():
+                hasher.update(chunk)
+    return {a: h.hexdigest() for a, h in hashers.items()}
+
+
+def hash_file(file_path: str, algorithm: str = "sha256") -> str:
+    """Hash file_path from its contents, for checks that must not trust metadata"""
+    return hash_file_multi(str(file_path), (algorithm,))[algorithm.lower()]
+
+
+_default_cache: Optional[HashCache] = None
+_default_lock = threading.Lock()
+
+
+def get_hash_cache() -> HashCache:
+    """Return the process-wide shared hash cache"""
+    global _default_cache
+    with _default_lock:
+        if _default_cache is None:
+            _default_cache = HashCache()
+        return _default_cache
+
+
+def cached_file_hash(file_path: str, algorithm: str = "sha256") -> str:
+    """Hash file_path through the shared cache"""
+    return get_hash_cache().get_hash(str(file_path), algorithm)
@@ -21,6 +21,8 @@ from enum import Enum
 import tempfile
 import urllib.parse
 
+from better11.hash_cache import hash_file
+
 
 class WindowsEdition(Enum):
     """Windows editions available for download"""
@@ -232,13 +234,7 @@ class ISODownloader:
 
     def _calculate_file_hash(self, file_path: str) -> str:
         """Calculate SHA256 hash of file"""
-        sha256_hash = hashlib.sha256()
-
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-
-        return sha256_hash.hexdigest()
+        return hash_file(file_path, "sha256")
 
 
 class USBBootCreator:
@@ -0,0 +1,405 @@
+"""
+System Metrics Sampler
+
+Background sampling of CPU, memory, disk and network counters:
+- Raw counters come from a pluggable reader: ``ProcReader`` parses
+  ``/proc`` on Linux, ``PsutilReader`` uses psutil everywhere else
+- Each sample turns counter deltas into rates (CPU busy percent, bytes
+  per second) and is kept in fixed-size ``array`` ring buffers, so
+  memory use is constant however long the sampler runs
+- History can be queried as windowed averages and percentiles, and two
+  windows compared to measure the effect of a change
+"""
+
+import os
+import re
+import time
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+
+# Seconds between samples
+DEFAULT_INTERVAL = 1.0
+# Samples kept per metric (10 minutes at the default interval)
+DEFAULT_CAPACITY = 600
+
+# Metrics recorded for every sample
+METRICS = (
+    'cpu_percent',
+    'memory_percent',
+    'disk_read_bps',
+    'disk_write_bps',
+    'net_recv_bps',
+    'net_sent_bps',
+)
+
+# Partitions and virtual devices are skipped when summing /proc/diskstats
+_PARTITION_RE = re.compile(r"^((sd|hd|vd|xvd)[a-z]+\d+|(nvme\d+n\d+|mmcblk\d+)p\d+)$")
+_VIRTUAL_DISK_PREFIXES = ("loop", "ram", "zram", "dm-", "md", "sr")
+_SECTOR_SIZE = 512
+
+
+@dataclass
+class Counters:
+    """Raw cumulative counters read at one instant"""
+    cpu_busy: float
+    cpu_total: float
+    memory_total: int
+    memory_available: int
+    disk_read_bytes: int
+    disk_write_bytes: int
+    net_recv_bytes: int
+    net_sent_bytes: int
+
+
+class ProcReader:
+    """Read counters from a Linux ``/proc`` tree"""
+
+    def __init__(self, root: str = "/proc"):
+        self.root = root
+
+    def _read(self, name: str) -> str:
+        with open(os.path.join(self.root, name), 'r') as f:
+            return f.read()
+
+    def read(self) -> Counters:
+        # cpu user nice system idle iowait irq softirq steal [guest guest_nice]
+        cpu_fields = [float(v) for v in self._read("stat").split('\n', 1)[0].split()[1:9]]
+        idle = cpu_fields[3] + (cpu_fields[4] if len(cpu_fields) > 4 else 0.0)
+        total = sum(cpu_fields)
+
+        memory = {}
+        for line in self._read("meminfo").splitlines():
+            key, _, rest = line.partition(':')
+            if key in ('MemTotal', 'MemAvailable'):
+                memory[key] = int(rest.split()[0]) * 1024
+
+        read_bytes = write_bytes = 0
+        for line in self._read("diskstats").splitlines():
+            fields = line.split()
+            if len(fields) < 10:
+                continue
+            device = fields[2]
+            if device.startswith(_VIRTUAL_DISK_PREFIXES) or _PARTITION_RE.match(device):
+                continue
+            read_bytes += int(fields[5]) * _SECTOR_SIZE
+            write_bytes += int(fields[9]) * _SECTOR_SIZE
+
+        recv_bytes = sent_bytes = 0
+        for line in self._read(os.path.join("net", "dev")).splitlines()[2:]:
+            interface, _, data = line.partition(':')
+            if interface.strip() == 'lo' or not data:
+                continue
+            fields = data.split()
+            recv_bytes += int(fields[0])
+            sent_bytes += int(fields[8])
+
+        return Counters(
+            cpu_busy=total - idle,
+            cpu_total=total,
+            memory_total=memory.get('MemTotal', 0),
+            memory_available=memory.get('MemAvailable', 0),
+            disk_read_bytes=read_bytes,
+            disk_write_bytes=write_bytes,
+            net_recv_bytes=recv_bytes,
+            net_sent_bytes=sent_bytes
+        )
+
+
+class PsutilReader:
+    """Read counters through psutil"""
+
+    def __init__(self):
+        import psutil
+        self._psutil = psutil
+
+    def read(self) -> Counters:
+        psutil = self._psutil
+        cpu = psutil.cpu_times()
+        idle = cpu.idle + getattr(cpu, 'iowait', 0.0)
+        total = sum(cpu) - getattr(cpu, 'guest', 0.0) - getattr(cpu, 'guest_nice', 0.0)
+        memory = psutil.virtual_memory()
+        disk = psutil.disk_io_counters()
+        net = psutil.net_io_counters()
+
+        return Counters(
+            cpu_busy=total - idle,
+            cpu_total=total,
+            memory_total=memory.total,
+            memory_available=memory.available,
+            disk_read_bytes=disk.read_bytes if disk else 0,
+            disk_write_bytes=disk.write_bytes if disk else 0,
+            net_recv_bytes=net.bytes_recv if net else 0,
+            net_sent_bytes=net.bytes_sent if net else 0
+        )
+
+
+def default_reader():
+    """``ProcReader`` where ``/proc`` exists, otherwise ``PsutilReader``"""
+    if os.path.exists("/proc/stat"):
+        return ProcReader()
+    return PsutilReader()
+
+
+class RingBuffer:
+    """Fixed-capacity buffer of floats that overwrites its oldest values"""
+
+    def __init__(self, capacity: int):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self._data = array('d', bytes(8 * capacity))
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        return self._count
+
+    def append(self, value: float):
+        end = (self._start + self._count) % self.capacity
+        self._data[end] = value
+        if self._count < self.capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % self.capacity
+
+    def __getitem__(self, index: int) -> float:
+        """Value by age order; 0 is the oldest, -1 the newest"""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("ring buffer index out of range")
+        return self._data[(self._start + index) % self.capacity]
+
+    def values(self, last: Optional[int] = None) -> List[float]:
+        """Values oldest first, optionally only the newest ``last``"""
+        count = self._count if last is None else min(last, self._count)
+        first = self._start + self._count - count
+        return [self._data[i % self.capacity] for i in range(first, first + count)]
+
+
+def percentile(values: List[float], q: float) -> float:
+    """Linearly interpolated q-th percentile (0-100) of values"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    position = (len(ordered) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+@dataclass
+class MetricsDelta:
+    """Average metrics before and after a change"""
+    before: Dict[str, float]
+    after: Dict[str, float]
+
+    @property
+    def change(self) -> Dict[str, float]:
+        """after minus before, per metric"""
+        return {m: self.after[m] - self.before[m] for m in self.before if m in self.after}
+
+    def describe(self) -> str:
+        """One-line human-readable comparison"""
+        if not self.before or not self.after:
+            return "Not enough samples to measure"
+        parts = [
+            f"CPU {self.before['cpu_percent']:.1f}% -> {self.after['cpu_percent']:.1f}%",
+            f"memory {self.before['memory_percent']:.1f}% -> {self.after['memory_percent']:.1f}%",
+        ]
+        disk_before = self.before['disk_read_bps'] + self.before['disk_write_bps']
+        disk_after = self.after['disk_read_bps'] + self.after['disk_write_bps']
+        parts.append(f"disk {disk_before / 1024:.0f} -> {disk_after / 1024:.0f} KB/s")
+        return ", ".join(parts)
+
+
+class MetricsSampler:
+    """Sample system counters into ring buffers on a background thread"""
+
+    def __init__(
+        self,
+        interval: float = DEFAULT_INTERVAL,
+        capacity: int = DEFAULT_CAPACITY,
+        reader=None,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.interval = interval
+        self.capacity = capacity
+        self.reader = reader or default_reader()
+        self.clock = clock
+        self._timestamps = RingBuffer(capacity)
+        self._series: Dict[str, RingBuffer] = {m: RingBuffer(capacity) for m in METRICS}
+        self._previous: Optional[Counters] = None
+        self._previous_time = 0.0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "MetricsSampler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def __len__(self) -> int:
+        return len(self._timestamps)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """Start sampling in the background; does nothing if running"""
+        if self.running:
+            return
+        self._stop.clear()
+        self.sample()
+        self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stop the background thread, keeping the history"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except (OSError, ValueError, IndexError):
+                # A transient read failure skips one sample
+                continue
+
+    def sample(self) -> Optional[Dict[str, float]]:
+        """Read counters now and record rates since the previous read
+
+        The first call only primes the counters and returns None.
+        """
+        counters = self.reader.read()
+        now = self.clock()
+        with self._lock:
+            previous, previous_time = self._previous, self._previous_time
+            self._previous, self._previous_time = counters, now
+            if previous is None or now <= previous_time:
+                return None
+
+            elapsed = now - previous_time
+            cpu_total = counters.cpu_total - previous.cpu_total
+            values = {
+                'cpu_percent': max(0.0, min(100.0, 100.0 * (counters.cpu_busy - previous.cpu_busy) / cpu_total))
+                if cpu_total > 0 else 0.0,
+                'memory_percent': 100.0 * (counters.memory_total - counters.memory_available) / counters.memory_total
+                if counters.memory_total else 0.0,
+                'disk_read_bps': max(0, counters.disk_read_bytes - previous.disk_read_bytes) / elapsed,
+                'disk_write_bps': max(0, counters.disk_write_bytes - previous.disk_write_bytes) / elapsed,
+                'net_recv_bps': max(0, counters.net_recv_bytes - previous.net_recv_bytes) / elapsed,
+                'net_sent_bps': max(0, counters.net_sent_bytes - previous.net_sent_bytes) / elapsed,
+            }
+            self._timestamps.append(now)
+            for metric, value in values.items():
+                self._series[metric].append(value)
+        return values
+
+    def _select(self, window: Optional[float], start: Optional[float], end: Optional[float]) -> slice:
+        """Positions of samples in the window or [start, end]; hold the lock"""
+        if window is not None:
+            start = self.clock() - window
+        times = self._timestamps.values()
+        first = 0 if start is None else next((i for i, t in enumerate(times) if t >= start), len(times))
+        last = len(times) if end is None else next((i for i, t in enumerate(times) if t > end), len(times))
+        return slice(first, last)
+
+    def history(
+        self,
+        metric: str,
+        window: Optional[float] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> List[float]:
+        """Recorded values of a metric, oldest first
+
+        ``window`` limits to the last so many seconds; ``start`` and ``end``
+        select an explicit range of sampler clock times.
+        """
+        if metric not in self._series:
+            raise KeyError(f"Unknown metric: {metric}")
+        with self._lock:
+            return self._series[metric].values()[self._select(window, start, end)]
+
+    def latest(self, metric: str) -> Optional[float]:
+        """Most recent value of a metric, or None before the first sample"""
+        with self._lock:
+            series = self._series[metric]
+            return series[-1] if len(series) else None
+
+    def average(self, metric: str, window: Optional[float] = None) -> float:
+        """Mean of a metric over the window"""
+        values = self.history(metric, window)
+        return sum(values) / len(values) if values else 0.0
+
+    def percentile(self, metric: str, q: float, window: Optional[float] = None) -> float:
+        """q-th percentile (0-100) of a metric over the window"""
+        return percentile(self.history(metric, window), q)
+
+    def summary(
+        self,
+        window: Optional[float] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None
+    ) -> Dict[str, float]:
+        """Mean of every metric over a window; empty if it has no samples"""
+        with self._lock:
+            selected = self._select(window, start, end)
+            columns = {m: self._series[m].values()[selected] for m in METRICS}
+        if not columns[METRICS[0]]:
+            return {}
+        return {m: sum(values) / len(values) for m, values in columns.items()}
+
+    def compare(self, before_start: float, change: float, after_end: Optional[float] = None) -> MetricsDelta:
+        """Averages before ``change`` against averages after it"""
+        return MetricsDelta(
+            before=self.summary(start=before_start, end=change),
+            after=self.summary(start=change, end=after_end)
+        )
+
+    def measure(self, action: Callable[[], object], baseline: float = 5.0, settle: float = 5.0):
+        """Run action and measure its effect
+
+        Waits until ``baseline`` seconds of history exist, runs the action,
+        then samples for ``settle`` seconds. The "before" window ends when
+        the action starts and the "after" window begins one interval after
+        it returns, so neither includes the action's own load. A sampler
+        started here is stopped again before returning.
+
+        Returns:
+            (action result, MetricsDelta)
+        """
+        started = not self.running
+        self.start()
+        try:
+            ready = self.clock()
+            with self._lock:
+                oldest = self._timestamps[0] if len(self._timestamps) else ready
+            if ready - oldest < baseline:
+                time.sleep(baseline - (ready - oldest))
+
+            changed = self.clock()
+            result = action()
+            # Samples cover the interval before them; skip ones overlapping the action
+            settled = self.clock() + self.interval
+            time.sleep(self.interval + settle)
+            delta = MetricsDelta(
+                before=self.summary(start=changed - baseline, end=changed),
+                after=self.summary(start=settled, end=settled + settle)
+            )
+        finally:
+            if started:
+                self.stop()
+        return result, delta
+
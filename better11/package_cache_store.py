@@ -0,0 +1,229 @@
+"""
+Package Cache Metadata Store
+
+SQLite backend for PackageCache metadata:
+- One row per (manager, package_id, version), indexed for lookups by
+  manager, package id, version, checksum and last use
+- WAL journaling with a busy timeout, so several processes can read and
+  write the cache at once; every change commits as one transaction
+- One-time import of the ``cache_metadata.json`` file used previously
+"""
+
+import os
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    manager TEXT NOT NULL,
+    package_id TEXT NOT NULL,
+    version TEXT NOT NULL,
+    package TEXT NOT NULL,
+    cache_path TEXT NOT NULL,
+    cache_date TEXT NOT NULL,
+    checksum TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_used REAL NOT NULL,
+    PRIMARY KEY (manager, package_id, version)
+);
+CREATE INDEX IF NOT EXISTS idx_entries_package ON entries(package_id, version);
+CREATE INDEX IF NOT EXISTS idx_entries_version ON entries(version);
+CREATE INDEX IF NOT EXISTS idx_entries_checksum ON entries(checksum);
+CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries(last_used);
+"""
+
+_COLUMNS = "manager, package_id, version, package, cache_path, cache_date, checksum, size, last_used"
+
+# Seconds a writer waits for another process's transaction to finish
+BUSY_TIMEOUT = 30.0
+
+# (manager, package_id, version)
+EntryKey = Tuple[str, str, str]
+
+
+class CacheMetadataStore:
+    """Indexed, transactional metadata for cached packages"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, timeout=BUSY_TIMEOUT, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    @staticmethod
+    def _row_to_dict(row) -> Dict:
+        return {
+            'manager': row[0],
+            'package_id': row[1],
+            'version': row[2],
+            'package': json.loads(row[3]),
+            'cache_path': row[4],
+            'cache_date': row[5],
+            'checksum': row[6],
+            'size': row[7],
+            'last_used': row[8]
+        }
+
+    @staticmethod
+    def _dict_to_row(entry: Dict) -> Tuple:
+        return (
+            entry['manager'], entry['package_id'], entry['version'],
+            json.dumps(entry['package']), entry['cache_path'], entry['cache_date'],
+            entry['checksum'], entry['size'], entry['last_used']
+        )
+
+    def put(self, entry: Dict):
+        """Insert or replace one entry"""
+        self.put_many([entry])
+
+    def put_many(self, entries: Iterable[Dict]):
+        """Insert or replace entries in a single transaction"""
+        rows = [self._dict_to_row(entry) for entry in entries]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO entries ({_COLUMNS}) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+    def get(self, manager: str, package_id: str, version: str) -> Optional[Dict]:
+        """Entry for an exact package version"""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM entries WHERE manager = ? AND package_id = ? AND version = ?",
+                (manager, package_id, version)
+            ).fetchone()
+        return self._row_to_dict(row) if row else None
+
+    def find(
+        self,
+        manager: Optional[str] = None,
+        package_id: Optional[str] = None,
+        version: Optional[str] = None
+    ) -> List[Dict]:
+        """Entries matching every given field"""
+        clauses = []
+        params = []
+        for column, value in (('manager', manager), ('package_id', package_id), ('version', version)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM entries{where} ORDER BY manager, package_id, version",
+                params
+            ).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def touch(self, key: EntryKey, when: Optional[float] = None):
+        """Record that an entry was used"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE entries SET last_used = ? WHERE manager = ? AND package_id = ? AND version = ?",
+                (time.time() if when is None else when,) + tuple(key)
+            )
+
+    def delete(self, keys: Iterable[EntryKey]) -> List[Dict]:
+        """Delete entries, returning the rows removed"""
+        removed = []
+        with self._lock, self._conn:
+            for key in keys:
+                row = self._conn.execute(
+                    f"SELECT {_COLUMNS} FROM entries WHERE manager = ? AND package_id = ? AND version = ?",
+                    tuple(key)
+                ).fetchone()
+                if row:
+                    self._conn.execute(
+                        "DELETE FROM entries WHERE manager = ? AND package_id = ? AND version = ?",
+                        tuple(key)
+                    )
+                    removed.append(self._row_to_dict(row))
+        return removed
+
+    def is_referenced(self, checksum: str) -> bool:
+        """Whether any entry still uses a payload"""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM entries WHERE checksum = ? LIMIT 1", (checksum,)
+            ).fetchone() is not None
+
+    def payloads_by_last_use(self) -> List[Tuple[str, float, int, List[EntryKey]]]:
+        """(checksum, last_used, size, keys) per payload, least recently used first"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT checksum, last_used, size, manager, package_id, version FROM entries"
+            ).fetchall()
+
+        payloads: Dict[str, Tuple[float, int, List[EntryKey]]] = {}
+        for checksum, last_used, size, manager, package_id, version in rows:
+            previous, previous_size, keys = payloads.get(checksum, (0.0, 0, []))
+            keys.append((manager, package_id, version))
+            payloads[checksum] = (max(previous, last_used), max(previous_size, size), keys)
+
+        return sorted(
+            ((checksum,) + values for checksum, values in payloads.items()),
+            key=lambda item: item[1]
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def migrate_json(self, json_path: str) -> int:
+        """Import a legacy cache_metadata.json, then rename it aside
+
+        Returns the number of entries imported.
+        """
+        try:
+            with open(json_path, 'r') as f:
+                legacy = json.load(f)
+        except FileNotFoundError:
+            return 0
+        except ValueError:
+            legacy = {}
+
+        entries = []
+        for data in legacy.values():
+            package = data['package']
+            try:
+                size = os.path.getsize(data['cache_path'])
+            except OSError:
+                size = 0
+            try:
+                last_used = datetime.fromisoformat(data['cache_date']).timestamp()
+            except (KeyError, ValueError):
+                last_used = time.time()
+            entries.append({
+                'manager': package['manager'],
+                'package_id': package['package_id'],
+                'version': package['version'],
+                'package': package,
+                'cache_path': data['cache_path'],
+                'cache_date': data.get('cache_date', ''),
+                'checksum': data['checksum'],
+                'size': data.get('size', size),
+                'last_used': data.get('last_used', last_used)
+            })
+
+        self.put_many(entries)
+        try:
+            os.replace(json_path, json_path + ".migrated")
+        except FileNotFoundError:
+            # Another process migrated the same file concurrently
+            pass
+        return len(entries)
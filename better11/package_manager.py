@@ -13,16 +13,62 @@ Universal package management supporting:
 """
 
 import os
+import re
 import subprocess
 import json
 import shutil
 import tempfile
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple, Set
+from typing import Callable, List, Dict, Iterable, Iterator, Optional, Tuple, Set
+from concurrent.futures import FIRST_COMPLETED, CancelledError, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError, as_completed, wait
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum
 from abc import ABC, abstractmethod
 import hashlib
+import threading
+import time
+
+from better11.blob_store import BlobStore
+from better11.command_backend import (
+    TIMEOUT_RETURNCODE,
+    CancelScope,
+    CommandBackend,
+    LineCallback,
+    get_default_backend,
+)
+from better11.hash_cache import cached_file_hash
+from better11.package_cache_store import CacheMetadataStore
+from better11.package_parsers import iter_choco_records, iter_winget_table
+
+
+# Seconds before a single package manager command is killed
+DEFAULT_COMMAND_TIMEOUT = 1800.0
+# Seconds to wait for one package manager during a fan-out query
+DEFAULT_MANAGER_TIMEOUT = 60.0
+# Seconds a package manager availability probe stays valid
+DEFAULT_CAPABILITY_TTL = 300.0
+# Seconds before an installed-package snapshot is refreshed in the background
+DEFAULT_INVENTORY_MAX_AGE = 3600.0
+# Parallel downloads when prefetching into the package cache
+DEFAULT_PREFETCH_WORKERS = 4
+
+CHOCOLATEY_PACKAGE_URL = "https://community.chocolatey.org/api/v2/package/{package_id}/{version}"
+# Installer types WinGet artifacts can be installed from without the network.
+# EXE installers take per-package switches only the WinGet manifest knows,
+# so packages that ship one are always installed through winget.
+WINGET_DIRECT_INSTALLERS = {".msi", ".msix", ".msixbundle", ".appx", ".appxbundle"}
+# Characters PowerShell accepts as single quotes
+_POWERSHELL_QUOTES = "'\u2018\u2019\u201a\u201b"
+
+# Concurrent installs per manager in a batch. Managers that share one
+# environment (site-packages, the global npm prefix) default to one.
+DEFAULT_INSTALL_CONCURRENCY = 1
+
+
+def _powershell_literal(value: str) -> str:
+    """Quote value as a PowerShell single-quoted string literal"""
+    return "'" + "".join(c * 2 if c in _POWERSHELL_QUOTES else c for c in value) + "'"
 
 
 class PackageManager(Enum):
@@ -37,6 +83,11 @@ class PackageManager(Enum):
     CUSTOM = "custom"
 
 
+# Managers that hold a global lock (Windows Installer mutex, choco lib
+# lock) are always serialized, whatever limit is requested
+GLOBALLY_LOCKED_MANAGERS = {PackageManager.WINGET, PackageManager.CHOCOLATEY}
+
+
 class PackageStatus(Enum):
     """Package installation status"""
     NOT_INSTALLED = "Not Installed"
@@ -81,6 +132,14 @@ class Package:
             'dependencies': self.dependencies
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Package":
+        """Create from dictionary produced by to_dict"""
+        values = dict(data)
+        values['manager'] = PackageManager(values['manager'])
+        values['status'] = PackageStatus(values.get('status', PackageStatus.NOT_INSTALLED.value))
+        return cls(**values)
+
 
 @dataclass
 class CachedPackage:
@@ -95,8 +154,56 @@ class CachedPackage:
 class BasePackageManager(ABC):
     """Abstract base class for package managers"""
 
-    def __init__(self, verbose: bool = False):
+    # Program looked up on PATH before anything is spawned
+    executable: Optional[str] = None
+
+    # Seconds before a manager command is killed
+    command_timeout: Optional[float] = DEFAULT_COMMAND_TIMEOUT
+
+    def __init__(self, verbose: bool = False, backend: Optional[CommandBackend] = None):
         self.verbose = verbose
+        self.backend = backend or get_default_backend()
+        self._scopes = threading.local()
+
+    @contextmanager
+    def cancel_scope(self, scope: Optional[CancelScope] = None) -> Iterator[CancelScope]:
+        """Group the commands this thread runs until the block exits
+
+        Cancelling the yielded scope (a new one unless given) kills those
+        commands, and later ones in the block fail at once with
+        ``TIMEOUT_RETURNCODE``.
+        """
+        scope = scope or CancelScope()
+        previous = getattr(self._scopes, 'current', None)
+        self._scopes.current = scope
+        try:
+            yield scope
+        finally:
+            self._scopes.current = previous
+
+    def version_command(self) -> List[str]:
+        """Command that prints the manager's version"""
+        return [self.executable, "--version"]
+
+    def probe(self) -> Tuple[bool, Optional[str], str]:
+        """Detect the manager, returning (available, executable path, version)
+
+        The executable is located with ``shutil.which`` first, so a missing
+        manager costs no process launch.
+        """
+        if not self.executable:
+            return self.is_available(), None, ""
+
+        path = shutil.which(self.executable)
+        if path is None:
+            return False, None, ""
+
+        result = self._run_command(self.version_command(), check=False)
+        if result.returncode != 0:
+            return False, path, ""
+
+        lines = result.stdout.strip().splitlines()
+        return True, path, lines[0].strip() if lines else ""
 
     @abstractmethod
     def is_available(self) -> bool:
@@ -128,17 +235,62 @@ class BasePackageManager(ABC):
         """Update package(s)"""
         pass
 
-    def _run_command(self, cmd: List[str], check: bool = True) -> subprocess.CompletedProcess:
-        """Execute command"""
+    def update_many(self, package_ids: List[str]) -> bool:
+        """Update several packages
+
+        Managers whose CLI accepts several packages override this to issue
+        one batched command.
+        """
+        results = [self.update(package_id) for package_id in package_ids]
+        return all(results)
+
+    def catalog(self) -> List[Package]:
+        """Every package the manager's sources offer, for the search index
+
+        Managers without a way to enumerate their sources return an empty
+        list; their catalogs come from dumps or earlier search results.
+        """
+        return []
+
+    def download(self, package_id: str, version: Optional[str], dest_dir: str) -> List[Tuple[Package, str]]:
+        """Fetch installable artifacts without installing
+
+        Returns (package, path) for every file written to dest_dir. Managers
+        that cannot download return an empty list.
+        """
+        return []
+
+    def install_from_feed(self, package: Package, artifact: str, feed_dir: str) -> bool:
+        """Install a cached artifact; feed_dir holds every cached artifact of this manager"""
+        return False
+
+    def _run_command(
+        self,
+        cmd: List[str],
+        check: bool = True,
+        timeout: Optional[float] = None,
+        on_line: Optional[LineCallback] = None
+    ) -> subprocess.CompletedProcess:
+        """Execute command through the backend
+
+        The command is killed after ``timeout`` seconds (``command_timeout``
+        by default) and reported with ``TIMEOUT_RETURNCODE``. on_line
+        receives output lines as they arrive.
+        """
         if self.verbose:
             print(f"Executing: {' '.join(cmd)}")
 
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            check=False
-        )
+        scope = getattr(self._scopes, 'current', None)
+        future = self.backend.submit(cmd, timeout or self.command_timeout, on_line)
+        if scope is not None:
+            scope.add(future)
+        try:
+            result = future.result()
+        except CancelledError:
+            result = subprocess.CompletedProcess(list(cmd), TIMEOUT_RETURNCODE, "", "Cancelled\n")
+        finally:
+            if scope is not None:
+                scope.discard(future)
 
         if check and result.returncode != 0:
             raise RuntimeError(f"Command failed: {result.stderr}")
@@ -149,14 +301,15 @@ class BasePackageManager(ABC):
 class WinGetManager(BasePackageManager):
     """Windows Package Manager (WinGet)"""
 
-    def __init__(self, verbose: bool = False):
-        super().__init__(verbose)
+    executable = "winget"
+
+    def __init__(self, verbose: bool = False, backend: Optional[CommandBackend] = None):
+        super().__init__(verbose, backend)
         self.manager_type = PackageManager.WINGET
 
     def is_available(self) -> bool:
         """Check if WinGet is installed"""
-        result = self._run_command(["winget", "--version"], check=False)
-        return result.returncode == 0
+        return self.probe()[0]
 
     def search(self, query: str, limit: int = 50) -> List[Package]:
         """Search for packages"""
@@ -167,27 +320,18 @@ class WinGetManager(BasePackageManager):
         if result.returncode != 0:
             return []
 
-        # Parse WinGet output
         packages = []
-        lines = result.stdout.split('\n')
-
-        for line in lines[2:]:  # Skip header
-            if not line.strip():
-                continue
-
-            parts = line.split()
-            if len(parts) >= 3:
-                package = Package(
-                    name=parts[0],
-                    package_id=parts[1] if len(parts) > 1 else parts[0],
-                    version=parts[2] if len(parts) > 2 else "Unknown",
-                    manager=self.manager_type,
-                    source="winget"
-                )
-                packages.append(package)
-
-                if len(packages) >= limit:
-                    break
+        for row in iter_winget_table(result.stdout):
+            packages.append(Package(
+                name=row.name,
+                package_id=row.package_id,
+                version=row.version,
+                manager=self.manager_type,
+                source=row.source or "winget"
+            ))
+
+            if len(packages) >= limit:
+                break
 
         return packages
 
@@ -200,25 +344,17 @@ class WinGetManager(BasePackageManager):
         if result.returncode != 0:
             return []
 
-        packages = []
-        lines = result.stdout.split('\n')
-
-        for line in lines[2:]:  # Skip header
-            if not line.strip():
-                continue
-
-            parts = line.split()
-            if len(parts) >= 2:
-                package = Package(
-                    name=parts[0],
-                    package_id=parts[1] if len(parts) > 1 else parts[0],
-                    version=parts[2] if len(parts) > 2 else "Unknown",
-                    manager=self.manager_type,
-                    status=PackageStatus.INSTALLED
-                )
-                packages.append(package)
-
-        return packages
+        return [
+            Package(
+                name=row.name,
+                package_id=row.package_id,
+                version=row.version,
+                manager=self.manager_type,
+                source=row.source or "",
+                status=PackageStatus.UPDATE_AVAILABLE if row.available else PackageStatus.INSTALLED
+            )
+            for row in iter_winget_table(result.stdout)
+        ]
 
     def install(self, package_id: str, version: Optional[str] = None) -> bool:
         """Install a package"""
@@ -247,6 +383,44 @@ class WinGetManager(BasePackageManager):
         result = self._run_command(cmd, check=False)
         return result.returncode == 0
 
+    def download(self, package_id: str, version: Optional[str], dest_dir: str) -> List[Tuple[Package, str]]:
+        """Download the installer with ``winget download``
+
+        Only MSI and MSIX-family installers are returned for caching; EXE
+        installers are left out because they cannot be installed offline.
+        """
+        cmd = [
+            "winget", "download", "--id", package_id, "--exact", "--download-directory", dest_dir,
+            "--accept-package-agreements", "--accept-source-agreements"
+        ]
+        if version:
+            cmd.extend(["--version", version])
+
+        result = self._run_command(cmd, check=False)
+        if result.returncode != 0:
+            return []
+
+        package = Package(name=package_id, package_id=package_id, version=version or "latest",
+                          manager=self.manager_type, source="winget")
+        return [
+            (package, os.path.join(dest_dir, name))
+            for name in sorted(os.listdir(dest_dir))
+            if os.path.splitext(name)[1].lower() in WINGET_DIRECT_INSTALLERS
+        ]
+
+    def install_from_feed(self, package: Package, artifact: str, feed_dir: str) -> bool:
+        """Run a cached MSI or MSIX installer directly"""
+        extension = os.path.splitext(artifact)[1].lower()
+        if extension == ".msi":
+            cmd = ["msiexec", "/i", artifact, "/qn", "/norestart"]
+        elif extension in WINGET_DIRECT_INSTALLERS:
+            cmd = ["powershell", "-NoProfile", "-Command", f"Add-AppxPackage -LiteralPath {_powershell_literal(artifact)}"]
+        else:
+            return False
+
+        result = self._run_command(cmd, check=False)
+        return result.returncode == 0
+
     def export_installed(self, output_path: str) -> bool:
         """Export installed packages to JSON"""
         cmd = ["winget", "export", "-o", output_path]
@@ -265,14 +439,26 @@ class WinGetManager(BasePackageManager):
 class ChocolateyManager(BasePackageManager):
     """Chocolatey Package Manager"""
 
-    def __init__(self, verbose: bool = False):
-        super().__init__(verbose)
+    executable = "choco"
+
+    def __init__(self, verbose: bool = False, backend: Optional[CommandBackend] = None):
+        super().__init__(verbose, backend)
         self.manager_type = PackageManager.CHOCOLATEY
+        self._major: Optional[int] = None
 
     def is_available(self) -> bool:
         """Check if Chocolatey is installed"""
-        result = self._run_command(["choco", "--version"], check=False)
-        return result.returncode == 0
+        return self.probe()[0]
+
+    def _major_version(self) -> int:
+        """Major version of choco, probed once per instance"""
+        if self._major is None:
+            version = self.probe()[2]
+            try:
+                self._major = int(version.split('.')[0])
+            except ValueError:
+                self._major = 2
+        return self._major
 
     def install_chocolatey(self) -> bool:
         """Install Chocolatey"""
@@ -282,16 +468,13 @@ class ChocolateyManager(BasePackageManager):
         iex ((New-Object System.Net.WebClient).DownloadString('https://community.chocolatey.org/install.ps1'))
         """
 
-        result = subprocess.run(
-            ["powershell", "-Command", ps_script],
-            capture_output=True
-        )
+        result = self._run_command(["powershell", "-Command", ps_script], check=False)
 
         return result.returncode == 0
 
     def search(self, query: str, limit: int = 50) -> List[Package]:
         """Search for packages"""
-        cmd = ["choco", "search", query, "--limit-output"]
+        cmd = ["choco", "search", query, "-r"]
 
         result = self._run_command(cmd, check=False)
 
@@ -299,56 +482,42 @@ class ChocolateyManager(BasePackageManager):
             return []
 
         packages = []
-        lines = result.stdout.split('\n')
-
-        for line in lines:
-            if not line.strip():
-                continue
-
-            parts = line.split('|')
-            if len(parts) >= 2:
-                package = Package(
-                    name=parts[0],
-                    package_id=parts[0],
-                    version=parts[1],
-                    manager=self.manager_type,
-                    source="chocolatey"
-                )
-                packages.append(package)
-
-                if len(packages) >= limit:
-                    break
+        for row in iter_choco_records(result.stdout):
+            packages.append(Package(
+                name=row.package_id,
+                package_id=row.package_id,
+                version=row.version,
+                manager=self.manager_type,
+                source="chocolatey"
+            ))
+
+            if len(packages) >= limit:
+                break
 
         return packages
 
     def list_installed(self) -> List[Package]:
         """List installed packages"""
-        cmd = ["choco", "list", "--local-only", "--limit-output"]
+        cmd = ["choco", "list", "-r"]
+        if self._major_version() < 2:
+            # Before 2.0 list queried the remote feed unless told otherwise
+            cmd.append("--local-only")
 
         result = self._run_command(cmd, check=False)
 
         if result.returncode != 0:
             return []
 
-        packages = []
-        lines = result.stdout.split('\n')
-
-        for line in lines:
-            if not line.strip():
-                continue
-
-            parts = line.split('|')
-            if len(parts) >= 2:
-                package = Package(
-                    name=parts[0],
-                    package_id=parts[0],
-                    version=parts[1],
-                    manager=self.manager_type,
-                    status=PackageStatus.INSTALLED
-                )
-                packages.append(package)
-
-        return packages
+        return [
+            Package(
+                name=row.package_id,
+                package_id=row.package_id,
+                version=row.version,
+                manager=self.manager_type,
+                status=PackageStatus.INSTALLED
+            )
+            for row in iter_choco_records(result.stdout)
+        ]
 
     def install(self, package_id: str, version: Optional[str] = None) -> bool:
         """Install a package"""
@@ -377,19 +546,76 @@ class ChocolateyManager(BasePackageManager):
         result = self._run_command(cmd, check=False)
         return result.returncode == 0
 
+    def update_many(self, package_ids: List[str]) -> bool:
+        """Update several packages in one choco invocation"""
+        if not package_ids:
+            return True
+        result = self._run_command(["choco", "upgrade", *package_ids, "-y"], check=False)
+        return result.returncode == 0
+
+    def catalog(self) -> List[Package]:
+        """All packages in the configured sources"""
+        result = self._run_command(["choco", "search", "-r"], check=False)
+
+        if result.returncode != 0:
+            return []
+
+        return [
+            Package(
+                name=row.package_id,
+                package_id=row.package_id,
+                version=row.version,
+                manager=self.manager_type,
+                source="chocolatey"
+            )
+            for row in iter_choco_records(result.stdout)
+        ]
+
+    def download(self, package_id: str, version: Optional[str], dest_dir: str) -> List[Tuple[Package, str]]:
+        """Download the .nupkg from the community repository"""
+        import requests
+
+        if not version:
+            return []
+
+        path = os.path.join(dest_dir, f"{package_id}.{version}.nupkg")
+        try:
+            with requests.get(CHOCOLATEY_PACKAGE_URL.format(package_id=package_id, version=version),
+                              stream=True, timeout=60) as response:
+                response.raise_for_status()
+                with open(path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        f.write(chunk)
+        except (requests.RequestException, OSError):
+            return []
+
+        package = Package(name=package_id, package_id=package_id, version=version,
+                          manager=self.manager_type, source="chocolatey")
+        return [(package, path)]
+
+    def install_from_feed(self, package: Package, artifact: str, feed_dir: str) -> bool:
+        """Install from the local feed directory as a choco source"""
+        cmd = ["choco", "install", package.package_id, "--version", package.version,
+               "--source", feed_dir, "-y"]
+
+        result = self._run_command(cmd, check=False)
+        return result.returncode == 0
+
 
 class NPMManager(BasePackageManager):
     """Node Package Manager"""
 
-    def __init__(self, verbose: bool = False, global_install: bool = True):
-        super().__init__(verbose)
+    executable = "npm"
+
+    def __init__(self, verbose: bool = False, global_install: bool = True,
+                 backend: Optional[CommandBackend] = None):
+        super().__init__(verbose, backend)
         self.manager_type = PackageManager.NPM
         self.global_install = global_install
 
     def is_available(self) -> bool:
         """Check if NPM is installed"""
-        result = self._run_command(["npm", "--version"], check=False)
-        return result.returncode == 0
+        return self.probe()[0]
 
     def search(self, query: str, limit: int = 50) -> List[Package]:
         """Search for packages"""
@@ -472,19 +698,62 @@ class NPMManager(BasePackageManager):
         result = self._run_command(cmd, check=False)
         return result.returncode == 0
 
+    def update_many(self, package_ids: List[str]) -> bool:
+        """Update several packages in one npm invocation"""
+        if not package_ids:
+            return True
+        cmd = ["npm", "update", "-g" if self.global_install else "", *package_ids]
+        result = self._run_command(cmd, check=False)
+        return result.returncode == 0
+
+    def download(self, package_id: str, version: Optional[str], dest_dir: str) -> List[Tuple[Package, str]]:
+        """Download the package tarball with ``npm pack``"""
+        spec = f"{package_id}@{version}" if version else package_id
+        cmd = ["npm", "pack", spec, "--pack-destination", dest_dir, "--json"]
+
+        result = self._run_command(cmd, check=False)
+        if result.returncode != 0:
+            return []
+
+        try:
+            return [
+                (
+                    Package(name=item['name'], package_id=package_id, version=item['version'],
+                            manager=self.manager_type, source="npm"),
+                    os.path.join(dest_dir, item['filename'])
+                )
+                for item in json.loads(result.stdout)
+            ]
+        except (json.JSONDecodeError, KeyError, TypeError):
+            return []
+
+    def install_from_feed(self, package: Package, artifact: str, feed_dir: str) -> bool:
+        """Install the cached tarball"""
+        cmd = ["npm", "install", artifact]
+        if self.global_install:
+            cmd.append("-g")
+
+        result = self._run_command(cmd, check=False)
+        return result.returncode == 0
+
 
 class PipManager(BasePackageManager):
     """Python Package Manager"""
 
-    def __init__(self, verbose: bool = False, python_exe: str = "python"):
-        super().__init__(verbose)
+    def __init__(self, verbose: bool = False, python_exe: str = "python",
+                 backend: Optional[CommandBackend] = None):
+        super().__init__(verbose, backend)
         self.manager_type = PackageManager.PIP
         self.python_exe = python_exe
+        self.executable = python_exe
+
+    def version_command(self) -> List[str]:
+        """Command that prints pip's version"""
+        return [self.python_exe, "-m", "pip", "--version"]
 
     def is_available(self) -> bool:
         """Check if Pip is installed"""
-        result = self._run_command([self.python_exe, "-m", "pip", "--version"], check=False)
-        return result.returncode == 0
+        return self.probe()[0]
 
     def search(self, query: str, limit: int = 50) -> List[Package]:
         """Search for packages (using PyPI API)"""
@@ -556,63 +825,172 @@ class PipManager(BasePackageManager):
     def update(self, package_id: Optional[str] = None) -> bool:
         """Update package(s)"""
         if package_id:
-            cmd = [self.python_exe, "-m", "pip", "install", "--upgrade", package_id]
-        else:
-            # Update all packages
-            installed = self.list_installed()
-            for pkg in installed:
-                self.update(pkg.package_id)
+            return self.update_many([package_id])
+
+        # Update everything outdated in a single pip run
+        return self.update_many([pkg.package_id for pkg in self.list_outdated()])
+
+    def update_many(self, package_ids: List[str]) -> bool:
+        """Upgrade several packages with one pip install -U"""
+        if not package_ids:
             return True
+        cmd = [self.python_exe, "-m", "pip", "install", "--upgrade", *package_ids]
+        result = self._run_command(cmd, check=False)
+        return result.returncode == 0
+
+    @staticmethod
+    def _artifact_identity(filename: str) -> Optional[Tuple[str, str]]:
+        """(name, version) from a wheel or sdist file name"""
+        if filename.endswith(".whl"):
+            parts = filename[:-4].split('-')
+            return (parts[0], parts[1]) if len(parts) >= 5 else None
+        for suffix in (".tar.gz", ".zip"):
+            if filename.endswith(suffix):
+                name, _, version = filename[:-len(suffix)].rpartition('-')
+                return (name, version) if name else None
+        return None
+
+    def download(self, package_id: str, version: Optional[str], dest_dir: str) -> List[Tuple[Package, str]]:
+        """Download the package and its dependencies with ``pip download``"""
+        spec = f"{package_id}=={version}" if version else package_id
+        cmd = [self.python_exe, "-m", "pip", "download", spec, "-d", dest_dir, "--prefer-binary"]
+
+        result = self._run_command(cmd, check=False)
+        if result.returncode != 0:
+            return []
+
+        requested = package_id.lower().replace('-', '_').replace('.', '_')
+        artifacts = []
+        for filename in sorted(os.listdir(dest_dir)):
+            identity = self._artifact_identity(filename)
+            if not identity:
+                continue
+            name, artifact_version = identity
+            # The requested package keeps the caller's id so it can be found again
+            is_requested = name.lower().replace('-', '_').replace('.', '_') == requested
+            artifacts.append((
+                Package(name=name, package_id=package_id if is_requested else name,
+                        version=artifact_version, manager=self.manager_type, source="pypi"),
+                os.path.join(dest_dir, filename)
+            ))
+        return artifacts
+
+    def install_from_feed(self, package: Package, artifact: str, feed_dir: str) -> bool:
+        """Install with the local feed as the only index"""
+        cmd = [self.python_exe, "-m", "pip", "install", "--no-index", "--find-links", feed_dir,
+               f"{package.package_id}=={package.version}"]
 
         result = self._run_command(cmd, check=False)
         return result.returncode == 0
 
+    def list_outdated(self) -> List[Package]:
+        """List installed packages with a newer release"""
+        cmd = [self.python_exe, "-m", "pip", "list", "--outdated", "--format=json"]
 
-class PackageCache:
-    """Manage package cache for offline installation"""
+        result = self._run_command(cmd, check=False)
+
+        if result.returncode != 0:
+            return []
+
+        try:
+            return [
+                Package(
+                    name=item['name'],
+                    package_id=item['name'],
+                    version=item['version'],
+                    manager=self.manager_type,
+                    status=PackageStatus.UPDATE_AVAILABLE
+                )
+                for item in json.loads(result.stdout)
+            ]
+        except (json.JSONDecodeError, KeyError):
+            return []
 
-    def __init__(self, cache_dir: Optional[str] = None):
+
+class PackageCache:
+    """Manage package cache for offline installation
+
+    Installer payloads are kept once in a content-addressed blob store and
+    hardlinked, read-only, to ``<manager>/<package_id>/<version>/<file>``
+    and to the manager's flat feed directory. Metadata lives in an
+    SQLite database (``cache_metadata.db``); a ``cache_metadata.json`` left
+    by older versions is imported on first use. With ``max_size_bytes`` or
+    ``max_age_days`` set, least recently used payloads are evicted after
+    every insert.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_size_bytes: Optional[int] = None,
+        max_age_days: Optional[float] = None
+    ):
         self.cache_dir = cache_dir or os.path.join(os.path.expanduser("~"), ".package_cache")
         os.makedirs(self.cache_dir, exist_ok=True)
-        self.metadata_file = os.path.join(self.cache_dir, "cache_metadata.json")
-        self.metadata = self._load_metadata()
+        self.metadata_file = os.path.join(self.cache_dir, "cache_metadata.db")
+        self.store = CacheMetadataStore(self.metadata_file)
+        self.store.migrate_json(os.path.join(self.cache_dir, "cache_metadata.json"))
+        self.blobs = BlobStore(os.path.join(self.cache_dir, "blobs"))
+        self.max_size_bytes = max_size_bytes
+        self.max_age_days = max_age_days
 
-    def _load_metadata(self) -> Dict:
-        """Load cache metadata"""
-        if os.path.exists(self.metadata_file):
-            with open(self.metadata_file, 'r') as f:
-                return json.load(f)
-        return {}
+    def close(self):
+        """Close the metadata database"""
+        self.store.close()
 
-    def _save_metadata(self):
-        """Save cache metadata"""
-        with open(self.metadata_file, 'w') as f:
-            json.dump(self.metadata, f, indent=2)
+    def feed_dir(self, manager: PackageManager) -> str:
+        """Flat directory holding every cached artifact of a manager
+
+        Used as a pip ``--find-links`` directory and a Chocolatey source.
+        """
+        return os.path.join(self.cache_dir, "feeds", manager.value)
+
+    @staticmethod
+    def _path_version(version: str) -> str:
+        """Version made safe for use in a file name"""
+        return re.sub(r'[^A-Za-z0-9._+-]', '_', version) or "unknown"
+
+    def _feed_path(self, manager: str, version: str, cache_path: str) -> str:
+        """Feed location of an artifact, versioned so releases cannot collide
+
+        Artifacts whose name already carries the version (wheels, nupkgs)
+        keep it, as pip and Chocolatey read the version from the name.
+        """
+        filename = os.path.basename(cache_path)
+        version = self._path_version(version)
+        if version not in filename:
+            stem, ext = os.path.splitext(filename)
+            filename = f"{stem}-{version}{ext}"
+        return os.path.join(self.cache_dir, "feeds", manager, filename)
 
     def _calculate_checksum(self, file_path: str) -> str:
         """Calculate SHA256 checksum"""
-        sha256_hash = hashlib.sha256()
-        with open(file_path, "rb") as f:
-            for byte_block in iter(lambda: f.read(4096), b""):
-                sha256_hash.update(byte_block)
-        return sha256_hash.hexdigest()
+        return cached_file_hash(file_path, "sha256")
+
+    @staticmethod
+    def _to_cached(data: Dict) -> CachedPackage:
+        return CachedPackage(
+            package=Package.from_dict(data['package']),
+            cache_path=data['cache_path'],
+            cache_date=data['cache_date'],
+            checksum=data['checksum']
+        )
 
     def cache_package(self, package: Package, source_path: str) -> CachedPackage:
         """Add package to cache"""
         from datetime import datetime
 
-        # Create package cache directory
-        pkg_cache_dir = os.path.join(self.cache_dir, package.manager.value, package.package_id)
-        os.makedirs(pkg_cache_dir, exist_ok=True)
+        # Store the payload once, keyed by its SHA-256
+        checksum, size = self.blobs.ingest(source_path)
+        previous = self.store.get(package.manager.value, package.package_id, package.version)
 
-        # Copy package to cache
+        pkg_cache_dir = os.path.join(
+            self.cache_dir, package.manager.value, package.package_id, self._path_version(package.version)
+        )
         cache_path = os.path.join(pkg_cache_dir, os.path.basename(source_path))
-        shutil.copy2(source_path, cache_path)
+        self.blobs.link(checksum, cache_path)
+        self.blobs.link(checksum, self._feed_path(package.manager.value, package.version, cache_path))
 
-        # Calculate checksum
-        checksum = self._calculate_checksum(cache_path)
-
-        # Create cached package entry
         cached = CachedPackage(
             package=package,
             cache_path=cache_path,
@@ -620,78 +998,321 @@ class PackageCache:
             checksum=checksum
         )
 
-        # Update metadata
-        cache_key = f"{package.manager.value}:{package.package_id}:{package.version}"
-        self.metadata[cache_key] = {
+        self.store.put({
+            'manager': package.manager.value,
+            'package_id': package.package_id,
+            'version': package.version,
             'package': package.to_dict(),
             'cache_path': cache_path,
             'cache_date': cached.cache_date,
-            'checksum': checksum
-        }
-        self._save_metadata()
+            'checksum': checksum,
+            'size': size,
+            'last_used': time.time()
+        })
+        if previous:
+            # A replaced entry's old payload and links are released
+            self._release([previous])
+
+        if self.max_size_bytes is not None or self.max_age_days is not None:
+            self.prune(keep={checksum})
 
         return cached
 
     def get_cached_package(self, manager: PackageManager, package_id: str, version: str) -> Optional[CachedPackage]:
         """Get package from cache"""
-        cache_key = f"{manager.value}:{package_id}:{version}"
+        data = self.store.get(manager.value, package_id, version)
 
-        if cache_key in self.metadata:
-            data = self.metadata[cache_key]
+        # Verify file exists
+        if data and os.path.exists(data['cache_path']):
+            self.store.touch((manager.value, package_id, version))
+            return self._to_cached(data)
 
-            # Verify file exists
-            if os.path.exists(data['cache_path']):
-                pkg_data = data['package']
-                package = Package(**pkg_data)
+        return None
 
-                return CachedPackage(
-                    package=package,
-                    cache_path=data['cache_path'],
-                    cache_date=data['cache_date'],
-                    checksum=data['checksum']
-                )
+    def list_cached(self, manager: Optional[PackageManager] = None) -> List[CachedPackage]:
+        """List all cached packages"""
+        return [
+            self._to_cached(data)
+            for data in self.store.find(manager=manager.value if manager else None)
+            if os.path.exists(data['cache_path'])
+        ]
+
+    def _drop_entries(self, keys: Iterable[Tuple[str, str, str]]) -> int:
+        """Remove entries and any payloads no longer referenced; returns bytes freed"""
+        removed = self.store.delete(keys)
+        return self._release(removed)
+
+    def _release(self, removed: List[Dict]) -> int:
+        """Delete the links and payloads of removed entries that nothing else uses"""
+        # Never delete a path a surviving entry still points at
+        live = set()
+        for manager in {data['manager'] for data in removed}:
+            for data in self.store.find(manager=manager):
+                live.add(data['cache_path'])
+                live.add(self._feed_path(manager, data['version'], data['cache_path']))
+
+        for data in removed:
+            for path in (data['cache_path'], self._feed_path(data['manager'], data['version'], data['cache_path'])):
+                if path not in live and os.path.lexists(path):
+                    self.blobs.unlink(path)
+
+        freed = 0
+        for checksum in {data['checksum'] for data in removed}:
+            if self.store.is_referenced(checksum):
+                self.blobs.seal(checksum)
+            else:
+                freed += self.blobs.remove(checksum)
+        return freed
+
+    def prune(
+        self,
+        max_size_bytes: Optional[int] = None,
+        max_age_days: Optional[float] = None,
+        keep: Optional[Set[str]] = None
+    ) -> int:
+        """Evict payloads by age and then least recent use; returns bytes freed
+
+        Limits default to the ones the cache was created with. Payloads whose
+        checksum is in keep are never evicted.
+        """
+        max_size_bytes = self.max_size_bytes if max_size_bytes is None else max_size_bytes
+        max_age_days = self.max_age_days if max_age_days is None else max_age_days
+        keep = keep or set()
+
+        # Payloads are shared, so they are aged by their most recent use
+        payloads = self.store.payloads_by_last_use()
+        total = sum(size for _, _, size, _ in payloads)
+        cutoff = time.time() - max_age_days * 86400 if max_age_days is not None else None
+
+        evict: List[Tuple[str, str, str]] = []
+        for checksum, last_used, size, keys in payloads:
+            if checksum in keep:
+                continue
+            too_old = cutoff is not None and last_used < cutoff
+            too_big = max_size_bytes is not None and total > max_size_bytes
+            if not (too_old or too_big):
+                continue
+            evict.extend(keys)
+            total -= size
+
+        return self._drop_entries(evict) if evict else 0
+
+    def clear_cache(self, manager: Optional[PackageManager] = None) -> int:
+        """Clear package cache, deleting payloads; returns bytes freed"""
+        entries = self.store.find(manager=manager.value if manager else None)
+        return self._drop_entries(
+            (data['manager'], data['package_id'], data['version']) for data in entries
+        )
+
+
+@dataclass
+class InstallOutcome:
+    """Result of one package in a batch install"""
+    package: Package
+    status: PackageStatus = PackageStatus.NOT_INSTALLED
+    skipped: bool = False
+    error: str = ""
+    started_at: float = 0.0
+    duration: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """Whether the package was installed"""
+        return self.status == PackageStatus.INSTALLED
+
+
+@dataclass
+class BatchInstallReport:
+    """Per-package results of a batch install"""
+    outcomes: Dict[Tuple[PackageManager, str], InstallOutcome] = field(default_factory=dict)
+    duration: float = 0.0
+
+    @property
+    def succeeded(self) -> List[InstallOutcome]:
+        return [o for o in self.outcomes.values() if o.success]
+
+    @property
+    def failed(self) -> List[InstallOutcome]:
+        return [o for o in self.outcomes.values() if o.status == PackageStatus.FAILED]
 
+    @property
+    def skipped(self) -> List[InstallOutcome]:
+        return [o for o in self.outcomes.values() if o.skipped]
+
+    @property
+    def success(self) -> bool:
+        """Whether every package was installed"""
+        return all(o.success for o in self.outcomes.values())
+
+
+@dataclass
+class InventoryDiff:
+    """Changes between two inventory snapshots of one manager"""
+    added: List[Package] = field(default_factory=list)
+    removed: List[Package] = field(default_factory=list)
+    changed: List[Tuple[Package, Package]] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        """Whether anything was added, removed or changed"""
+        return bool(self.added or self.removed or self.changed)
+
+
+class InventoryStore:
+    """Persisted installed-package snapshots, one file per manager"""
+
+    def __init__(self, inventory_dir: str):
+        self.inventory_dir = inventory_dir
+        os.makedirs(self.inventory_dir, exist_ok=True)
+
+    def _path(self, manager: PackageManager) -> str:
+        return os.path.join(self.inventory_dir, f"{manager.value}.json")
+
+    def load(self, manager: PackageManager) -> Optional[Tuple[float, List[Package]]]:
+        """Return (captured_at, packages) or None if no snapshot exists"""
+        try:
+            with open(self._path(manager), 'r') as f:
+                data = json.load(f)
+            return data['captured_at'], [Package.from_dict(p) for p in data['packages']]
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def save(self, manager: PackageManager, packages: List[Package]):
+        """Atomically replace the snapshot for manager"""
+        path = self._path(manager)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({'captured_at': time.time(), 'packages': [p.to_dict() for p in packages]}, f)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def diff(old: List[Package], new: List[Package]) -> InventoryDiff:
+        """Compare two snapshots by package id and version"""
+        before = {p.package_id: p for p in old}
+        after = {p.package_id: p for p in new}
+        return InventoryDiff(
+            added=[after[k] for k in after.keys() - before.keys()],
+            removed=[before[k] for k in before.keys() - after.keys()],
+            changed=[
+                (before[k], after[k]) for k in before.keys() & after.keys()
+                if before[k].version != after[k].version
+            ]
+        )
+
+    def record(self, manager: PackageManager, packages: List[Package]) -> InventoryDiff:
+        """Save a new snapshot and return its diff against the previous one"""
+        previous = self.load(manager)
+        diff = self.diff(previous[1] if previous else [], packages)
+        self.save(manager, packages)
+        return diff
+
+
+@dataclass
+class ManagerCapability:
+    """Cached result of probing a package manager"""
+    manager: PackageManager
+    available: bool
+    executable: Optional[str]
+    version: str
+    probed_at: float
+
+
+class CapabilityRegistry:
+    """Probe package managers once and remember the result for a TTL
+
+    The cache is shared by every registry in the process, keyed by manager
+    type and version command, so menus that build a fresh
+    ``UnifiedPackageManager`` do not re-launch ``winget --version`` and
+    friends each time they open.
+    """
+
+    _cache: Dict[Tuple, ManagerCapability] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, managers: Dict[PackageManager, BasePackageManager], ttl: float = DEFAULT_CAPABILITY_TTL):
+        self.managers = managers
+        self.ttl = ttl
+
+    @staticmethod
+    def _key(manager_type: PackageManager, mgr: BasePackageManager) -> Tuple:
+        if mgr.executable:
+            return (manager_type, tuple(mgr.version_command()))
+        # No executable to share a probe on; key on the instance itself
+        return (manager_type, mgr)
+
+    def _probe(self, manager_type: PackageManager) -> ManagerCapability:
+        mgr = self.managers[manager_type]
+        try:
+            available, executable, version = mgr.probe()
+        except Exception:
+            available, executable, version = False, None, ""
+        capability = ManagerCapability(manager_type, available, executable, version, time.time())
+        with self._lock:
+            self._cache[self._key(manager_type, mgr)] = capability
+        return capability
+
+    def _cached(self, manager_type: PackageManager) -> Optional[ManagerCapability]:
+        with self._lock:
+            capability = self._cache.get(self._key(manager_type, self.managers[manager_type]))
+        if capability and time.time() - capability.probed_at < self.ttl:
+            return capability
         return None
 
-    def list_cached(self) -> List[CachedPackage]:
-        """List all cached packages"""
-        cached = []
-
-        for key, data in self.metadata.items():
-            if os.path.exists(data['cache_path']):
-                pkg_data = data['package']
-                package = Package(**pkg_data)
-
-                cached_pkg = CachedPackage(
-                    package=package,
-                    cache_path=data['cache_path'],
-                    cache_date=data['cache_date'],
-                    checksum=data['checksum']
-                )
-                cached.append(cached_pkg)
+    def get(self, manager_type: PackageManager, refresh: bool = False) -> ManagerCapability:
+        """Capability of one manager, probing it if the cache is stale"""
+        if not refresh:
+            capability = self._cached(manager_type)
+            if capability:
+                return capability
+        return self._probe(manager_type)
 
-        return cached
+    def probe_all(self, refresh: bool = False) -> Dict[PackageManager, ManagerCapability]:
+        """Capabilities of every manager; stale entries are probed in parallel"""
+        results = {}
+        stale = []
+        for manager_type in self.managers:
+            capability = None if refresh else self._cached(manager_type)
+            if capability:
+                results[manager_type] = capability
+            else:
+                stale.append(manager_type)
 
-    def clear_cache(self, manager: Optional[PackageManager] = None):
-        """Clear package cache"""
-        if manager:
-            # Clear specific manager cache
-            keys_to_remove = [k for k in self.metadata.keys() if k.startswith(manager.value + ":")]
-            for key in keys_to_remove:
-                del self.metadata[key]
-        else:
-            # Clear all cache
-            self.metadata = {}
+        if stale:
+            with ThreadPoolExecutor(max_workers=len(stale)) as pool:
+                for capability in pool.map(self._probe, stale):
+                    results[capability.manager] = capability
+
+        return {m: results[m] for m in self.managers}
 
-        self._save_metadata()
+    def is_available(self, manager_type: PackageManager) -> bool:
+        """Whether a manager is installed, using the cached probe"""
+        return manager_type in self.managers and self.get(manager_type).available
+
+    def invalidate(self, manager_type: Optional[PackageManager] = None):
+        """Forget cached probes for one or all managers"""
+        with self._lock:
+            for m in ([manager_type] if manager_type else list(self.managers)):
+                if m in self.managers:
+                    self._cache.pop(self._key(m, self.managers[m]), None)
 
 
 class UnifiedPackageManager:
     """Unified interface for all package managers"""
 
-    def __init__(self, cache_dir: Optional[str] = None, verbose: bool = False):
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        verbose: bool = False,
+        capability_ttl: float = DEFAULT_CAPABILITY_TTL
+    ):
         self.verbose = verbose
         self.cache = PackageCache(cache_dir)
+        self.capability_ttl = capability_ttl
+        self._capabilities: Optional[CapabilityRegistry] = None
+        self.inventory = InventoryStore(os.path.join(self.cache.cache_dir, "inventory"))
+        self._refresh_lock = threading.Lock()
+        self._search_index = None
+        self._index_lock = threading.Lock()
 
         # Initialize package managers
         self.managers: Dict[PackageManager, BasePackageManager] = {
@@ -701,65 +1322,415 @@ class UnifiedPackageManager:
             PackageManager.PIP: PipManager(verbose)
         }
 
+    @property
+    def capabilities(self) -> CapabilityRegistry:
+        """Availability registry for the current set of managers"""
+        if self._capabilities is None or self._capabilities.managers is not self.managers:
+            self._capabilities = CapabilityRegistry(self.managers, self.capability_ttl)
+        return self._capabilities
+
     def get_available_managers(self) -> List[PackageManager]:
         """Get list of available package managers"""
-        available = []
-        for manager_type, manager in self.managers.items():
-            if manager.is_available():
-                available.append(manager_type)
-        return available
+        return [m for m, cap in self.capabilities.probe_all().items() if cap.available]
+
+    def _fan_out(
+        self,
+        manager_types: Iterable[PackageManager],
+        call: Callable[[BasePackageManager], List[Package]],
+        timeout: Optional[float]
+    ) -> Iterator[Tuple[PackageManager, List[Package]]]:
+        """Run call on every available manager concurrently
+
+        Results are yielded as each manager finishes. Managers still running
+        after ``timeout`` seconds are abandoned so they cannot hold up the
+        others; their commands are cancelled, which kills the processes.
+        """
+        selected = [m for m in manager_types if m in self.managers]
+        if not selected:
+            return
 
-    def search(self, query: str, manager: Optional[PackageManager] = None) -> Dict[PackageManager, List[Package]]:
-        """Search across all or specific package manager"""
-        results = {}
+        scopes = {m: CancelScope() for m in selected}
 
-        managers_to_search = [manager] if manager else self.managers.keys()
+        def task(mgr_type: PackageManager) -> List[Package]:
+            with self.managers[mgr_type].cancel_scope(scopes[mgr_type]):
+                if not self.capabilities.is_available(mgr_type):
+                    return []
+                return call(self.managers[mgr_type])
 
-        for mgr_type in managers_to_search:
-            if mgr_type in self.managers:
-                mgr = self.managers[mgr_type]
-                if mgr.is_available():
-                    packages = mgr.search(query)
-                    if packages:
-                        results[mgr_type] = packages
+        pool = ThreadPoolExecutor(max_workers=len(selected))
+        futures = {pool.submit(task, m): m for m in selected}
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                mgr_type = futures[future]
+                try:
+                    packages = future.result()
+                except Exception as e:
+                    if self.verbose:
+                        print(f"{mgr_type.value} failed: {e}")
+                    continue
+                if packages:
+                    yield mgr_type, packages
+        except FuturesTimeoutError:
+            if self.verbose:
+                slow = [futures[f].value for f in futures if not f.done()]
+                print(f"Timed out waiting for: {', '.join(slow)}")
+        finally:
+            for future, mgr_type in futures.items():
+                if not future.done():
+                    scopes[mgr_type].cancel()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def iter_search(
+        self,
+        query: str,
+        manager: Optional[PackageManager] = None,
+        timeout: Optional[float] = DEFAULT_MANAGER_TIMEOUT
+    ) -> Iterator[Tuple[PackageManager, List[Package]]]:
+        """Search managers concurrently, yielding results as each finishes"""
+        managers_to_search = [manager] if manager else list(self.managers.keys())
+        for mgr_type, packages in self._fan_out(managers_to_search, lambda mgr: mgr.search(query), timeout):
+            # Live results keep the local search index current
+            self.search_index.merge(packages)
+            yield mgr_type, packages
+
+    def search(
+        self,
+        query: str,
+        manager: Optional[PackageManager] = None,
+        timeout: Optional[float] = DEFAULT_MANAGER_TIMEOUT
+    ) -> Dict[PackageManager, List[Package]]:
+        """Search across all or specific package manager"""
+        return dict(self.iter_search(query, manager, timeout))
+
+    @property
+    def search_index(self):
+        """Local search index, loaded from its snapshot on first use"""
+        from better11.package_index import PackageSearchIndex
+
+        with self._index_lock:
+            if self._search_index is None:
+                self._search_index = PackageSearchIndex(os.path.join(self.cache.cache_dir, "search_index.json"))
+                self._search_index.load()
+            return self._search_index
+
+    def quick_search(
+        self,
+        query: str,
+        limit: int = 20,
+        manager: Optional[PackageManager] = None
+    ) -> List[Package]:
+        """Ranked search of the local index without starting any manager"""
+        return self.search_index.search(query, limit, manager)
+
+    def refresh_search_index(
+        self,
+        dumps: Optional[Dict[PackageManager, str]] = None,
+        timeout: Optional[float] = DEFAULT_MANAGER_TIMEOUT
+    ) -> Dict[PackageManager, Dict[str, int]]:
+        """Rebuild catalogs from the managers and from JSON dumps, then save
+
+        Only packages whose metadata changed are re-indexed. A manager with
+        a dump is loaded from the dump instead of being queried.
+        """
+        index = self.search_index
+        dumps = dumps or {}
+        stats = {}
+
+        for mgr_type, path in dumps.items():
+            stats[mgr_type] = index.load_dump(mgr_type, path)
+
+        queried = [m for m in self.managers if m not in dumps]
+        for mgr_type, packages in self._fan_out(queried, lambda mgr: mgr.catalog(), timeout):
+            if packages:
+                stats[mgr_type] = index.update_catalog(mgr_type, packages)
+
+        index.save()
+        return stats
+
+    def refresh_search_index_async(
+        self,
+        dumps: Optional[Dict[PackageManager, str]] = None
+    ) -> threading.Thread:
+        """Refresh the search index on a daemon thread"""
+        thread = threading.Thread(
+            target=self.refresh_search_index, args=(dumps,), name="search-index-refresh", daemon=True
+        )
+        thread.start()
+        return thread
+
+    def iter_installed(
+        self,
+        timeout: Optional[float] = DEFAULT_MANAGER_TIMEOUT
+    ) -> Iterator[Tuple[PackageManager, List[Package]]]:
+        """List installed packages concurrently, yielding as each manager finishes"""
+        return self._fan_out(list(self.managers.keys()), lambda mgr: mgr.list_installed(), timeout)
+
+    def list_all_installed(
+        self,
+        timeout: Optional[float] = DEFAULT_MANAGER_TIMEOUT
+    ) -> Dict[PackageManager, List[Package]]:
+        """List installed packages from all managers"""
+        return dict(self.iter_installed(timeout))
+
+    def refresh_inventory(
+        self,
+        timeout: Optional[float] = DEFAULT_MANAGER_TIMEOUT
+    ) -> Dict[PackageManager, InventoryDiff]:
+        """Re-list every manager, persist snapshots and return what changed"""
+        with self._refresh_lock:
+            return {
+                mgr_type: self.inventory.record(mgr_type, packages)
+                for mgr_type, packages in self.iter_installed(timeout)
+            }
+
+    def refresh_inventory_async(
+        self,
+        callback: Optional[Callable[[Dict[PackageManager, InventoryDiff]], None]] = None
+    ) -> threading.Thread:
+        """Refresh snapshots on a daemon thread, passing the diffs to callback"""
+        def run():
+            diffs = self.refresh_inventory()
+            if callback:
+                callback(diffs)
+
+        thread = threading.Thread(target=run, name="inventory-refresh", daemon=True)
+        thread.start()
+        return thread
+
+    def get_installed(
+        self,
+        manager: PackageManager,
+        max_age: float = DEFAULT_INVENTORY_MAX_AGE
+    ) -> List[Package]:
+        """Installed packages from the snapshot
+
+        A missing snapshot is listed synchronously. A stale one is returned
+        immediately while a background refresh brings it up to date.
+        """
+        snapshot = self.inventory.load(manager)
+        if snapshot is None:
+            if manager not in self.managers or not self.capabilities.is_available(manager):
+                return []
+            packages = self.managers[manager].list_installed()
+            self.inventory.save(manager, packages)
+            return packages
 
-        return results
+        captured_at, packages = snapshot
+        if time.time() - captured_at > max_age and not self._refresh_lock.locked():
+            self.refresh_inventory_async()
+        return packages
 
-    def list_all_installed(self) -> Dict[PackageManager, List[Package]]:
-        """List installed packages from all managers"""
-        results = {}
+    def update_packages(self, manager: PackageManager, package_ids: List[str]) -> bool:
+        """Update several packages with one batched command where supported"""
+        if manager in self.managers and self.capabilities.is_available(manager):
+            return self.managers[manager].update_many(package_ids)
+        return False
 
-        for mgr_type, mgr in self.managers.items():
-            if mgr.is_available():
-                packages = mgr.list_installed()
-                if packages:
-                    results[mgr_type] = packages
+    def _prefetch_one(self, manager: PackageManager, package_id: str, version: Optional[str]) -> List[CachedPackage]:
+        """Download one package into the cache"""
+        mgr = self.managers[manager]
+        with tempfile.TemporaryDirectory(prefix="b11-prefetch-") as temp_dir:
+            return [
+                self.cache.cache_package(package, path)
+                for package, path in mgr.download(package_id, version, temp_dir)
+            ]
+
+    def prefetch(
+        self,
+        packages: Iterable[Tuple[PackageManager, str, Optional[str]]],
+        max_workers: int = DEFAULT_PREFETCH_WORKERS
+    ) -> Dict[Tuple[PackageManager, str, Optional[str]], Optional[CachedPackage]]:
+        """Download (manager, package_id, version) entries into the cache in parallel
+
+        Packages already cached are not downloaded again. Each entry maps to
+        its cached package, or None if it could not be fetched.
+        """
+        results: Dict[Tuple[PackageManager, str, Optional[str]], Optional[CachedPackage]] = {}
+        pending = []
+        for request in packages:
+            manager, package_id, version = request
+            cached = self.cache.get_cached_package(manager, package_id, version) if version else None
+            if cached or manager not in self.managers or not self.capabilities.is_available(manager):
+                results[request] = cached
+            else:
+                pending.append(request)
+
+        if not pending:
+            return results
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as pool:
+            futures = {pool.submit(self._prefetch_one, *request): request for request in pending}
+            for future in as_completed(futures):
+                manager, package_id, version = request = futures[future]
+                try:
+                    fetched = future.result()
+                except Exception as e:
+                    if self.verbose:
+                        print(f"Prefetch of {package_id} failed: {e}")
+                    fetched = []
+                results[request] = next(
+                    (c for c in fetched if c.package.package_id == package_id), None
+                )
 
         return results
 
-    def install(self, manager: PackageManager, package_id: str, version: Optional[str] = None, use_cache: bool = True) -> bool:
-        """Install package"""
-        # Check cache first
+    def install(
+        self,
+        manager: PackageManager,
+        package_id: str,
+        version: Optional[str] = None,
+        use_cache: bool = True,
+        prefetch: bool = False
+    ) -> bool:
+        """Install package
+
+        With use_cache, a cached artifact for the requested version is
+        installed from the local feed; prefetch downloads it into the cache
+        first on a miss. Anything that cannot be installed offline falls back
+        to a normal install over the network. For WinGet that includes every
+        package whose installer is an EXE, since only MSI and MSIX
+        installers are cached.
+        """
+        if manager not in self.managers or not self.capabilities.is_available(manager):
+            return False
+        mgr = self.managers[manager]
+
         if use_cache and version:
             cached = self.cache.get_cached_package(manager, package_id, version)
-            if cached:
-                # Install from cache
-                # Implementation depends on package type
-                pass
-
-        # Install normally
-        if manager in self.managers:
-            mgr = self.managers[manager]
-            if mgr.is_available():
-                return mgr.install(package_id, version)
-
-        return False
+            if cached is None and prefetch:
+                cached = self.prefetch([(manager, package_id, version)])[(manager, package_id, version)]
+            if cached and mgr.install_from_feed(cached.package, cached.cache_path, self.cache.feed_dir(manager)):
+                return True
+            if self.verbose:
+                reason = "not cached" if cached is None else "offline install failed"
+                print(f"Installing {package_id} {version} from the network ({reason})")
+
+        return mgr.install(package_id, version)
+
+    @staticmethod
+    def _build_install_graph(
+        packages: List[Package]
+    ) -> Tuple[Dict[Tuple[PackageManager, str], Package], Dict[Tuple[PackageManager, str], Set[Tuple[PackageManager, str]]]]:
+        """Map each package to the batch members it depends on
+
+        A dependency resolves to a package of the same manager first, then to
+        any manager. Dependencies outside the batch are left to the manager.
+        """
+        nodes = {(p.manager, p.package_id): p for p in packages}
+        by_id: Dict[str, List[Tuple[PackageManager, str]]] = {}
+        for key in nodes:
+            by_id.setdefault(key[1].lower(), []).append(key)
+
+        depends_on = {}
+        for key, package in nodes.items():
+            edges = set()
+            for dependency in package.dependencies:
+                candidates = by_id.get(dependency.lower(), [])
+                same = [c for c in candidates if c[0] == package.manager]
+                if same or candidates:
+                    edges.add((same or candidates)[0])
+            edges.discard(key)
+            depends_on[key] = edges
+
+        # Kahn's algorithm; anything left unvisited is on a cycle
+        indegree = {key: len(edges) for key, edges in depends_on.items()}
+        dependents: Dict[Tuple[PackageManager, str], List[Tuple[PackageManager, str]]] = {k: [] for k in nodes}
+        for key, edges in depends_on.items():
+            for dependency in edges:
+                dependents[dependency].append(key)
+        queue = [key for key, degree in indegree.items() if degree == 0]
+        visited = 0
+        while queue:
+            key = queue.pop()
+            visited += 1
+            for dependent in dependents[key]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    queue.append(dependent)
+        if visited != len(nodes):
+            cycle = sorted(key[1] for key, degree in indegree.items() if degree)
+            raise ValueError(f"Dependency cycle between: {', '.join(cycle)}")
+
+        return nodes, depends_on
+
+    def install_batch(
+        self,
+        packages: List[Package],
+        use_cache: bool = True,
+        concurrency: Optional[Dict[PackageManager, int]] = None,
+        max_workers: int = 8
+    ) -> BatchInstallReport:
+        """Install packages in dependency order, running independent ones concurrently
+
+        Each manager runs at most ``concurrency[manager]`` installs at a time
+        (default 1); WinGet and Chocolatey are always serialized. A package
+        whose dependency failed is skipped. Raises ValueError on a
+        dependency cycle before anything is installed.
+        """
+        nodes, depends_on = self._build_install_graph(packages)
+        concurrency = concurrency or {}
+
+        def limit(manager: PackageManager) -> int:
+            if manager in GLOBALLY_LOCKED_MANAGERS:
+                return 1
+            return max(1, concurrency.get(manager, DEFAULT_INSTALL_CONCURRENCY))
+
+        report = BatchInstallReport(outcomes={key: InstallOutcome(package=p) for key, p in nodes.items()})
+        remaining = {key: set(edges) for key, edges in depends_on.items()}
+        running: Dict[PackageManager, int] = {}
+        batch_start = time.perf_counter()
+
+        def run(key: Tuple[PackageManager, str]):
+            package = nodes[key]
+            outcome = report.outcomes[key]
+            outcome.started_at = time.perf_counter() - batch_start
+            try:
+                version = package.version if package.version not in ("", "latest", "Unknown") else None
+                installed = self.install(package.manager, package.package_id, version, use_cache=use_cache)
+                outcome.status = PackageStatus.INSTALLED if installed else PackageStatus.FAILED
+            except Exception as e:
+                outcome.status = PackageStatus.FAILED
+                outcome.error = str(e)
+            outcome.duration = time.perf_counter() - batch_start - outcome.started_at
+
+        def skip_dependents(failed: Tuple[PackageManager, str]):
+            stack = [failed]
+            while stack:
+                current = stack.pop()
+                for key, edges in list(remaining.items()):
+                    if current in edges:
+                        del remaining[key]
+                        report.outcomes[key].skipped = True
+                        report.outcomes[key].error = f"Dependency {current[1]} was not installed"
+                        stack.append(key)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            futures = {}
+            while remaining or futures:
+                for key in [k for k, edges in remaining.items() if not edges]:
+                    if running.get(key[0], 0) < limit(key[0]):
+                        del remaining[key]
+                        running[key[0]] = running.get(key[0], 0) + 1
+                        futures[pool.submit(run, key)] = key
+
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key = futures.pop(future)
+                    running[key[0]] -= 1
+                    if report.outcomes[key].success:
+                        for edges in remaining.values():
+                            edges.discard(key)
+                    else:
+                        skip_dependents(key)
+
+        report.duration = time.perf_counter() - batch_start
+        return report
 
     def uninstall(self, manager: PackageManager, package_id: str) -> bool:
         """Uninstall package"""
         if manager in self.managers:
             mgr = self.managers[manager]
-            if mgr.is_available():
+            if self.capabilities.is_available(manager):
                 return mgr.uninstall(package_id)
 
         return False
@@ -769,7 +1740,7 @@ class UnifiedPackageManager:
         results = {}
 
         for mgr_type, mgr in self.managers.items():
-            if mgr.is_available():
+            if self.capabilities.is_available(mgr_type):
                 results[mgr_type] = mgr.update()
 
         return results
@@ -0,0 +1,196 @@
+"""
+Package Manager Output Parsers
+
+Structured parsing of package manager CLI output:
+- WinGet tables are split on column offsets read once from the header
+  rather than on whitespace, so names containing spaces stay intact
+- Column offsets are measured in display cells, matching how WinGet pads
+  East Asian wide characters
+- Progress spinner output written with carriage returns is discarded
+- Chocolatey is read from its machine-readable ``-r`` (``id|version``)
+  output
+
+All parsers make a single pass over the output.
+"""
+
+import unicodedata
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+
+@dataclass
+class WinGetRow:
+    """One row of a WinGet table"""
+    name: str
+    package_id: str
+    version: str
+    available: Optional[str] = None
+    source: Optional[str] = None
+    match: Optional[str] = None
+
+
+@dataclass
+class ChocoRow:
+    """One record of Chocolatey limit-output"""
+    package_id: str
+    version: str
+    available: Optional[str] = None
+    pinned: bool = False
+
+
+# WinGet header labels (English) mapped to WinGetRow fields; columns past
+# the first three are only recognized by label
+_WINGET_OPTIONAL_COLUMNS = {
+    'available': 'available',
+    'source': 'source',
+    'match': 'match',
+}
+
+
+def _cell_width(char: str) -> int:
+    """Display cells used by one character"""
+    if unicodedata.combining(char):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+
+
+def _visible_text(line: str) -> str:
+    """Drop spinner output overwritten with carriage returns"""
+    return line.rstrip('\r').rsplit('\r', 1)[-1].rstrip()
+
+
+def _is_separator(line: str) -> bool:
+    stripped = line.strip()
+    return len(stripped) >= 3 and set(stripped) == {'-'}
+
+
+def _column_starts(header: str) -> List[int]:
+    """Display offsets where each header label begins"""
+    starts = []
+    offset = 0
+    previous = ' '
+    for char in header:
+        if char != ' ' and previous == ' ':
+            starts.append(offset)
+        offset += _cell_width(char)
+        previous = char
+    return starts
+
+
+def _split_columns(line: str, starts: List[int]) -> List[str]:
+    """Cut a row at display offsets"""
+    if line.isascii():
+        bounds = starts[1:] + [len(line)]
+        return [line[start:end].strip() for start, end in zip(starts, bounds)]
+
+    cells = []
+    current: List[str] = []
+    boundary = 1
+    offset = 0
+    for char in line:
+        if boundary < len(starts) and offset >= starts[boundary]:
+            cells.append(''.join(current).strip())
+            current = []
+            boundary += 1
+        current.append(char)
+        offset += _cell_width(char)
+    cells.append(''.join(current).strip())
+    cells.extend([''] * (len(starts) - len(cells)))
+    return cells
+
+
+def _crosses_columns(line: str, starts: List[int]) -> bool:
+    """Whether text runs over the Id or Version column boundary
+
+    WinGet pads every cell, so a table row has a blank cell just before
+    each column it reaches; free text such as a footer does not.
+    """
+    boundaries = [start - 1 for start in starts[1:3]]
+    if line.isascii():
+        return any(b < len(line) and line[b] != ' ' for b in boundaries)
+
+    offset = 0
+    for char in line:
+        width = _cell_width(char)
+        if char != ' ' and any(offset <= b < offset + max(width, 1) for b in boundaries):
+            return True
+        offset += width
+    return False
+
+
+def _header_fields(header: str) -> List[Optional[str]]:
+    """Map header labels to WinGetRow fields"""
+    labels = header.split()
+    fields: List[Optional[str]] = ['name', 'package_id', 'version']
+    for label in labels[3:]:
+        fields.append(_WINGET_OPTIONAL_COLUMNS.get(label.lower()))
+    return fields
+
+
+def iter_winget_table(output: str) -> Iterator[WinGetRow]:
+    """Yield rows from ``winget list``/``search``/``upgrade`` output
+
+    Every line followed by a dashed separator is taken as a header, so
+    output containing several tables is handled. Lines before the first
+    header, footer lines shorter than the Id column and text running across
+    column boundaries are ignored; Ids may contain spaces, as Steam and
+    MSIX entries such as "Steam App 730" do.
+    """
+    lines = [_visible_text(line) for line in output.split('\n')]
+    starts: Optional[List[int]] = None
+    fields: List[Optional[str]] = []
+
+    for index, line in enumerate(lines):
+        if index + 1 < len(lines) and _is_separator(lines[index + 1]):
+            starts = _column_starts(line)
+            fields = _header_fields(line)
+            continue
+        if starts is None or len(starts) < 3 or not line or _is_separator(line):
+            continue
+
+        if _crosses_columns(line, starts):
+            # Footer text such as "2 upgrades available." spans the columns
+            continue
+        cells = _split_columns(line, starts)
+        values: Dict[str, str] = {
+            field: cell for field, cell in zip(fields, cells) if field and cell
+        }
+        if 'package_id' not in values:
+            continue
+        yield WinGetRow(
+            name=values.get('name', values['package_id']),
+            package_id=values['package_id'],
+            version=values.get('version', 'Unknown'),
+            available=values.get('available'),
+            source=values.get('source'),
+            match=values.get('match')
+        )
+
+
+def parse_winget_table(output: str) -> List[WinGetRow]:
+    """Parse a WinGet table into rows"""
+    return list(iter_winget_table(output))
+
+
+def iter_choco_records(output: str) -> Iterator[ChocoRow]:
+    """Yield records from Chocolatey ``-r`` output
+
+    ``list``/``search`` print ``id|version``; ``outdated`` prints
+    ``id|current|available|pinned``. Warnings and other free text are
+    skipped.
+    """
+    for line in output.splitlines():
+        parts = line.strip().split('|')
+        if len(parts) < 2 or not parts[0] or ' ' in parts[0]:
+            continue
+        yield ChocoRow(
+            package_id=parts[0],
+            version=parts[1],
+            available=parts[2] if len(parts) > 2 and parts[2] else None,
+            pinned=len(parts) > 3 and parts[3].lower() == 'true'
+        )
+
+
+def parse_choco_output(output: str) -> List[ChocoRow]:
+    """Parse Chocolatey limit-output into records"""
+    return list(iter_choco_records(output))
@@ -22,6 +22,13 @@ from dataclasses import dataclass, field
 from enum import Enum
 import psutil
 
+from better11.metrics_sampler import MetricsDelta, MetricsSampler
+
+
+# Seconds of history compared before and after optimize_system
+MEASURE_BASELINE_SECONDS = 5.0
+MEASURE_SETTLE_SECONDS = 10.0
+
 
 class OptimizationLevel(Enum):
     """Optimization presets"""
@@ -49,6 +56,8 @@ class OptimizationResult:
     success: bool
     message: str
     reverted: bool = False
+    # Measured change per metric (after minus before), when sampled
+    metrics: Optional[Dict[str, float]] = None
 
 
 @dataclass
@@ -483,24 +492,36 @@ class PowerOptimizer:
 class SystemOptimizer:
     """Comprehensive system optimizer"""
 
-    def __init__(self, verbose: bool = False):
+    def __init__(self, verbose: bool = False, sampler: Optional[MetricsSampler] = None):
         self.verbose = verbose
         self.registry_optimizer = RegistryOptimizer(verbose)
         self.service_optimizer = ServiceOptimizer(verbose)
         self.startup_optimizer = StartupOptimizer(verbose)
         self.disk_optimizer = DiskOptimizer(verbose)
         self.power_optimizer = PowerOptimizer(verbose)
+        # When set, optimize_system measures its effect with this sampler
+        self.sampler = sampler
+        self.last_effect: Optional[MetricsDelta] = None
 
     def get_system_metrics(self) -> SystemMetrics:
-        """Get current system performance metrics"""
+        """Get current system performance metrics
+
+        CPU and memory come from the sampler's latest sample when it is
+        running, instead of blocking for a one-second CPU measurement.
+        """
         import psutil
         from datetime import datetime
 
         boot_time = datetime.fromtimestamp(psutil.boot_time()).strftime("%Y-%m-%d %H:%M:%S")
 
+        cpu_percent = memory_percent = None
+        if self.sampler is not None and self.sampler.running:
+            cpu_percent = self.sampler.latest('cpu_percent')
+            memory_percent = self.sampler.latest('memory_percent')
+
         return SystemMetrics(
-            cpu_percent=psutil.cpu_percent(interval=1),
-            memory_percent=psutil.virtual_memory().percent,
+            cpu_percent=cpu_percent if cpu_percent is not None else psutil.cpu_percent(interval=1),
+            memory_percent=memory_percent if memory_percent is not None else psutil.virtual_memory().percent,
             disk_usage_percent=psutil.disk_usage('/').percent,
             boot_time=boot_time,
             running_processes=len(psutil.pids()),
@@ -509,7 +530,30 @@ class SystemOptimizer:
         )
 
     def optimize_system(self, level: OptimizationLevel) -> List[OptimizationResult]:
-        """Perform comprehensive system optimization"""
+        """Perform comprehensive system optimization
+
+        With a sampler attached, metrics are sampled before and after the
+        changes and the measured effect is appended as a "Metrics" result.
+        """
+        if self.sampler is None:
+            return self._apply_optimizations(level)
+
+        results, effect = self.sampler.measure(
+            lambda: self._apply_optimizations(level),
+            baseline=MEASURE_BASELINE_SECONDS,
+            settle=MEASURE_SETTLE_SECONDS
+        )
+        self.last_effect = effect
+        results.append(OptimizationResult(
+            category="Metrics",
+            operation="Measured effect",
+            success=bool(effect.before and effect.after),
+            message=effect.describe(),
+            metrics=effect.change or None
+        ))
+        return results
+
+    def _apply_optimizations(self, level: OptimizationLevel) -> List[OptimizationResult]:
         results = []
 
         # Visual effects
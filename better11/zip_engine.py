@@ -0,0 +1,397 @@
+"""
+Parallel ZIP Engine
+
+Multi-core ZIP archive creation and extraction for FileCompressor:
+- Members are deflated on worker threads (zlib releases the GIL) and
+  written into the archive in their original order
+- Per-file compression levels, with STORE for formats that are already
+  compressed (ISO, CAB, MSU, archives, media)
+- Compressed data is spooled in memory and spills to disk for large
+  members, so memory stays bounded
+- Members whose first chunk does not compress are stored without
+  deflating the rest of the file
+- Pre-compressed members are appended through ``zipfile`` internals; on
+  Python versions where those are not known to work, members are written
+  with the public ``ZipFile.write`` on the calling thread instead
+- Progress and byte counts reported through a callback
+- Parallel, filtered extraction that rejects path traversal and oversized
+  archives and skips files already present
+"""
+
+import os
+import sys
+import time
+import shutil
+import fnmatch
+import zlib
+import zipfile
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional, Tuple
+
+
+# Extensions whose contents barely compress; these are stored as-is
+INCOMPRESSIBLE_EXTENSIONS = {
+    '.iso', '.cab', '.msu', '.wim', '.esd', '.swm', '.vhd', '.vhdx',
+    '.zip', '.7z', '.rar', '.gz', '.tgz', '.bz2', '.xz', '.zst', '.lz', '.lzma',
+    '.appx', '.appxbundle', '.msix', '.msixbundle', '.nupkg', '.whl', '.jar',
+    '.docx', '.xlsx', '.pptx',
+    '.jpg', '.jpeg', '.png', '.gif', '.webp',
+    '.mp3', '.mp4', '.m4a', '.mkv', '.avi', '.mov', '.flac', '.ogg',
+}
+
+DEFAULT_COMPRESSION_LEVEL = 6
+# Compressed members up to this size stay in memory before spilling to disk
+SPOOL_MAX_SIZE = 16 * 1024 * 1024
+READ_CHUNK_SIZE = 1024 * 1024
+# A first chunk that deflates to more than this fraction of its size is
+# taken as incompressible and the member is stored
+STORE_RATIO = 0.95
+
+# _write_raw relies on private ZipFile state that has been stable from 3.8
+# through 3.14; newer versions fall back to ZipFile.write until checked
+_RAW_WRITE_VERSIONS = ((3, 8), (3, 14))
+RAW_WRITE_SUPPORTED = (
+    _RAW_WRITE_VERSIONS[0] <= sys.version_info[:2] <= _RAW_WRITE_VERSIONS[1]
+    and hasattr(zipfile.ZipFile, '_writecheck')
+    and hasattr(zipfile.ZipInfo, 'FileHeader')
+)
+
+
+@dataclass
+class CompressionProgress:
+    """Running totals for an archive being written"""
+    files_done: int = 0
+    files_total: int = 0
+    bytes_read: int = 0
+    bytes_written: int = 0
+    current_file: str = ""
+
+    @property
+    def ratio(self) -> float:
+        """Compressed size as a fraction of the input"""
+        return self.bytes_written / self.bytes_read if self.bytes_read else 0.0
+
+
+def default_level_for(path: str) -> int:
+    """Compression level for a file; 0 means STORE"""
+    if os.path.splitext(path)[1].lower() in INCOMPRESSIBLE_EXTENSIONS:
+        return 0
+    return DEFAULT_COMPRESSION_LEVEL
+
+
+def _encode_member(path: str, level: int):
+    """Raw-deflate one file into a spool, returning (spool, crc, size, compress_type)
+
+    The first chunk is deflated and flushed on its own; if it does not
+    shrink below ``STORE_RATIO`` the rest of the file is copied as-is and
+    the member is stored, so incompressible data is read once and never
+    deflated in full.
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
+    compress_type = zipfile.ZIP_DEFLATED
+    crc = 0
+    size = 0
+
+    try:
+        with open(path, 'rb') as f:
+            first = f.read(READ_CHUNK_SIZE)
+            crc = zlib.crc32(first)
+            size = len(first)
+            head = compressor.compress(first) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            if first and len(head) > len(first) * STORE_RATIO:
+                compress_type = zipfile.ZIP_STORED
+                spool.write(first)
+            else:
+                spool.write(head)
+
+            for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+                crc = zlib.crc32(chunk, crc)
+                size += len(chunk)
+                if compress_type == zipfile.ZIP_STORED:
+                    spool.write(chunk)
+                else:
+                    spool.write(compressor.compress(chunk))
+        if compress_type == zipfile.ZIP_DEFLATED:
+            spool.write(compressor.flush())
+    except BaseException:
+        spool.close()
+        raise
+
+    return spool, crc, size, compress_type
+
+
+def _write_raw(zipf: zipfile.ZipFile, zinfo: zipfile.ZipInfo, spool, crc: int, size: int, compress_type: int):
+    """Append an already-encoded member to an open archive
+
+    Mirrors what ``zipfile`` does when closing a member opened for writing,
+    but with the sizes known up front so the header is written once. Only
+    call this when ``RAW_WRITE_SUPPORTED`` is true.
+    """
+    compress_size = spool.tell()
+    spool.seek(0)
+
+    zinfo.compress_type = compress_type
+    zinfo.file_size = size
+    zinfo.compress_size = compress_size
+    zinfo.CRC = crc
+    zinfo.flag_bits &= ~0x08
+
+    if zipf._seekable:
+        zipf.fp.seek(zipf.start_dir)
+    zinfo.header_offset = zipf.fp.tell()
+    zipf._writecheck(zinfo)
+    zipf._didModify = True
+
+    zip64 = size > zipfile.ZIP64_LIMIT or compress_size > zipfile.ZIP64_LIMIT
+    zipf.fp.write(zinfo.FileHeader(zip64))
+    shutil.copyfileobj(spool, zipf.fp, READ_CHUNK_SIZE)
+    zipf.start_dir = zipf.fp.tell()
+    zipf.filelist.append(zinfo)
+    zipf.NameToInfo[zinfo.filename] = zinfo
+
+
+class ParallelZipWriter:
+    """Write ZIP archives with members deflated on a thread pool"""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        level_for: Callable[[str], int] = default_level_for,
+        progress_callback: Optional[Callable[[CompressionProgress], None]] = None
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.level_for = level_for
+        self.progress_callback = progress_callback
+
+    def write(self, dst: str, members: List[Tuple[str, str]]) -> CompressionProgress:
+        """Write (path, arcname) members to dst in order"""
+        progress = CompressionProgress(files_total=len(members))
+        # Bound the number of members compressed ahead of the writer
+        window = 2 * self.max_workers
+
+        with zipfile.ZipFile(dst, 'w', zipfile.ZIP_DEFLATED, allowZip64=True) as zipf, \
+                ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            pending = deque()
+            queue = iter(members)
+
+            def refill():
+                while len(pending) < window:
+                    try:
+                        path, arcname = next(queue)
+                    except StopIteration:
+                        return
+                    level = self.level_for(path)
+                    future = None
+                    if level > 0 and RAW_WRITE_SUPPORTED:
+                        future = pool.submit(_encode_member, path, level)
+                    pending.append((path, arcname, level, future))
+
+            try:
+                refill()
+                while pending:
+                    path, arcname, level, future = pending.popleft()
+                    written_before = zipf.fp.tell()
+
+                    if future is None:
+                        # Stored members, or every member without raw writes
+                        if level > 0:
+                            zipf.write(path, arcname, compress_type=zipfile.ZIP_DEFLATED, compresslevel=level)
+                        else:
+                            zipf.write(path, arcname, compress_type=zipfile.ZIP_STORED)
+                        progress.bytes_read += zipf.filelist[-1].file_size
+                    else:
+                        spool, crc, size, compress_type = future.result()
+                        try:
+                            zinfo = zipfile.ZipInfo.from_file(path, arcname)
+                            _write_raw(zipf, zinfo, spool, crc, size, compress_type)
+                        finally:
+                            spool.close()
+                        progress.bytes_read += size
+
+                    progress.bytes_written += zipf.fp.tell() - written_before
+                    progress.files_done += 1
+                    progress.current_file = path
+                    if self.progress_callback:
+                        self.progress_callback(CompressionProgress(**progress.__dict__))
+                    refill()
+            finally:
+                for _, _, _, future in pending:
+                    if future is not None:
+                        future.cancel()
+
+        return progress
+
+
+class UnsafeArchiveError(Exception):
+    """Archive rejected before extraction (path traversal or size limit)"""
+    pass
+
+
+@dataclass
+class ExtractionResult:
+    """Outcome of an extraction"""
+    extracted: int = 0
+    skipped: int = 0
+    filtered: int = 0
+    bytes_written: int = 0
+    errors: List[Tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def success(self) -> bool:
+        """Whether every selected member was extracted or already present"""
+        return not self.errors
+
+
+def _file_crc(path: str) -> int:
+    """CRC-32 of a file on disk"""
+    crc = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_SIZE), b""):
+            crc = zlib.crc32(chunk, crc)
+    return crc
+
+
+class ParallelZipExtractor:
+    """Extract ZIP archives with one archive handle per worker
+
+    Members can be selected with include and exclude globs, the total
+    uncompressed size can be capped, and members whose size and CRC already
+    match the file at the destination are skipped. Every target path is
+    checked to stay inside the destination before anything is written.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        include: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        max_total_size: Optional[int] = None,
+        skip_existing: bool = True,
+        verbose: bool = False
+    ):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.include = include
+        self.exclude = exclude
+        self.max_total_size = max_total_size
+        self.skip_existing = skip_existing
+        self.verbose = verbose
+
+    def _selected(self, name: str) -> bool:
+        if self.include and not any(fnmatch.fnmatchcase(name, p) for p in self.include):
+            return False
+        if self.exclude and any(fnmatch.fnmatchcase(name, p) for p in self.exclude):
+            return False
+        return True
+
+    @staticmethod
+    def _target_path(root: str, name: str) -> str:
+        """Resolve a member name under root, rejecting escapes"""
+        relative = name.replace('\\', '/')
+        if relative.startswith('/') or (len(relative) > 1 and relative[1] == ':'):
+            raise UnsafeArchiveError(f"Absolute path in archive: {name}")
+
+        target = os.path.realpath(os.path.join(root, *relative.split('/')))
+        if os.path.commonpath([root, target]) != root:
+            raise UnsafeArchiveError(f"Path escapes destination: {name}")
+        return target
+
+    def plan(self, src: str, dst: str) -> Tuple[List[Tuple[zipfile.ZipInfo, str]], List[str], int]:
+        """Select and validate members; returns (files, directories, filtered count)"""
+        root = os.path.realpath(dst)
+        files = []
+        directories = []
+        filtered = 0
+        total = 0
+
+        by_target = {}
+
+        with zipfile.ZipFile(src) as zipf:
+            for info in zipf.infolist():
+                if not self._selected(info.filename):
+                    filtered += 1
+                    continue
+                target = self._target_path(root, info.filename)
+                if info.is_dir():
+                    directories.append(target)
+                    continue
+                total += info.file_size
+                if self.max_total_size is not None and total > self.max_total_size:
+                    raise UnsafeArchiveError(
+                        f"Archive expands beyond {self.max_total_size} bytes"
+                    )
+                # A repeated name replaces the earlier member, as with
+                # ZipFile.extractall, and two workers never share a target
+                key = os.path.normcase(target)
+                if key in by_target:
+                    files[by_target[key]] = None
+                by_target[key] = len(files)
+                files.append((info, target))
+
+        return [item for item in files if item is not None], directories, filtered
+
+    def _unchanged(self, info: zipfile.ZipInfo, target: str) -> bool:
+        try:
+            if os.path.getsize(target) != info.file_size:
+                return False
+            return _file_crc(target) == info.CRC
+        except OSError:
+            return False
+
+    def _extract_batch(self, src: str, batch: List[Tuple[zipfile.ZipInfo, str]]) -> ExtractionResult:
+        """Extract a batch of members through a private archive handle"""
+        result = ExtractionResult()
+
+        with zipfile.ZipFile(src) as zipf:
+            for info, target in batch:
+                if self.skip_existing and self._unchanged(info, target):
+                    result.skipped += 1
+                    continue
+
+                # The header offset keeps the name unique per member
+                partial = f"{target}.{info.header_offset}.b11partial"
+                try:
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    with zipf.open(info) as source, open(partial, 'wb') as output:
+                        shutil.copyfileobj(source, output, READ_CHUNK_SIZE)
+                    mtime = time.mktime(info.date_time + (0, 0, -1))
+                    os.utime(partial, (mtime, mtime))
+                    os.replace(partial, target)
+                    result.extracted += 1
+                    result.bytes_written += info.file_size
+                except (OSError, zipfile.BadZipFile) as e:
+                    if os.path.exists(partial):
+                        os.remove(partial)
+                    result.errors.append((info.filename, str(e)))
+
+        return result
+
+    def extract(self, src: str, dst: str) -> ExtractionResult:
+        """Extract selected members of src into dst"""
+        os.makedirs(dst, exist_ok=True)
+        files, directories, filtered = self.plan(src, dst)
+
+        for directory in directories:
+            os.makedirs(directory, exist_ok=True)
+
+        # Longest-processing-time-first split of members across workers
+        workers = max(1, min(self.max_workers, len(files)))
+        batches: List[List[Tuple[zipfile.ZipInfo, str]]] = [[] for _ in range(workers)]
+        loads = [0] * workers
+        for item in sorted(files, key=lambda f: f[0].compress_size, reverse=True):
+            slot = loads.index(min(loads))
+            batches[slot].append(item)
+            loads[slot] += item[0].compress_size + 1
+
+        total = ExtractionResult(filtered=filtered)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for partial in pool.map(lambda batch: self._extract_batch(src, batch), batches):
+                total.extracted += partial.extracted
+                total.skipped += partial.skipped
+                total.bytes_written += partial.bytes_written
+                total.errors.extend(partial.errors)
+
+        return total
@@ -5,6 +5,7 @@ This package provides comprehensive system management tools for Windows 11:
 Core Modules:
 - base: Base classes and interfaces for system tools
 - safety: Safety utilities (restore points, backups)
+- powershell: Persistent PowerShell host pool
 - registry: Registry management
 - bloatware: AppX package removal
 - services: Windows service management
@@ -67,6 +68,7 @@ def __getattr__(name: str):
         # Core modules
         "base": "system_tools.base",
         "safety": "system_tools.safety",
+        "powershell": "system_tools.powershell",
         "registry": "system_tools.registry",
         "bloatware": "system_tools.bloatware",
         "services": "system_tools.services",
@@ -103,6 +105,7 @@ __all__ = [
     # Core modules
     "base",
     "safety",
+    "powershell",
     "registry",
     "bloatware",
     "services",
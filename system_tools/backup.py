@@ -14,6 +14,7 @@ from typing import List, Optional
 
 from . import get_logger
 from .base import SystemTool, ToolMetadata
+from .powershell import PowerShellPool
 from .safety import SafetyError
 
 _LOGGER = get_logger(__name__)
@@ -44,8 +45,13 @@ class BackupManager(SystemTool):
         If True, simulate operations without making changes
     """
     
-    def __init__(self, config: Optional[dict] = None, dry_run: bool = False):
-        super().__init__(config, dry_run)
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        dry_run: bool = False,
+        powershell: Optional[PowerShellPool] = None,
+    ):
+        super().__init__(config, dry_run, powershell)
         self._backup_dir = Path.home() / ".better11" / "backups"
         self._backup_dir.mkdir(parents=True, exist_ok=True)
     
@@ -106,12 +112,8 @@ class BackupManager(SystemTool):
             Checkpoint-Computer -Description "{description}" -RestorePointType "MODIFY_SETTINGS"
             '''
             
-            result = subprocess.run(
-                ["powershell", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            result = self.run_powershell(ps_script, timeout=600)
+            result.check_returncode()
             
             _LOGGER.info("Restore point created successfully")
             
@@ -148,12 +150,8 @@ class BackupManager(SystemTool):
             ConvertTo-Json
             '''
             
-            result = subprocess.run(
-                ["powershell", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                check=True
-            )
+            result = self.run_powershell(ps_script)
+            result.check_returncode()
             
             if not result.stdout.strip():
                 _LOGGER.info("No restore points found")
@@ -5,11 +5,13 @@ should inherit from for consistency, safety, and testability.
 """
 from __future__ import annotations
 
+import subprocess
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from typing import Optional
 
 from . import get_logger
+from .powershell import PowerShellPool, get_default_pool
 from .safety import SafetyError, confirm_action, create_restore_point, ensure_windows
 
 _LOGGER = get_logger(__name__)
@@ -61,14 +63,51 @@ class SystemTool(ABC):
         Configuration dictionary for the tool
     dry_run : bool
         If True, simulate operations without making changes
+    powershell : PowerShellPool, optional
+        Host pool used by :meth:`run_powershell`; defaults to the shared pool
     """
     
-    def __init__(self, config: Optional[dict] = None, dry_run: bool = False):
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        dry_run: bool = False,
+        powershell: Optional[PowerShellPool] = None,
+    ):
         self.config = config or {}
         self.dry_run = dry_run
+        self._powershell = powershell
         self._metadata = self.get_metadata()
         self._logger = get_logger(self.__class__.__name__)
     
+    @property
+    def powershell(self) -> PowerShellPool:
+        """PowerShell host pool used by this tool."""
+        if self._powershell is None:
+            self._powershell = get_default_pool()
+        return self._powershell
+    
+    def run_powershell(self, script: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """Run a PowerShell script on a pooled, already running host.
+        
+        Parameters
+        ----------
+        script : str
+            PowerShell source to run
+        timeout : float, optional
+            Seconds to wait; defaults to the pool timeout
+        
+        Returns
+        -------
+        subprocess.CompletedProcess
+            Exit code and text output, as from ``subprocess.run``
+        
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            If the script does not finish in time
+        """
+        return self.powershell.run(script, timeout=timeout)
+    
     @abstractmethod
     def get_metadata(self) -> ToolMetadata:
         """Return tool metadata.
@@ -295,8 +334,13 @@ class RegistryTool(SystemTool):
     automatic backups before modifications.
     """
     
-    def __init__(self, config: Optional[dict] = None, dry_run: bool = False):
-        super().__init__(config, dry_run)
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        dry_run: bool = False,
+        powershell: Optional[PowerShellPool] = None,
+    ):
+        super().__init__(config, dry_run, powershell)
         self._backup_path: Optional[str] = None
     
     def validate_environment(self) -> None:
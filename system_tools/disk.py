@@ -5,12 +5,15 @@ space analysis, cleanup, optimization, and health monitoring.
 """
 from __future__ import annotations
 
+import os
 import shutil
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional
 
+from better11.file_walker import scan_directories
+
 from . import get_logger
 from .base import SystemTool, ToolMetadata
 
@@ -316,18 +319,19 @@ class DiskManager(SystemTool):
         _LOGGER.info("Analyzing disk usage for: %s", root_path)
         
         usage: Dict[str, int] = {}
+        root = str(root_path)
         
-        try:
-            for item in root_path.iterdir():
-                if item.is_dir():
-                    try:
-                        size = sum(f.stat().st_size for f in item.rglob("*") if f.is_file())
-                        usage[str(item)] = size
-                    except (PermissionError, OSError):
-                        continue
+        def on_error(exc: OSError) -> None:
+            if exc.filename is not None and os.path.normpath(exc.filename) == os.path.normpath(root):
+                _LOGGER.error("Cannot analyze %s: %s", root_path, exc)
         
-        except (PermissionError, OSError) as exc:
-            _LOGGER.error("Cannot analyze %s: %s", root_path, exc)
+        # Single scandir pass; every file is charged to its top-level folder
+        for directory, files in scan_directories(root, on_error):
+            relative = os.path.relpath(directory, root)
+            if relative == os.curdir:
+                continue
+            top_level = os.path.join(root, relative.split(os.sep, 1)[0])
+            usage[top_level] = usage.get(top_level, 0) + sum(record.size for record in files)
         
         return dict(sorted(usage.items(), key=lambda x: x[1], reverse=True))
 
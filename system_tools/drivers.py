@@ -18,6 +18,7 @@ from typing import Dict, List, Optional
 
 from . import get_logger
 from .base import SystemTool, ToolMetadata
+from .powershell import PowerShellPool
 
 _LOGGER = get_logger(__name__)
 
@@ -121,8 +122,13 @@ class DriverManager(SystemTool):
     
     DEFAULT_BACKUP_DIR = Path.home() / ".better11" / "driver_backups"
     
-    def __init__(self, config: Optional[dict] = None, dry_run: bool = False):
-        super().__init__(config, dry_run)
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        dry_run: bool = False,
+        powershell: Optional[PowerShellPool] = None,
+    ):
+        super().__init__(config, dry_run, powershell)
         self._backup_dir = Path(config.get("backup_dir", self.DEFAULT_BACKUP_DIR)) if config else self.DEFAULT_BACKUP_DIR
         self._backup_dir.mkdir(parents=True, exist_ok=True)
     
@@ -200,12 +206,7 @@ class DriverManager(SystemTool):
             $Drivers | ConvertTo-Json -Depth 10
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = self.run_powershell(ps_script, timeout=60)
             
             if result.returncode != 0:
                 _LOGGER.error("Failed to list drivers: %s", result.stderr)
@@ -302,12 +303,7 @@ class DriverManager(SystemTool):
             $Problems | ConvertTo-Json -Depth 10
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = self.run_powershell(ps_script, timeout=60)
             
             if result.returncode != 0:
                 return []
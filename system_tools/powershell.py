@@ -0,0 +1,374 @@
+"""Persistent PowerShell hosts shared by system tools.
+
+Starting ``powershell`` costs several hundred milliseconds, which adds up
+when one refresh issues a dozen queries. :class:`PowerShellPool` keeps a
+few long-lived hosts running instead. Each host reads one JSON request per
+line on stdin, runs the script in a runspace that stays open between
+requests (so imported modules stay loaded), and answers with one framed
+JSON line on stdout::
+
+    -> {"id": 1, "script": "Get-Date"}
+    <- ##B11##{"id": 1, "ok": true, "code": 0, "stdout": "...", "stderr": ""}
+
+Results are returned as :class:`subprocess.CompletedProcess`, so code that
+used ``subprocess.run(["powershell", ...])`` keeps its parsing. A host that
+reports a terminating error, exits, or misses its timeout is discarded and
+replaced on the next request.
+
+:func:`stand_in_command` starts a Python executor speaking the same
+protocol, which lets the pool be exercised on hosts without PowerShell.
+"""
+from __future__ import annotations
+
+import atexit
+import base64
+import itertools
+import json
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from . import get_logger
+
+_LOGGER = get_logger(__name__)
+
+FRAME_PREFIX = "##B11##"
+DEFAULT_POOL_SIZE = 4
+DEFAULT_MAX_USES = 200
+DEFAULT_TIMEOUT = 60.0
+
+# Keep hosts from opening console windows when launched from the GUI
+_CREATION_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
+
+# Each request is written to a .ps1 file and invoked with "&", so that
+# "exit N" ends only that script and sets $LASTEXITCODE, and output
+# written before the exit is kept. Exit codes follow "powershell -Command":
+# an explicit or native exit code wins, otherwise non-terminating errors
+# give 1.
+_HOST_SCRIPT = r"""
+$utf8 = New-Object System.Text.UTF8Encoding $false
+[Console]::OutputEncoding = $utf8
+$out = [Console]::Out
+$scriptPath = Join-Path ([IO.Path]::GetTempPath()) "better11-host-$PID.ps1"
+$bom = New-Object System.Text.UTF8Encoding $true
+$runspace = [runspacefactory]::CreateRunspace()
+$runspace.Open()
+while ($true) {
+    $line = [Console]::In.ReadLine()
+    if ($null -eq $line) { break }
+    if (-not $line.Trim()) { continue }
+    $request = ConvertFrom-Json $line
+    $response = [ordered]@{ id = $request.id; ok = $true; code = 0; stdout = ''; stderr = '' }
+    $output = New-Object 'System.Management.Automation.PSDataCollection[psobject]'
+    $ps = [powershell]::Create()
+    $ps.Runspace = $runspace
+    try {
+        [IO.File]::WriteAllText($scriptPath, $request.script, $bom)
+        $runspace.SessionStateProxy.SetVariable('LASTEXITCODE', $null)
+        $null = $ps.AddScript('param($Path) & $Path').AddArgument($scriptPath)
+        $ps.Invoke($null, $output)
+        $response.stderr = ($ps.Streams.Error | Out-String)
+        $code = $runspace.SessionStateProxy.GetVariable('LASTEXITCODE')
+        if ($null -ne $code) { $response.code = [int]$code }
+        elseif ($ps.HadErrors) { $response.code = 1 }
+    } catch {
+        $response.ok = $false
+        $response.code = 1
+        $response.stderr = ($ps.Streams.Error | Out-String) + ($_ | Out-String)
+    } finally {
+        $response.stdout = ($output | Out-String -Width 4096)
+        $ps.Dispose()
+    }
+    $out.WriteLine('##B11##' + (ConvertTo-Json $response -Compress))
+    $out.Flush()
+}
+Remove-Item -LiteralPath $scriptPath -ErrorAction SilentlyContinue
+"""
+
+
+def powershell_command() -> List[str]:
+    """Command line that starts a PowerShell host."""
+    encoded = base64.b64encode(_HOST_SCRIPT.encode("utf-16-le")).decode("ascii")
+    return [
+        "powershell", "-NoProfile", "-NonInteractive",
+        "-ExecutionPolicy", "Bypass", "-EncodedCommand", encoded,
+    ]
+
+
+def stand_in_command() -> List[str]:
+    """Command line that starts the Python stand-in host.
+
+    The stand-in runs each script as Python source, with ``print`` output
+    as stdout, ``sys.exit(code)`` as the exit code and ``write_error(text)``
+    as a non-terminating error.
+    """
+    return [sys.executable, "-u", str(Path(__file__).with_name("powershell_stand_in.py"))]
+
+
+class PowerShellHostError(RuntimeError):
+    """Raised when a host exits or answers with an unreadable frame."""
+
+
+class PowerShellWorker:
+    """One long-lived host process.
+
+    Parameters
+    ----------
+    command : sequence of str
+        Command line that starts a host speaking the framed protocol
+    """
+
+    def __init__(self, command: Sequence[str]):
+        self.command = list(command)
+        self.uses = 0
+        self._ids = itertools.count(1)
+        self._lines: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._process = subprocess.Popen(
+            self.command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            encoding="utf-8",
+            errors="replace",
+            bufsize=1,
+            creationflags=_CREATION_FLAGS,
+        )
+        self._reader = threading.Thread(target=self._read, name="powershell-host-reader", daemon=True)
+        self._reader.start()
+
+    @property
+    def pid(self) -> int:
+        """Process id of the host."""
+        return self._process.pid
+
+    @property
+    def alive(self) -> bool:
+        """Whether the host process is still running."""
+        return self._process.poll() is None
+
+    def _read(self) -> None:
+        for line in self._process.stdout:
+            self._lines.put(line)
+        self._lines.put(None)
+
+    def execute(self, script: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Send a script and wait for its response frame.
+
+        Lines the host prints outside a frame are prepended to ``stdout``.
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            If no frame arrives within ``timeout`` seconds
+        PowerShellHostError
+            If the host exits or the frame cannot be decoded
+        """
+        request_id = next(self._ids)
+        self.uses += 1
+        try:
+            self._process.stdin.write(json.dumps({"id": request_id, "script": script}) + "\n")
+            self._process.stdin.flush()
+        except OSError as exc:
+            raise PowerShellHostError("PowerShell host is not accepting requests") from exc
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        stray: List[str] = []
+        while True:
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                line = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                raise subprocess.TimeoutExpired(self.command[0], timeout, output="".join(stray)) from None
+            if line is None:
+                raise PowerShellHostError(f"PowerShell host exited with code {self._process.wait()}")
+            if not line.startswith(FRAME_PREFIX):
+                stray.append(line)
+                continue
+            try:
+                frame = json.loads(line[len(FRAME_PREFIX):])
+            except ValueError as exc:
+                raise PowerShellHostError(f"Unreadable response frame: {line.strip()}") from exc
+            if frame.get("id") == request_id:
+                frame["stdout"] = "".join(stray) + (frame.get("stdout") or "")
+                return frame
+
+    def close(self) -> None:
+        """Ask the host to exit by closing its stdin."""
+        if self._process.poll() is None:
+            try:
+                self._process.stdin.close()
+                self._process.wait(timeout=2)
+            except (OSError, subprocess.TimeoutExpired):
+                self.kill()
+
+    def kill(self) -> None:
+        """Terminate the host immediately."""
+        if self._process.poll() is None:
+            self._process.kill()
+        self._process.wait()
+
+
+class PowerShellPool:
+    """Pool of persistent PowerShell hosts.
+
+    Hosts are started on demand, up to ``size`` at once, and reused across
+    requests. A host is retired after ``max_uses`` requests, after a
+    terminating error, when it exits, or when a request times out.
+
+    Parameters
+    ----------
+    size : int
+        Maximum number of hosts (and concurrent requests)
+    command : sequence of str, optional
+        Host command line; defaults to :func:`powershell_command`
+    max_uses : int
+        Requests served by one host before it is replaced
+    timeout : float
+        Default per-request timeout in seconds
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        command: Optional[Sequence[str]] = None,
+        max_uses: int = DEFAULT_MAX_USES,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        self.size = size
+        self.command = list(command) if command else powershell_command()
+        self.max_uses = max_uses
+        self.timeout = timeout
+        self.spawned = 0
+        self._idle: List[PowerShellWorker] = []
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def __enter__(self) -> "PowerShellPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _spawn(self) -> PowerShellWorker:
+        worker = PowerShellWorker(self.command)
+        with self._lock:
+            self.spawned += 1
+        return worker
+
+    def _checkout(self) -> PowerShellWorker:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("PowerShell pool is closed")
+            while self._idle:
+                worker = self._idle.pop()
+                if worker.alive:
+                    return worker
+                worker.kill()
+        return self._spawn()
+
+    def _checkin(self, worker: PowerShellWorker) -> None:
+        if worker.alive and worker.uses < self.max_uses:
+            with self._lock:
+                if not self._closed:
+                    self._idle.append(worker)
+                    return
+        worker.close()
+
+    def warm(self, count: Optional[int] = None) -> None:
+        """Start hosts ahead of the first request.
+
+        Parameters
+        ----------
+        count : int, optional
+            Hosts to have idle; defaults to the pool size
+        """
+        wanted = min(self.size, self.size if count is None else count)
+        with self._lock:
+            missing = wanted - len(self._idle)
+        for _ in range(max(0, missing)):
+            self._checkin(self._spawn())
+
+    def run(self, script: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+        """Run a script on a pooled host.
+
+        Parameters
+        ----------
+        script : str
+            PowerShell source to run
+        timeout : float, optional
+            Seconds to wait for the result; defaults to the pool timeout
+
+        Returns
+        -------
+        subprocess.CompletedProcess
+            ``returncode`` is the script's exit code; without one it is 1
+            after any error and 0 otherwise, as with ``powershell -Command``
+
+        Raises
+        ------
+        subprocess.TimeoutExpired
+            If the script does not finish in time; its host is killed
+        OSError
+            If a host cannot be started
+        """
+        timeout = self.timeout if timeout is None else timeout
+        with self._slots:
+            worker = self._checkout()
+            try:
+                frame = worker.execute(script, timeout)
+            except subprocess.TimeoutExpired:
+                _LOGGER.warning("PowerShell request timed out after %ss; recycling host %s", timeout, worker.pid)
+                worker.kill()
+                raise
+            except PowerShellHostError as exc:
+                _LOGGER.warning("Recycling PowerShell host %s: %s", worker.pid, exc)
+                worker.kill()
+                return subprocess.CompletedProcess(script, 1, "", f"{exc}\n")
+
+            if frame.get("ok"):
+                self._checkin(worker)
+            else:
+                worker.kill()
+
+        returncode = int(frame.get("code") or 0) if frame.get("ok") else int(frame.get("code") or 1)
+        return subprocess.CompletedProcess(
+            script, returncode, frame.get("stdout") or "", frame.get("stderr") or ""
+        )
+
+    def close(self) -> None:
+        """Stop every idle host; later requests raise ``RuntimeError``."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.close()
+
+
+_default_pool: Optional[PowerShellPool] = None
+_default_lock = threading.Lock()
+
+
+def get_default_pool() -> PowerShellPool:
+    """Process-wide pool shared by system tools."""
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = PowerShellPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+__all__ = [
+    "PowerShellHostError",
+    "PowerShellPool",
+    "PowerShellWorker",
+    "get_default_pool",
+    "powershell_command",
+    "stand_in_command",
+]
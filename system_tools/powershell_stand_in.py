@@ -0,0 +1,60 @@
+"""Stand-in PowerShell host for testing the host pool without PowerShell.
+
+Speaks the protocol of :mod:`system_tools.powershell`: one JSON request
+per stdin line, one ``##B11##``-framed JSON response per stdout line.
+Scripts are Python source run in a namespace that persists between
+requests, as a PowerShell runspace does. ``print`` output becomes stdout,
+``sys.exit(code)`` sets the exit code and any other exception is reported
+as a terminating error. ``write_error(text)`` records a non-terminating
+error, which makes the exit code 1 unless the script exits explicitly.
+``os._exit`` ends the host, like a crash.
+"""
+import contextlib
+import io
+import json
+import sys
+import traceback
+
+FRAME_PREFIX = "##B11##"
+
+
+def handle(request, namespace):
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    response = {"id": request.get("id"), "ok": True, "code": 0, "stdout": "", "stderr": ""}
+    errors = []
+
+    def write_error(text):
+        errors.append(text)
+        stderr.write(f"{text}\n")
+
+    namespace["write_error"] = write_error
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            exec(request.get("script", ""), namespace)
+    except SystemExit as exc:
+        response["code"] = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+    except Exception:
+        response["ok"] = False
+        response["code"] = 1
+        stderr.write(traceback.format_exc())
+    else:
+        if errors:
+            response["code"] = 1
+    response["stdout"] = stdout.getvalue()
+    response["stderr"] = stderr.getvalue()
+    return response
+
+
+def main():
+    namespace = {"__name__": "__powershell__"}
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        response = handle(json.loads(line), namespace)
+        sys.stdout.write(FRAME_PREFIX + json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
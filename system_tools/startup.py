@@ -5,13 +5,15 @@ startup programs from various locations in Windows.
 """
 from __future__ import annotations
 
+import json
 import os
 import platform
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from . import get_logger
 from .base import SystemTool, ToolMetadata
@@ -78,6 +80,132 @@ class StartupItem:
         return f"{status} {self.name} [{self.location.value}]"
 
 
+# One CIM query returns the configuration of every service
+_SERVICE_QUERY_SCRIPT = (
+    "Get-CimInstance Win32_Service | "
+    "Select-Object Name, DisplayName, StartMode, State, DelayedAutoStart | "
+    "ConvertTo-Json -Compress"
+)
+
+# Concurrent `sc qc` calls when the bulk query is unavailable
+SERVICE_QUERY_WORKERS = 16
+
+
+@dataclass
+class ServiceRecord:
+    """Startup configuration of one Windows service.
+    
+    Attributes
+    ----------
+    name : str
+        Service key name
+    display_name : str
+        Friendly name
+    start_mode : str
+        ``Auto``, ``Manual``, ``Disabled``, ``Boot`` or ``System``
+    state : str
+        Current state, such as ``Running`` or ``Stopped``
+    delayed_auto_start : bool
+        Whether automatic start is delayed
+    """
+    name: str
+    display_name: str
+    start_mode: str
+    state: str
+    delayed_auto_start: bool = False
+    
+    @property
+    def auto_start(self) -> bool:
+        """Whether the service starts automatically at boot."""
+        return self.start_mode.lower() == "auto"
+    
+    @property
+    def running(self) -> bool:
+        """Whether the service is running."""
+        return self.state.lower() == "running"
+
+
+def parse_service_records(output: str) -> List[ServiceRecord]:
+    """Parse ``Win32_Service`` objects converted to JSON.
+    
+    Parameters
+    ----------
+    output : str
+        JSON for one service object or an array of them
+    
+    Returns
+    -------
+    List[ServiceRecord]
+        Services with a name, in output order
+    """
+    if not output.strip():
+        return []
+    data = json.loads(output)
+    if isinstance(data, dict):
+        data = [data]
+    
+    records = []
+    for item in data:
+        if not isinstance(item, dict) or not item.get("Name"):
+            continue
+        records.append(ServiceRecord(
+            name=item["Name"],
+            display_name=item.get("DisplayName") or item["Name"],
+            start_mode=item.get("StartMode") or "",
+            state=item.get("State") or "",
+            delayed_auto_start=bool(item.get("DelayedAutoStart")),
+        ))
+    return records
+
+
+def parse_sc_query(output: str) -> List[Dict[str, str]]:
+    """Parse ``sc query`` output into name, display name and state.
+    
+    Parameters
+    ----------
+    output : str
+        Output of ``sc query type= service state= all``
+    
+    Returns
+    -------
+    List[Dict[str, str]]
+        One dict with ``name``, ``display_name`` and ``state`` per service
+    """
+    services: List[Dict[str, str]] = []
+    for line in output.splitlines():
+        key, _, value = line.strip().partition(":")
+        key = key.strip()
+        if key == "SERVICE_NAME":
+            services.append({"name": value.strip(), "display_name": value.strip(), "state": ""})
+        elif not services:
+            continue
+        elif key == "DISPLAY_NAME":
+            services[-1]["display_name"] = value.strip()
+        elif key == "STATE":
+            # "4  RUNNING"
+            parts = value.split()
+            services[-1]["state"] = parts[-1].capitalize() if parts else ""
+    return services
+
+
+def parse_sc_start_type(output: str) -> str:
+    """Map the START_TYPE of ``sc qc`` output to a ``StartMode`` name."""
+    for line in output.splitlines():
+        key, _, value = line.strip().partition(":")
+        if key.strip() == "START_TYPE":
+            if "AUTO_START" in value:
+                return "Auto"
+            if "DEMAND_START" in value:
+                return "Manual"
+            if "DISABLED" in value:
+                return "Disabled"
+            if "BOOT_START" in value:
+                return "Boot"
+            if "SYSTEM_START" in value:
+                return "System"
+    return ""
+
+
 class StartupManager(SystemTool):
     """Manage Windows startup programs.
     
@@ -414,73 +542,104 @@ class StartupManager(SystemTool):
         List[StartupItem]
             Startup items from services with automatic startup
         """
-        items: List[StartupItem] = []
-
         if platform.system() != "Windows":
             _LOGGER.debug("Not on Windows, skipping services")
-            return items
+            return []
 
+        records = self._query_services()
+        if records is None:
+            records = self._query_services_sc()
+
+        items = [
+            StartupItem(
+                name=record.display_name,
+                command=f"Service: {record.name}",
+                location=StartupLocation.SERVICES,
+                enabled=record.running,
+                impact=StartupImpact.UNKNOWN
+            )
+            for record in records
+            if record.auto_start
+        ]
+        _LOGGER.debug("Found %d auto-start services", len(items))
+        return items
+
+    def _query_services(self) -> Optional[List[ServiceRecord]]:
+        """Read every service's configuration with one CIM query.
+
+        Returns
+        -------
+        List[ServiceRecord], optional
+            All services, or None if the query failed
+        """
+        try:
+            result = self.run_powershell(_SERVICE_QUERY_SCRIPT, timeout=30)
+            if result.returncode == 0:
+                return parse_service_records(result.stdout)
+            _LOGGER.debug("Service query failed: %s", result.stderr.strip())
+        except subprocess.TimeoutExpired:
+            _LOGGER.warning("Timeout while querying services")
+        except Exception as exc:
+            _LOGGER.debug("Service query unavailable: %s", exc)
+        return None
+
+    def _query_services_sc(self) -> List[ServiceRecord]:
+        """Read service configuration with ``sc``.
+
+        Lists services with ``sc query`` and runs ``sc qc`` for each of
+        them concurrently.
+
+        Returns
+        -------
+        List[ServiceRecord]
+            Services whose configuration could be read
+        """
         try:
-            # Query services with automatic startup type
             result = subprocess.run(
                 ["sc", "query", "type=", "service", "state=", "all"],
                 capture_output=True,
                 text=True,
                 timeout=10
             )
-
-            if result.returncode == 0:
-                # Parse sc query output
-                current_service = None
-                service_state = None
-
-                for line in result.stdout.split('\n'):
-                    line = line.strip()
-
-                    if line.startswith("SERVICE_NAME:"):
-                        current_service = line.split(":", 1)[1].strip()
-                    elif line.startswith("STATE") and current_service:
-                        service_state = line
-                    elif line.startswith("DISPLAY_NAME:") and current_service:
-                        display_name = line.split(":", 1)[1].strip()
-
-                        # Check if service has auto-start by querying config
-                        try:
-                            config_result = subprocess.run(
-                                ["sc", "qc", current_service],
-                                capture_output=True,
-                                text=True,
-                                timeout=5
-                            )
-
-                            if "AUTO_START" in config_result.stdout:
-                                enabled = "RUNNING" in service_state if service_state else False
-
-                                item = StartupItem(
-                                    name=display_name,
-                                    command=f"Service: {current_service}",
-                                    location=StartupLocation.SERVICES,
-                                    enabled=enabled,
-                                    impact=StartupImpact.UNKNOWN
-                                )
-                                items.append(item)
-                                _LOGGER.debug("Found auto-start service: %s", current_service)
-                        except subprocess.TimeoutExpired:
-                            _LOGGER.debug("Timeout checking service config for %s", current_service)
-                        except Exception:
-                            pass
-
-                        current_service = None
-                        service_state = None
-
         except subprocess.TimeoutExpired:
             _LOGGER.warning("Timeout while querying services")
+            return []
         except FileNotFoundError:
             _LOGGER.debug("sc command not found")
-        except Exception as exc:
-            _LOGGER.error("Error querying services: %s", exc)
+            return []
+        if result.returncode != 0:
+            return []
 
-        return items
+        services = parse_sc_query(result.stdout)
+
+        def start_mode(name: str) -> Optional[str]:
+            try:
+                config_result = subprocess.run(
+                    ["sc", "qc", name],
+                    capture_output=True,
+                    text=True,
+                    timeout=5
+                )
+                return parse_sc_start_type(config_result.stdout)
+            except subprocess.TimeoutExpired:
+                _LOGGER.debug("Timeout checking service config for %s", name)
+            except Exception:
+                pass
+            return None
+
+        with ThreadPoolExecutor(max_workers=SERVICE_QUERY_WORKERS) as executor:
+            modes = list(executor.map(start_mode, [service["name"] for service in services]))
+
+        return [
+            ServiceRecord(
+                name=service["name"],
+                display_name=service["display_name"],
+                start_mode=mode,
+                state=service["state"]
+            )
+            for service, mode in zip(services, modes)
+            if mode is not None
+        ]
 
     def enable_startup_item(self, item: StartupItem) -> bool:
         """Enable a startup item.
@@ -839,5 +998,9 @@ __all__ = [
     "StartupImpact",
     "StartupItem",
     "StartupManager",
+    "ServiceRecord",
     "list_startup_items",
+    "parse_sc_query",
+    "parse_sc_start_type",
+    "parse_service_records",
 ]
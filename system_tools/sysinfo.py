@@ -8,13 +8,16 @@ from __future__ import annotations
 import json
 import os
 import platform
-import subprocess
+import threading
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from enum import Enum
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
 
 from . import get_logger
 from .base import SystemTool, ToolMetadata
+from .powershell import PowerShellPool
 
 _LOGGER = get_logger(__name__)
 
@@ -244,6 +247,356 @@ class SystemSummary:
         }
 
 
+# PowerShell producing the data for each section. Each script emits plain
+# objects; callers combine them and convert to JSON once.
+_SECTION_SCRIPTS: Dict[str, str] = {
+    "computer": r'''
+        $CS = Get-CimInstance Win32_ComputerSystem
+        @{
+            Domain = $CS.Domain
+            Manufacturer = $CS.Manufacturer
+            Model = $CS.Model
+        }
+    ''',
+    "windows": r'''
+        $OS = Get-CimInstance Win32_OperatingSystem
+        @{
+            Version = $OS.Version
+            Build = $OS.BuildNumber
+            Edition = $OS.Caption
+            ProductId = $OS.SerialNumber
+            InstallDate = $OS.InstallDate.ToString("o")
+            LastBoot = $OS.LastBootUpTime.ToString("o")
+            Owner = $OS.RegisteredUser
+        }
+    ''',
+    "cpu": r'''
+        $CPU = Get-CimInstance Win32_Processor
+        @{
+            Name = $CPU.Name
+            Manufacturer = $CPU.Manufacturer
+            Cores = $CPU.NumberOfCores
+            Logical = $CPU.NumberOfLogicalProcessors
+            MaxClock = $CPU.MaxClockSpeed
+        }
+    ''',
+    "cpu_load": r'''
+        @{
+            Usage = (Get-CimInstance Win32_Processor | Measure-Object -Property LoadPercentage -Average).Average
+        }
+    ''',
+    "memory": r'''
+        $OS = Get-CimInstance Win32_OperatingSystem
+        $Mem = Get-CimInstance Win32_PhysicalMemory
+        $MemArray = Get-CimInstance Win32_PhysicalMemoryArray
+        @{
+            Total = $OS.TotalVisibleMemorySize * 1024
+            SlotsUsed = ($Mem | Measure-Object).Count
+            SlotsTotal = $MemArray.MemoryDevices
+            Speed = ($Mem | Select-Object -First 1).Speed
+            Type = ($Mem | Select-Object -First 1).MemoryType
+        }
+    ''',
+    "memory_usage": r'''
+        $OS = Get-CimInstance Win32_OperatingSystem
+        @{
+            Available = $OS.FreePhysicalMemory * 1024
+        }
+    ''',
+    "gpus": r'''
+        Get-CimInstance Win32_VideoController | ForEach-Object {
+            @{
+                Name = $_.Name
+                Manufacturer = $_.AdapterCompatibility
+                DriverVersion = $_.DriverVersion
+                DriverDate = if ($_.DriverDate) { $_.DriverDate.ToString("o") } else { $null }
+                VideoMemory = [math]::Round($_.AdapterRAM / 1MB, 0)
+                Resolution = "$($_.CurrentHorizontalResolution)x$($_.CurrentVerticalResolution)"
+            }
+        }
+    ''',
+    "storage": r'''
+        Get-CimInstance Win32_DiskDrive | ForEach-Object {
+            @{
+                Name = $_.DeviceID
+                Model = $_.Model
+                MediaType = $_.MediaType
+                Size = $_.Size
+                Interface = $_.InterfaceType
+                Status = $_.Status
+                Partitions = $_.Partitions
+            }
+        }
+    ''',
+    "network": r'''
+        Get-NetAdapter | Where-Object { $_.Status -eq 'Up' } | ForEach-Object {
+            $IPConfig = Get-NetIPAddress -InterfaceIndex $_.ifIndex -AddressFamily IPv4 -ErrorAction SilentlyContinue
+            $Gateway = Get-NetRoute -InterfaceIndex $_.ifIndex -DestinationPrefix "0.0.0.0/0" -ErrorAction SilentlyContinue
+            @{
+                Name = $_.Name
+                Description = $_.InterfaceDescription
+                MacAddress = $_.MacAddress
+                Status = $_.Status
+                SpeedMbps = [math]::Round($_.LinkSpeed / 1000000, 0)
+                IPAddresses = @($IPConfig.IPAddress)
+                Gateway = if ($Gateway) { $Gateway.NextHop } else { $null }
+            }
+        }
+    ''',
+    "bios": r'''
+        $BIOS = Get-CimInstance Win32_BIOS
+        @{
+            Manufacturer = $BIOS.Manufacturer
+            Version = $BIOS.SMBIOSBIOSVersion
+            ReleaseDate = if ($BIOS.ReleaseDate) { $BIOS.ReleaseDate.ToString("o") } else { $null }
+            Serial = $BIOS.SerialNumber
+            IsUEFI = (Test-Path "HKLM:\System\CurrentControlSet\Control\SecureBoot\State")
+        }
+    ''',
+}
+
+# Sections whose script emits one object per device
+_LIST_SECTIONS = {"gpus", "storage", "network"}
+
+# Every section, in the order get_system_summary uses them
+SUMMARY_SECTIONS = ("computer", "windows", "cpu", "memory", "gpus", "storage", "network", "bios")
+
+# Summary sections assembled from several queried sections. Counters that
+# change constantly are split out so they can be refreshed on their own.
+_SECTION_PARTS: Dict[str, Tuple[str, ...]] = {
+    "cpu": ("cpu", "cpu_load"),
+    "memory": ("memory", "memory_usage"),
+}
+
+# Seconds allowed for one section; a batch gets this plus a share per extra section
+_SECTION_TIMEOUT = 15
+_BATCH_TIMEOUT_PER_SECTION = 5
+
+
+def build_section_script(sections: Sequence[str]) -> str:
+    """Build one PowerShell script that collects several sections.
+
+    The script prints a single JSON object keyed by section name. A section
+    that fails is reported as ``null`` without affecting the others.
+
+    Parameters
+    ----------
+    sections : sequence of str
+        Section names from :data:`SUMMARY_SECTIONS`
+
+    Returns
+    -------
+    str
+        PowerShell source
+    """
+    parts = ["$Sections = [ordered]@{}"]
+    for name in sections:
+        body = _SECTION_SCRIPTS[name]
+        value = f"@(& {{{body}}})" if name in _LIST_SECTIONS else f"& {{{body}}}"
+        parts.append(f"try {{ $Sections['{name}'] = {value} }} catch {{ $Sections['{name}'] = $null }}")
+    parts.append("$Sections | ConvertTo-Json -Depth 5 -Compress")
+    return "\n".join(parts)
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+
+
+def _as_list(data: Any) -> List[Dict[str, Any]]:
+    if isinstance(data, list):
+        return data
+    return [data] if data else []
+
+
+class Volatility(Enum):
+    """How often a section of system information changes."""
+    
+    STATIC = "static"
+    SLOW = "slow"
+    LIVE = "live"
+
+
+# How often each queried section changes
+SECTION_VOLATILITY: Dict[str, Volatility] = {
+    "computer": Volatility.STATIC,
+    "windows": Volatility.STATIC,
+    "cpu": Volatility.STATIC,
+    "memory": Volatility.STATIC,
+    "bios": Volatility.STATIC,
+    "gpus": Volatility.SLOW,
+    "storage": Volatility.SLOW,
+    "network": Volatility.SLOW,
+    "cpu_load": Volatility.LIVE,
+    "memory_usage": Volatility.LIVE,
+}
+
+# Seconds a cached section stays fresh; None keeps it until the next boot
+DEFAULT_TTLS: Dict[Volatility, Optional[float]] = {
+    Volatility.STATIC: None,
+    Volatility.SLOW: 300.0,
+    Volatility.LIVE: 5.0,
+}
+
+# Boot times closer than this are treated as the same boot
+_BOOT_TIME_TOLERANCE = 60.0
+
+
+def current_boot_time() -> Optional[float]:
+    """Return the time of the last boot as a Unix timestamp, if known."""
+    if platform.system() == "Windows":
+        try:
+            import ctypes
+            
+            tick_count = ctypes.windll.kernel32.GetTickCount64
+            tick_count.restype = ctypes.c_ulonglong
+            return time.time() - tick_count() / 1000
+        except Exception:
+            return None
+    
+    try:
+        with open("/proc/stat", "r") as f:
+            for line in f:
+                if line.startswith("btime "):
+                    return float(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+class SystemInfoCache:
+    """Per-section cache of raw system information.
+    
+    Each section expires according to its :class:`Volatility`: static
+    sections are kept until the machine reboots, slow ones for minutes and
+    live counters for seconds. Entries are persisted to a JSON file and
+    discarded when the boot time recorded with them no longer matches.
+    
+    Parameters
+    ----------
+    path : str, optional
+        JSON file to persist to; None keeps the cache in memory only
+    ttls : dict, optional
+        Overrides for :data:`DEFAULT_TTLS`
+    clock : callable
+        Returns the current Unix time
+    boot_time : callable
+        Returns the last boot time, or None if unknown
+    """
+    
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttls: Optional[Dict[Volatility, Optional[float]]] = None,
+        clock: Callable[[], float] = time.time,
+        boot_time: Callable[[], Optional[float]] = current_boot_time,
+    ):
+        self.path = path
+        self.ttls = dict(DEFAULT_TTLS)
+        self.ttls.update(ttls or {})
+        self._clock = clock
+        self._boot_time = boot_time()
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._load()
+    
+    @staticmethod
+    def default_path() -> str:
+        """Cache file location, overridable with ``BETTER11_SYSINFO_CACHE``."""
+        return os.environ.get("BETTER11_SYSINFO_CACHE") or os.path.join(
+            os.path.expanduser("~"), ".better11", "sysinfo_cache.json"
+        )
+    
+    def _load(self) -> None:
+        # Without a boot time, static entries from disk could predate a reboot
+        if not self.path or self._boot_time is None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        stored_boot = stored.get("boot_time")
+        if stored_boot is None or abs(stored_boot - self._boot_time) > _BOOT_TIME_TOLERANCE:
+            _LOGGER.debug("Boot time changed; discarding cached system information")
+            return
+        self._entries = {
+            name: entry for name, entry in stored.get("sections", {}).items()
+            if name in SECTION_VOLATILITY
+        }
+    
+    def _save(self) -> None:
+        if not self.path or self._boot_time is None:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            temp_path = self.path + ".tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({"boot_time": self._boot_time, "sections": self._entries}, f)
+            os.replace(temp_path, self.path)
+        except OSError as exc:
+            _LOGGER.debug("Could not save system information cache: %s", exc)
+    
+    def is_fresh(self, section: str) -> bool:
+        """Whether a section is cached and within its TTL."""
+        with self._lock:
+            entry = self._entries.get(section)
+            if entry is None:
+                return False
+            ttl = self.ttls[SECTION_VOLATILITY[section]]
+            return ttl is None or self._clock() - entry["fetched_at"] < ttl
+    
+    def get(self, section: str, allow_stale: bool = False) -> Optional[Any]:
+        """Return cached data for a section.
+        
+        Parameters
+        ----------
+        section : str
+            Section name
+        allow_stale : bool
+            Return data past its TTL instead of None
+        
+        Returns
+        -------
+        Any, optional
+            The cached data, or None if missing or expired
+        """
+        if not allow_stale and not self.is_fresh(section):
+            return None
+        with self._lock:
+            entry = self._entries.get(section)
+            return entry["data"] if entry else None
+    
+    def contains(self, section: str) -> bool:
+        """Whether a section has been cached since boot, fresh or not."""
+        with self._lock:
+            return section in self._entries
+    
+    def update(self, sections: Dict[str, Any]) -> None:
+        """Store freshly queried sections; None values are not cached."""
+        now = self._clock()
+        with self._lock:
+            for name, data in sections.items():
+                if data is not None and name in SECTION_VOLATILITY:
+                    self._entries[name] = {"fetched_at": now, "data": data}
+            self._save()
+    
+    def invalidate(self, sections: Optional[Sequence[str]] = None) -> None:
+        """Drop the given sections, or everything."""
+        with self._lock:
+            if sections is None:
+                self._entries.clear()
+            else:
+                for name in sections:
+                    self._entries.pop(name, None)
+            self._save()
+
+
 class SystemInfoManager(SystemTool):
     """Gather comprehensive system information.
     
@@ -256,11 +609,29 @@ class SystemInfoManager(SystemTool):
         Configuration dictionary
     dry_run : bool
         If True, return cached/mock data
+    powershell : PowerShellPool, optional
+        Host pool used for queries
+    cache : SystemInfoCache, optional
+        Section cache; defaults to one persisted at ``config["cache_path"]``
+        or :meth:`SystemInfoCache.default_path`
     """
     
-    def __init__(self, config: Optional[dict] = None, dry_run: bool = False):
-        super().__init__(config, dry_run)
-        self._cache: Dict[str, Any] = {}
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        dry_run: bool = False,
+        powershell: Optional[PowerShellPool] = None,
+        cache: Optional[SystemInfoCache] = None,
+    ):
+        super().__init__(config, dry_run, powershell)
+        self._cache = cache or SystemInfoCache(
+            self.config.get("cache_path") or SystemInfoCache.default_path()
+        )
+    
+    @property
+    def cache(self) -> SystemInfoCache:
+        """Section cache shared by every query of this manager."""
+        return self._cache
     
     def get_metadata(self) -> ToolMetadata:
         """Return tool metadata."""
@@ -284,9 +655,84 @@ class SystemInfoManager(SystemTool):
             _LOGGER.info("System: %s %s", summary.manufacturer, summary.model)
         return True
     
-    def get_system_summary(self) -> Optional[SystemSummary]:
+    def query_sections(self, sections: Sequence[str], allow_stale: bool = False) -> Dict[str, Any]:
+        """Collect raw data for several sections in one PowerShell call.
+        
+        Sections still fresh in the cache are not queried again.
+        
+        Parameters
+        ----------
+        sections : sequence of str
+            Queried section names, as in :data:`SECTION_VOLATILITY`
+        allow_stale : bool
+            Serve static and slow sections cached since boot, even past
+            their TTL; live counters are always re-queried once expired
+        
+        Returns
+        -------
+        Dict[str, Any]
+            Decoded JSON per section. Sections that could not be collected
+            (or any section on non-Windows hosts) are missing or ``None``.
+        """
+        found: Dict[str, Any] = {}
+        missing = []
+        for name in sections:
+            stale_ok = allow_stale and SECTION_VOLATILITY.get(name) is not Volatility.LIVE
+            data = self._cache.get(name, allow_stale=stale_ok)
+            if data is None:
+                missing.append(name)
+            else:
+                found[name] = data
+        
+        if missing and platform.system() == "Windows":
+            timeout = _SECTION_TIMEOUT + _BATCH_TIMEOUT_PER_SECTION * (len(missing) - 1)
+            try:
+                result = self.run_powershell(build_section_script(missing), timeout=timeout)
+                if result.returncode == 0 and result.stdout.strip():
+                    data = json.loads(result.stdout)
+                    if isinstance(data, dict):
+                        self._cache.update(data)
+                        found.update(data)
+            except Exception as exc:
+                _LOGGER.debug("System info query for %s failed: %s", ", ".join(missing), exc)
+        return found
+    
+    def _build_section(self, name: str, data: Dict[str, Any]) -> Any:
+        """Parse one summary section from queried data.
+        
+        Falls back to local defaults on missing or malformed data.
+        """
+        parts = _SECTION_PARTS.get(name, (name,))
+        if len(parts) == 1:
+            raw = data.get(name)
+        else:
+            raw = {}
+            for part in parts:
+                raw.update(data.get(part) or {})
+            raw = raw or None
+        
+        parse = getattr(self, f"_parse_{name}")
+        try:
+            return parse(raw)
+        except Exception as exc:
+            _LOGGER.debug("Could not parse %s info: %s", name, exc)
+            return parse(None)
+    
+    def _get_section(self, name: str) -> Any:
+        return self._build_section(name, self.query_sections(_SECTION_PARTS.get(name, (name,))))
+    
+    def get_system_summary(self, allow_stale: bool = False) -> Optional[SystemSummary]:
         """Get complete system summary.
         
+        Every section that is not cached is collected by a single
+        PowerShell invocation.
+        
+        Parameters
+        ----------
+        allow_stale : bool
+            Use static and slow sections cached since boot, even past
+            their TTL; live counters are still refreshed
+        
         Returns
         -------
         SystemSummary, optional
@@ -295,49 +741,24 @@ class SystemInfoManager(SystemTool):
         _LOGGER.info("Gathering system information...")
         
         try:
-            windows = self.get_windows_info()
-            cpu = self.get_cpu_info()
-            memory = self.get_memory_info()
-            gpus = self.get_gpu_info()
-            storage = self.get_storage_info()
-            network = self.get_network_info()
-            bios = self.get_bios_info()
-            
-            # Get computer/system info
-            computer_name = platform.node()
-            domain = ""
-            manufacturer = ""
-            model = ""
-            system_type = platform.machine()
-            
-            if platform.system() == "Windows":
-                try:
-                    result = subprocess.run(
-                        ["powershell", "-NoProfile", "-Command",
-                         "Get-CimInstance Win32_ComputerSystem | Select-Object Domain, Manufacturer, Model | ConvertTo-Json"],
-                        capture_output=True, text=True, timeout=10
-                    )
-                    if result.returncode == 0:
-                        data = json.loads(result.stdout)
-                        domain = data.get("Domain", "")
-                        manufacturer = data.get("Manufacturer", "")
-                        model = data.get("Model", "")
-                except Exception:
-                    pass
+            queried = [part for name in SUMMARY_SECTIONS for part in _SECTION_PARTS.get(name, (name,))]
+            data = self.query_sections(queried, allow_stale=allow_stale)
+            sections = {name: self._build_section(name, data) for name in SUMMARY_SECTIONS}
+            computer = sections["computer"]
             
             return SystemSummary(
-                computer_name=computer_name,
-                domain=domain,
-                manufacturer=manufacturer,
-                model=model,
-                system_type=system_type,
-                windows=windows,
-                cpu=cpu,
-                memory=memory,
-                gpus=gpus,
-                storage=storage,
-                network=network,
-                bios=bios
+                computer_name=platform.node(),
+                domain=computer["domain"],
+                manufacturer=computer["manufacturer"],
+                model=computer["model"],
+                system_type=platform.machine(),
+                windows=sections["windows"],
+                cpu=sections["cpu"],
+                memory=sections["memory"],
+                gpus=sections["gpus"],
+                storage=sections["storage"],
+                network=sections["network"],
+                bios=sections["bios"]
             )
         
         except Exception as exc:
@@ -352,71 +773,7 @@ class SystemInfoManager(SystemTool):
         WindowsInfo
             Windows information
         """
-        version = platform.version()
-        build = platform.release()
-        edition = ""
-        product_id = ""
-        install_date = None
-        last_boot = None
-        uptime = 0.0
-        owner = ""
-        system_root = os.environ.get("SystemRoot", "C:\\Windows")
-        
-        if platform.system() == "Windows":
-            try:
-                ps_script = '''
-                $OS = Get-CimInstance Win32_OperatingSystem
-                @{
-                    Version = $OS.Version
-                    Build = $OS.BuildNumber
-                    Edition = $OS.Caption
-                    ProductId = $OS.SerialNumber
-                    InstallDate = $OS.InstallDate.ToString("o")
-                    LastBoot = $OS.LastBootUpTime.ToString("o")
-                    Owner = $OS.RegisteredUser
-                } | ConvertTo-Json
-                '''
-                
-                result = subprocess.run(
-                    ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=15
-                )
-                
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    version = data.get("Version", version)
-                    build = data.get("Build", build)
-                    edition = data.get("Edition", "")
-                    product_id = data.get("ProductId", "")
-                    owner = data.get("Owner", "")
-                    
-                    if data.get("InstallDate"):
-                        try:
-                            install_date = datetime.fromisoformat(data["InstallDate"].replace("Z", "+00:00"))
-                        except ValueError:
-                            pass
-                    
-                    if data.get("LastBoot"):
-                        try:
-                            last_boot = datetime.fromisoformat(data["LastBoot"].replace("Z", "+00:00"))
-                            uptime = (datetime.now(last_boot.tzinfo) - last_boot).total_seconds() / 3600
-                        except ValueError:
-                            pass
-            except Exception:
-                pass
-        
-        return WindowsInfo(
-            version=version,
-            build=build,
-            edition=edition,
-            product_id=product_id,
-            install_date=install_date,
-            last_boot=last_boot,
-            uptime_hours=uptime,
-            registered_owner=owner,
-            system_root=system_root,
-            windows_directory=system_root
-        )
+        return self._get_section("windows")
     
     def get_cpu_info(self) -> CPUInfo:
         """Get CPU information.
@@ -426,53 +783,7 @@ class SystemInfoManager(SystemTool):
         CPUInfo
             CPU information
         """
-        name = platform.processor() or "Unknown CPU"
-        manufacturer = ""
-        cores = os.cpu_count() or 1
-        logical = cores
-        max_clock = 0
-        arch = platform.machine()
-        usage = 0.0
-        
-        if platform.system() == "Windows":
-            try:
-                ps_script = '''
-                $CPU = Get-CimInstance Win32_Processor
-                @{
-                    Name = $CPU.Name
-                    Manufacturer = $CPU.Manufacturer
-                    Cores = $CPU.NumberOfCores
-                    Logical = $CPU.NumberOfLogicalProcessors
-                    MaxClock = $CPU.MaxClockSpeed
-                    Usage = $CPU.LoadPercentage
-                } | ConvertTo-Json
-                '''
-                
-                result = subprocess.run(
-                    ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=15
-                )
-                
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    name = data.get("Name", name).strip()
-                    manufacturer = data.get("Manufacturer", "")
-                    cores = data.get("Cores", cores)
-                    logical = data.get("Logical", logical)
-                    max_clock = data.get("MaxClock", 0)
-                    usage = float(data.get("Usage", 0) or 0)
-            except Exception:
-                pass
-        
-        return CPUInfo(
-            name=name,
-            manufacturer=manufacturer,
-            cores=cores,
-            logical_processors=logical,
-            max_clock_mhz=max_clock,
-            architecture=arch,
-            current_usage=usage
-        )
+        return self._get_section("cpu")
     
     def get_memory_info(self) -> MemoryInfo:
         """Get memory information.
@@ -482,63 +793,7 @@ class SystemInfoManager(SystemTool):
         MemoryInfo
             Memory information
         """
-        total = 0
-        available = 0
-        used = 0
-        usage = 0.0
-        slots_used = 0
-        slots_total = 0
-        speed = 0
-        mem_type = ""
-        
-        if platform.system() == "Windows":
-            try:
-                ps_script = '''
-                $OS = Get-CimInstance Win32_OperatingSystem
-                $Mem = Get-CimInstance Win32_PhysicalMemory
-                $MemArray = Get-CimInstance Win32_PhysicalMemoryArray
-                
-                @{
-                    Total = $OS.TotalVisibleMemorySize * 1024
-                    Available = $OS.FreePhysicalMemory * 1024
-                    SlotsUsed = ($Mem | Measure-Object).Count
-                    SlotsTotal = $MemArray.MemoryDevices
-                    Speed = ($Mem | Select-Object -First 1).Speed
-                    Type = ($Mem | Select-Object -First 1).MemoryType
-                } | ConvertTo-Json
-                '''
-                
-                result = subprocess.run(
-                    ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=15
-                )
-                
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    total = int(data.get("Total", 0))
-                    available = int(data.get("Available", 0))
-                    used = total - available
-                    usage = (used / total * 100) if total > 0 else 0
-                    slots_used = data.get("SlotsUsed", 0)
-                    slots_total = data.get("SlotsTotal", 0)
-                    speed = data.get("Speed", 0)
-                    
-                    # Map memory type codes
-                    type_map = {24: "DDR3", 26: "DDR4", 30: "DDR5"}
-                    mem_type = type_map.get(data.get("Type", 0), "Unknown")
-            except Exception:
-                pass
-        
-        return MemoryInfo(
-            total_bytes=total,
-            available_bytes=available,
-            used_bytes=used,
-            usage_percent=usage,
-            slots_used=slots_used,
-            slots_total=slots_total,
-            speed_mhz=speed,
-            type_name=mem_type
-        )
+        return self._get_section("memory")
     
     def get_gpu_info(self) -> List[GPUInfo]:
         """Get graphics card information.
@@ -548,53 +803,7 @@ class SystemInfoManager(SystemTool):
         List[GPUInfo]
             List of graphics cards
         """
-        gpus = []
-        
-        if platform.system() == "Windows":
-            try:
-                ps_script = '''
-                Get-CimInstance Win32_VideoController | ForEach-Object {
-                    @{
-                        Name = $_.Name
-                        Manufacturer = $_.AdapterCompatibility
-                        DriverVersion = $_.DriverVersion
-                        DriverDate = if ($_.DriverDate) { $_.DriverDate.ToString("o") } else { $null }
-                        VideoMemory = [math]::Round($_.AdapterRAM / 1MB, 0)
-                        Resolution = "$($_.CurrentHorizontalResolution)x$($_.CurrentVerticalResolution)"
-                    }
-                } | ConvertTo-Json
-                '''
-                
-                result = subprocess.run(
-                    ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=15
-                )
-                
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    if not isinstance(data, list):
-                        data = [data] if data else []
-                    
-                    for item in data:
-                        driver_date = None
-                        if item.get("DriverDate"):
-                            try:
-                                driver_date = datetime.fromisoformat(item["DriverDate"].replace("Z", "+00:00"))
-                            except ValueError:
-                                pass
-                        
-                        gpus.append(GPUInfo(
-                            name=item.get("Name", "Unknown"),
-                            manufacturer=item.get("Manufacturer", ""),
-                            driver_version=item.get("DriverVersion", ""),
-                            driver_date=driver_date,
-                            video_memory_mb=item.get("VideoMemory", 0),
-                            current_resolution=item.get("Resolution", "")
-                        ))
-            except Exception:
-                pass
-        
-        return gpus
+        return self._get_section("gpus")
     
     def get_storage_info(self) -> List[StorageInfo]:
         """Get storage device information.
@@ -604,58 +813,7 @@ class SystemInfoManager(SystemTool):
         List[StorageInfo]
             List of storage devices
         """
-        storage = []
-        
-        if platform.system() == "Windows":
-            try:
-                ps_script = '''
-                Get-CimInstance Win32_DiskDrive | ForEach-Object {
-                    @{
-                        Name = $_.DeviceID
-                        Model = $_.Model
-                        MediaType = $_.MediaType
-                        Size = $_.Size
-                        Interface = $_.InterfaceType
-                        Status = $_.Status
-                        Partitions = $_.Partitions
-                    }
-                } | ConvertTo-Json
-                '''
-                
-                result = subprocess.run(
-                    ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=15
-                )
-                
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    if not isinstance(data, list):
-                        data = [data] if data else []
-                    
-                    for item in data:
-                        # Determine media type
-                        media_type = item.get("MediaType", "Unknown")
-                        model = item.get("Model", "").lower()
-                        if "nvme" in model:
-                            media_type = "NVMe"
-                        elif "ssd" in model or media_type == "Solid state drive":
-                            media_type = "SSD"
-                        elif media_type in ("Fixed hard disk media", ""):
-                            media_type = "HDD"
-                        
-                        storage.append(StorageInfo(
-                            name=item.get("Name", ""),
-                            model=item.get("Model", "Unknown"),
-                            media_type=media_type,
-                            size_bytes=int(item.get("Size", 0) or 0),
-                            interface_type=item.get("Interface", ""),
-                            status=item.get("Status", ""),
-                            partitions=item.get("Partitions", 0)
-                        ))
-            except Exception:
-                pass
-        
-        return storage
+        return self._get_section("storage")
     
     def get_network_info(self) -> List[NetworkAdapterInfo]:
         """Get network adapter information.
@@ -665,51 +823,7 @@ class SystemInfoManager(SystemTool):
         List[NetworkAdapterInfo]
             List of network adapters
         """
-        adapters = []
-        
-        if platform.system() == "Windows":
-            try:
-                ps_script = '''
-                Get-NetAdapter | Where-Object { $_.Status -eq 'Up' } | ForEach-Object {
-                    $IPConfig = Get-NetIPAddress -InterfaceIndex $_.ifIndex -AddressFamily IPv4 -ErrorAction SilentlyContinue
-                    $Gateway = Get-NetRoute -InterfaceIndex $_.ifIndex -DestinationPrefix "0.0.0.0/0" -ErrorAction SilentlyContinue
-                    
-                    @{
-                        Name = $_.Name
-                        Description = $_.InterfaceDescription
-                        MacAddress = $_.MacAddress
-                        Status = $_.Status
-                        SpeedMbps = [math]::Round($_.LinkSpeed / 1000000, 0)
-                        IPAddresses = @($IPConfig.IPAddress)
-                        Gateway = if ($Gateway) { $Gateway.NextHop } else { $null }
-                    }
-                } | ConvertTo-Json
-                '''
-                
-                result = subprocess.run(
-                    ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=15
-                )
-                
-                if result.returncode == 0 and result.stdout.strip():
-                    data = json.loads(result.stdout)
-                    if not isinstance(data, list):
-                        data = [data] if data else []
-                    
-                    for item in data:
-                        adapters.append(NetworkAdapterInfo(
-                            name=item.get("Name", ""),
-                            description=item.get("Description", ""),
-                            mac_address=item.get("MacAddress", ""),
-                            connection_status=item.get("Status", ""),
-                            speed_mbps=item.get("SpeedMbps", 0),
-                            ip_addresses=item.get("IPAddresses", []),
-                            gateway=item.get("Gateway")
-                        ))
-            except Exception:
-                pass
-        
-        return adapters
+        return self._get_section("network")
     
     def get_bios_info(self) -> BIOSInfo:
         """Get BIOS/UEFI information.
@@ -719,52 +833,136 @@ class SystemInfoManager(SystemTool):
         BIOSInfo
             BIOS information
         """
-        manufacturer = ""
-        version = ""
-        release_date = None
-        serial = ""
-        is_uefi = False
+        return self._get_section("bios")
+    
+    @staticmethod
+    def _parse_computer(data: Optional[Dict[str, Any]]) -> Dict[str, str]:
+        data = data or {}
+        return {
+            "domain": data.get("Domain") or "",
+            "manufacturer": data.get("Manufacturer") or "",
+            "model": data.get("Model") or "",
+        }
+    
+    @staticmethod
+    def _parse_windows(data: Optional[Dict[str, Any]]) -> WindowsInfo:
+        data = data or {}
+        system_root = os.environ.get("SystemRoot", "C:\\Windows")
+        last_boot = _parse_datetime(data.get("LastBoot"))
+        uptime = 0.0
+        if last_boot:
+            uptime = (datetime.now(last_boot.tzinfo) - last_boot).total_seconds() / 3600
         
-        if platform.system() == "Windows":
-            try:
-                # Use raw string to avoid escape sequence warnings
-                ps_script = r'''
-                $BIOS = Get-CimInstance Win32_BIOS
-                @{
-                    Manufacturer = $BIOS.Manufacturer
-                    Version = $BIOS.SMBIOSBIOSVersion
-                    ReleaseDate = if ($BIOS.ReleaseDate) { $BIOS.ReleaseDate.ToString("o") } else { $null }
-                    Serial = $BIOS.SerialNumber
-                    IsUEFI = (Test-Path "HKLM:\System\CurrentControlSet\Control\SecureBoot\State")
-                } | ConvertTo-Json
-                '''
-                
-                result = subprocess.run(
-                    ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                    capture_output=True, text=True, timeout=15
-                )
-                
-                if result.returncode == 0:
-                    data = json.loads(result.stdout)
-                    manufacturer = data.get("Manufacturer", "")
-                    version = data.get("Version", "")
-                    serial = data.get("Serial", "")
-                    is_uefi = data.get("IsUEFI", False)
-                    
-                    if data.get("ReleaseDate"):
-                        try:
-                            release_date = datetime.fromisoformat(data["ReleaseDate"].replace("Z", "+00:00"))
-                        except ValueError:
-                            pass
-            except Exception:
-                pass
+        return WindowsInfo(
+            version=data.get("Version", platform.version()),
+            build=data.get("Build", platform.release()),
+            edition=data.get("Edition", ""),
+            product_id=data.get("ProductId", ""),
+            install_date=_parse_datetime(data.get("InstallDate")),
+            last_boot=last_boot,
+            uptime_hours=uptime,
+            registered_owner=data.get("Owner", ""),
+            system_root=system_root,
+            windows_directory=system_root
+        )
+    
+    @staticmethod
+    def _parse_cpu(data: Optional[Dict[str, Any]]) -> CPUInfo:
+        data = data or {}
+        cores = os.cpu_count() or 1
+        return CPUInfo(
+            name=(data.get("Name") or platform.processor() or "Unknown CPU").strip(),
+            manufacturer=data.get("Manufacturer", ""),
+            cores=data.get("Cores", cores),
+            logical_processors=data.get("Logical", cores),
+            max_clock_mhz=data.get("MaxClock", 0),
+            architecture=platform.machine(),
+            current_usage=float(data.get("Usage", 0) or 0)
+        )
+    
+    @staticmethod
+    def _parse_memory(data: Optional[Dict[str, Any]]) -> MemoryInfo:
+        data = data or {}
+        total = int(data.get("Total", 0) or 0)
+        available = int(data.get("Available", 0) or 0)
+        used = total - available
+        # Map memory type codes
+        type_map = {24: "DDR3", 26: "DDR4", 30: "DDR5"}
         
+        return MemoryInfo(
+            total_bytes=total,
+            available_bytes=available,
+            used_bytes=used,
+            usage_percent=(used / total * 100) if total > 0 else 0.0,
+            slots_used=data.get("SlotsUsed", 0),
+            slots_total=data.get("SlotsTotal", 0),
+            speed_mhz=data.get("Speed", 0),
+            type_name=type_map.get(data.get("Type", 0), "Unknown") if data else ""
+        )
+    
+    @staticmethod
+    def _parse_gpus(data: Any) -> List[GPUInfo]:
+        return [
+            GPUInfo(
+                name=item.get("Name", "Unknown"),
+                manufacturer=item.get("Manufacturer", ""),
+                driver_version=item.get("DriverVersion", ""),
+                driver_date=_parse_datetime(item.get("DriverDate")),
+                video_memory_mb=item.get("VideoMemory", 0),
+                current_resolution=item.get("Resolution", "")
+            )
+            for item in _as_list(data)
+        ]
+    
+    @staticmethod
+    def _parse_storage(data: Any) -> List[StorageInfo]:
+        storage = []
+        for item in _as_list(data):
+            # Determine media type
+            media_type = item.get("MediaType", "Unknown")
+            model = (item.get("Model") or "").lower()
+            if "nvme" in model:
+                media_type = "NVMe"
+            elif "ssd" in model or media_type == "Solid state drive":
+                media_type = "SSD"
+            elif media_type in ("Fixed hard disk media", "", None):
+                media_type = "HDD"
+            
+            storage.append(StorageInfo(
+                name=item.get("Name", ""),
+                model=item.get("Model", "Unknown"),
+                media_type=media_type,
+                size_bytes=int(item.get("Size", 0) or 0),
+                interface_type=item.get("Interface", ""),
+                status=item.get("Status", ""),
+                partitions=item.get("Partitions", 0)
+            ))
+        return storage
+    
+    @staticmethod
+    def _parse_network(data: Any) -> List[NetworkAdapterInfo]:
+        return [
+            NetworkAdapterInfo(
+                name=item.get("Name", ""),
+                description=item.get("Description", ""),
+                mac_address=item.get("MacAddress", ""),
+                connection_status=item.get("Status", ""),
+                speed_mbps=item.get("SpeedMbps", 0),
+                ip_addresses=item.get("IPAddresses") or [],
+                gateway=item.get("Gateway")
+            )
+            for item in _as_list(data)
+        ]
+    
+    @staticmethod
+    def _parse_bios(data: Optional[Dict[str, Any]]) -> BIOSInfo:
+        data = data or {}
         return BIOSInfo(
-            manufacturer=manufacturer,
-            version=version,
-            release_date=release_date,
-            serial_number=serial,
-            is_uefi=is_uefi
+            manufacturer=data.get("Manufacturer", ""),
+            version=data.get("Version", ""),
+            release_date=_parse_datetime(data.get("ReleaseDate")),
+            serial_number=data.get("Serial", ""),
+            is_uefi=data.get("IsUEFI", False)
         )
     
     def export_to_file(self, file_path: str) -> bool:
@@ -796,12 +994,16 @@ class SystemInfoManager(SystemTool):
     def get_quick_summary(self) -> Dict[str, str]:
         """Get a quick human-readable summary.
         
+        Hardware and configuration come from the cache whenever they have
+        been collected since boot; only the live CPU and memory counters
+        are queried again once they expire.
+        
         Returns
         -------
         Dict[str, str]
             Quick summary
         """
-        summary = self.get_system_summary()
+        summary = self.get_system_summary(allow_stale=True)
         if not summary:
             return {}
         
@@ -826,4 +1028,11 @@ __all__ = [
     "BIOSInfo",
     "SystemSummary",
     "SystemInfoManager",
+    "SUMMARY_SECTIONS",
+    "SECTION_VOLATILITY",
+    "DEFAULT_TTLS",
+    "Volatility",
+    "SystemInfoCache",
+    "build_section_script",
+    "current_boot_time",
 ]
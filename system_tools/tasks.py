@@ -15,6 +15,7 @@ from typing import Any, Dict, List, Optional
 
 from . import get_logger
 from .base import SystemTool, ToolMetadata
+from .powershell import PowerShellPool
 
 _LOGGER = get_logger(__name__)
 
@@ -144,8 +145,13 @@ class TaskSchedulerManager(SystemTool):
         "Backup",
     ]
     
-    def __init__(self, config: Optional[dict] = None, dry_run: bool = False):
-        super().__init__(config, dry_run)
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        dry_run: bool = False,
+        powershell: Optional[PowerShellPool] = None,
+    ):
+        super().__init__(config, dry_run, powershell)
     
     def get_metadata(self) -> ToolMetadata:
         """Return tool metadata."""
@@ -220,12 +226,7 @@ class TaskSchedulerManager(SystemTool):
             }} | ConvertTo-Json -Depth 10
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=120
-            )
+            result = self.run_powershell(ps_script, timeout=120)
             
             if result.returncode != 0:
                 _LOGGER.error("Failed to list tasks: %s", result.stderr)
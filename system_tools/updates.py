@@ -15,6 +15,7 @@ from typing import List, Optional
 
 from . import get_logger
 from .base import SystemTool, ToolMetadata
+from .powershell import PowerShellPool
 from .safety import SafetyError, ensure_windows
 
 _LOGGER = get_logger(__name__)
@@ -98,8 +99,13 @@ class WindowsUpdateManager(SystemTool):
     UPDATE_AU_PATH = r"SOFTWARE\Policies\Microsoft\Windows\WindowsUpdate\AU"
     UPDATE_SETTINGS_PATH = r"SOFTWARE\Microsoft\WindowsUpdate\UX\Settings"
     
-    def __init__(self, config: Optional[dict] = None, dry_run: bool = False):
-        super().__init__(config, dry_run)
+    def __init__(
+        self,
+        config: Optional[dict] = None,
+        dry_run: bool = False,
+        powershell: Optional[PowerShellPool] = None,
+    ):
+        super().__init__(config, dry_run, powershell)
     
     def get_metadata(self) -> ToolMetadata:
         """Return tool metadata."""
@@ -202,12 +208,7 @@ class WindowsUpdateManager(SystemTool):
             }
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=120  # Updates check can take a while
-            )
+            result = self.run_powershell(ps_script, timeout=120)  # Updates check can take a while
             
             if result.returncode != 0:
                 _LOGGER.error("Failed to check for updates: %s", result.stderr)
@@ -343,12 +344,7 @@ class WindowsUpdateManager(SystemTool):
             $Result | ConvertTo-Json
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=3600  # Updates can take a long time
-            )
+            result = self.run_powershell(ps_script, timeout=3600)  # Updates can take a long time
             
             if result.returncode != 0:
                 _LOGGER.error("Update installation failed: %s", result.stderr)
@@ -434,12 +430,7 @@ class WindowsUpdateManager(SystemTool):
             Write-Output "Paused"
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = self.run_powershell(ps_script, timeout=30)
             
             if result.returncode == 0:
                 _LOGGER.info("Updates paused until %s", pause_until.strftime("%Y-%m-%d"))
@@ -494,12 +485,7 @@ class WindowsUpdateManager(SystemTool):
             Write-Output "Resumed"
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = self.run_powershell(ps_script, timeout=30)
             
             if result.returncode == 0:
                 _LOGGER.info("Updates resumed successfully")
@@ -566,12 +552,7 @@ class WindowsUpdateManager(SystemTool):
             Write-Output "Active hours set"
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = self.run_powershell(ps_script, timeout=30)
             
             if result.returncode == 0:
                 _LOGGER.info("Active hours set successfully")
@@ -610,12 +591,7 @@ class WindowsUpdateManager(SystemTool):
             @{Start = $Start; End = $End} | ConvertTo-Json
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
+            result = self.run_powershell(ps_script, timeout=10)
             
             if result.returncode == 0:
                 data = json.loads(result.stdout)
@@ -689,12 +665,7 @@ class WindowsUpdateManager(SystemTool):
             $Updates | ConvertTo-Json -Depth 10
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = self.run_powershell(ps_script, timeout=60)
             
             if result.returncode != 0:
                 _LOGGER.error("Failed to get update history: %s", result.stderr)
@@ -844,12 +815,7 @@ class WindowsUpdateManager(SystemTool):
             }}
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            result = self.run_powershell(ps_script, timeout=60)
             
             if result.returncode == 0 and "Hidden" in result.stdout:
                 _LOGGER.info("Update hidden successfully")
@@ -898,12 +864,7 @@ class WindowsUpdateManager(SystemTool):
             $Settings | ConvertTo-Json
             '''
             
-            result = subprocess.run(
-                ["powershell", "-NoProfile", "-ExecutionPolicy", "Bypass", "-Command", ps_script],
-                capture_output=True,
-                text=True,
-                timeout=30
-            )
+            result = self.run_powershell(ps_script, timeout=30)
             
             if result.returncode == 0:
                 data = json.loads(result.stdout)
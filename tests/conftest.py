@@ -44,6 +44,26 @@ def reset_os_name() -> None:
     os.name = _ORIGINAL_OS_NAME
 
 
+@pytest.fixture(autouse=True)
+def isolated_hash_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the shared content-hash cache out of the user's home directory."""
+
+    import better11.hash_cache as hash_cache
+
+    monkeypatch.setenv("BETTER11_HASH_CACHE", str(tmp_path / "hash_cache.db"))
+    monkeypatch.setattr(hash_cache, "_default_cache", None)
+    yield
+    if hash_cache._default_cache is not None:
+        hash_cache._default_cache.close()
+
+
+@pytest.fixture(autouse=True)
+def isolated_sysinfo_cache(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep the persisted system information cache out of the home directory."""
+
+    monkeypatch.setenv("BETTER11_SYSINFO_CACHE", str(tmp_path / "sysinfo_cache.json"))
+
+
 def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
     """Guarantee OS name is restored before pytest teardown utilities run."""
 
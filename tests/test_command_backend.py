@@ -0,0 +1,160 @@
+"""
+Tests for command_backend module
+"""
+
+import sys
+import time
+import asyncio
+from concurrent.futures import CancelledError
+from pathlib import Path
+
+import pytest
+
+from better11.command_backend import (
+    TIMEOUT_RETURNCODE,
+    AsyncioBackend,
+    FakeBackend,
+    Transcript,
+)
+from better11.package_manager import (
+    ChocolateyManager,
+    NPMManager,
+    PackageManager,
+    PipManager,
+    UnifiedPackageManager,
+    WinGetManager,
+)
+
+
+TRANSCRIPTS = Path(__file__).resolve().parent / "fixtures" / "package_manager" / "transcripts"
+
+
+def python(code: str):
+    return [sys.executable, "-c", code]
+
+
+@pytest.fixture
+def backend():
+    backend = AsyncioBackend(max_concurrency=2)
+    yield backend
+    backend.cancel_all()
+
+
+class TestAsyncioBackend:
+    """Tests for the asyncio subprocess backend"""
+
+    def test_captures_output(self, backend):
+        """Test stdout, stderr and return code are captured as text"""
+        result = backend.run(python("import sys; print('out'); print('err', file=sys.stderr); sys.exit(3)"))
+
+        assert result.returncode == 3
+        assert result.stdout == "out\n"
+        assert result.stderr == "err\n"
+
+    def test_streams_lines(self, backend):
+        """Test lines reach the callback as they are written"""
+        lines = []
+        result = backend.run(python("print('one'); print('two')"), on_line=lambda name, line: lines.append((name, line)))
+
+        assert lines == [("stdout", "one"), ("stdout", "two")]
+        assert result.stdout == "one\ntwo\n"
+
+    def test_timeout_kills_process(self, backend):
+        """Test a hung command is killed and reported"""
+        start = time.perf_counter()
+        result = backend.run(python("import time; print('started', flush=True); time.sleep(30)"), timeout=0.5)
+
+        assert result.returncode == TIMEOUT_RETURNCODE
+        assert result.stdout == "started\n"
+        assert "Timed out" in result.stderr
+        assert time.perf_counter() - start < 5
+
+    def test_cancel(self, backend):
+        """Test cancelling the future stops the command"""
+        future = backend.submit(python("import time; time.sleep(30)"))
+        time.sleep(0.3)
+        future.cancel()
+
+        with pytest.raises(CancelledError):
+            future.result(timeout=5)
+
+    def test_concurrency_is_bounded(self, backend):
+        """Test no more than max_concurrency processes run at once"""
+        start = time.perf_counter()
+        futures = [backend.submit(python("import time; time.sleep(0.4)")) for _ in range(4)]
+        for future in futures:
+            assert future.result().returncode == 0
+
+        assert time.perf_counter() - start >= 0.8
+
+    def test_missing_program(self, backend):
+        """Test a program that does not exist returns an error result"""
+        assert backend.run(["definitely-not-a-real-program-b11"]).returncode != 0
+
+    def test_run_async(self, backend):
+        """Test commands can be awaited from another event loop"""
+        async def main():
+            return await asyncio.gather(*(backend.run_async(python(f"print({i})")) for i in range(3)))
+
+        assert [r.stdout for r in asyncio.run(main())] == ["0\n", "1\n", "2\n"]
+
+
+class TestFakeBackend:
+    """Tests for transcript replay"""
+
+    def test_prefix_match_and_missing(self):
+        """Test commands match the longest recorded prefix"""
+        backend = FakeBackend([
+            Transcript(["tool", "list"], stdout="generic\n"),
+            Transcript(["tool", "list", "--all"], stdout="all\n"),
+        ])
+
+        assert backend.run(["tool", "list", "--all"]).stdout == "all\n"
+        assert backend.run(["tool", "list", "-x"]).stdout == "generic\n"
+        assert backend.run(["other"]).returncode == 127
+        assert backend.calls[-1] == ["other"]
+
+    def test_timeout(self):
+        """Test transcripts slower than the timeout time out"""
+        backend = FakeBackend([Transcript(["slow"], stdout="done\n", duration=5)])
+
+        assert backend.run(["slow"], timeout=0.05).returncode == TIMEOUT_RETURNCODE
+
+    def test_every_manager_runs_on_recorded_transcripts(self, monkeypatch):
+        """Test each package manager class lists packages from recordings"""
+        backend = FakeBackend.from_directory(str(TRANSCRIPTS))
+        monkeypatch.setattr("better11.package_manager.shutil.which", lambda name: f"/usr/bin/{name}")
+
+        managers = [
+            WinGetManager(backend=backend),
+            ChocolateyManager(backend=backend),
+            NPMManager(backend=backend),
+            PipManager(python_exe="python", backend=backend),
+        ]
+        installed = {m.manager_type: [p.package_id for p in m.list_installed()] for m in managers}
+
+        assert all(m.is_available() for m in managers)
+        assert installed[PackageManager.WINGET][0] == "Microsoft.VisualStudioCode"
+        assert "git" in installed[PackageManager.CHOCOLATEY]
+        assert installed[PackageManager.NPM] == ["npm", "typescript"]
+        assert installed[PackageManager.PIP] == ["requests", "rich"]
+        assert [p.package_id for p in managers[0].search("python")][0] == "Python.Python.3.12"
+
+    def test_unified_fan_out_over_transcripts(self, tmp_path, monkeypatch):
+        """Test the unified manager can be benchmarked against recordings"""
+        backend = FakeBackend.from_directory(str(TRANSCRIPTS))
+        monkeypatch.setattr("better11.package_manager.shutil.which", lambda name: f"/usr/bin/{name}")
+        unified = UnifiedPackageManager(cache_dir=str(tmp_path / "cache"))
+        unified.managers = {
+            PackageManager.WINGET: WinGetManager(backend=backend),
+            PackageManager.CHOCOLATEY: ChocolateyManager(backend=backend),
+        }
+        unified.capabilities.invalidate()
+
+        start = time.perf_counter()
+        installed = unified.list_all_installed()
+
+        # Both recorded listings take 50 ms and run concurrently
+        assert time.perf_counter() - start < 0.5
+        assert len(installed[PackageManager.WINGET]) == 8
+        assert len(installed[PackageManager.CHOCOLATEY]) == 5
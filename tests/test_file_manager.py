@@ -0,0 +1,857 @@
+"""
+Tests for file_manager module
+"""
+
+import hashlib
+
+import pytest
+
+
+def _write(path, data: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+class TestDuplicateFileFinder:
+    """Tests for DuplicateFileFinder class"""
+
+    def test_find_duplicates_small_files(self, tmp_path):
+        """Test duplicates among files small enough to skip full hashing"""
+        from better11.file_manager import DuplicateFileFinder
+
+        a = _write(tmp_path / "a.txt", b"same content")
+        b = _write(tmp_path / "sub" / "b.txt", b"same content")
+        _write(tmp_path / "c.txt", b"other content")
+
+        duplicates = DuplicateFileFinder().find_duplicates(str(tmp_path))
+
+        digest = hashlib.md5(b"same content").hexdigest()
+        assert duplicates == {digest: sorted([str(a), str(b)])}
+
+    def test_large_files_sharing_ends_are_not_duplicates(self, tmp_path):
+        """Test files with equal head and tail but different middles"""
+        from better11.file_manager import DuplicateFileFinder, PARTIAL_HASH_SIZE
+
+        edge = b"x" * PARTIAL_HASH_SIZE
+        _write(tmp_path / "one.bin", edge + b"A" * 1000 + edge)
+        _write(tmp_path / "two.bin", edge + b"B" * 1000 + edge)
+        payload = edge + b"C" * 1000 + edge
+        _write(tmp_path / "three.bin", payload)
+        _write(tmp_path / "copy" / "three.bin", payload)
+
+        groups = list(DuplicateFileFinder(max_workers=2).iter_duplicates(str(tmp_path)))
+
+        assert len(groups) == 1
+        assert groups[0].digest == hashlib.md5(payload).hexdigest()
+        assert groups[0].size == len(payload)
+        assert groups[0].wasted_bytes == len(payload)
+
+    def test_calculate_partial_hash_matches_full_hash_for_small_files(self, tmp_path):
+        """Test partial hash of a small file equals its full hash"""
+        from better11.file_manager import DuplicateFileFinder
+
+        path = _write(tmp_path / "small.bin", b"0123456789")
+        finder = DuplicateFileFinder()
+
+        assert finder.calculate_partial_hash(str(path), 10) == finder.calculate_hash(str(path))
+
+    def test_iter_duplicates_empty_tree(self, tmp_path):
+        """Test scanning a directory with no duplicates"""
+        from better11.file_manager import DuplicateFileFinder
+
+        _write(tmp_path / "only.txt", b"unique")
+
+        assert list(DuplicateFileFinder().iter_duplicates(str(tmp_path))) == []
+
+
+class TestFileIndex:
+    """Tests for FileIndex class"""
+
+    def test_search_by_glob_extension_and_size(self, tmp_path):
+        """Test index queries"""
+        from better11.file_index import FileIndex
+
+        root = tmp_path / "tree"
+        _write(root / "a.txt", b"a" * 10)
+        _write(root / "sub" / "b.TXT", b"b" * 200)
+        _write(root / "sub" / "c.iso", b"c" * 50)
+
+        with FileIndex(str(tmp_path / "index.db")) as index:
+            index.update(str(root))
+
+            names = [f.name for f in index.search(str(root), "*.txt")]
+            assert names == ["a.txt", "b.TXT"]
+
+            isos = index.search(str(root), extensions=["iso"])
+            assert [f.name for f in isos] == ["c.iso"]
+
+            big = index.search(str(root), min_size=100)
+            assert [f.name for f in big] == ["b.TXT"]
+
+            top = index.search(str(root), recursive=False)
+            assert [f.name for f in top] == ["a.txt"]
+
+    def test_incremental_update_skips_unchanged_directories(self, tmp_path):
+        """Test rescans only revisit modified directories"""
+        import os
+        from better11.file_index import FileIndex
+
+        root = tmp_path / "tree"
+        _write(root / "keep" / "one.txt", b"1")
+        _write(root / "drop" / "two.txt", b"2")
+
+        with FileIndex(str(tmp_path / "index.db")) as index:
+            first = index.update(str(root))
+            assert first['directories_scanned'] == 3
+
+            second = index.update(str(root))
+            assert second['directories_scanned'] == 0
+            assert second['directories_skipped'] == 3
+
+            (root / "drop" / "two.txt").unlink()
+            (root / "drop").rmdir()
+            _write(root / "keep" / "three.txt", b"3")
+            os.utime(root, ns=(0, 0))
+
+            third = index.update(str(root))
+            assert third['directories_removed'] == 1
+            assert sorted(f.name for f in index.search(str(root))) == ["one.txt", "three.txt"]
+
+    def test_fast_file_manager_uses_index(self, tmp_path):
+        """Test search_files answers from an attached index"""
+        from better11.file_index import FileIndex
+        from better11.file_manager import FastFileManager
+
+        _write(tmp_path / "tree" / "a.log", b"log")
+
+        with FileIndex(":memory:") as index:
+            manager = FastFileManager(index=index)
+            results = manager.search_files(str(tmp_path / "tree"), "*.log")
+
+            assert [r.name for r in results] == ["a.log"]
+            assert index.is_indexed(str(tmp_path / "tree"))
+
+            # Files added after the first search are picked up
+            _write(tmp_path / "tree" / "b.log", b"log")
+            results = manager.search_files(str(tmp_path / "tree"), "*.log")
+            assert [r.name for r in results] == ["a.log", "b.log"]
+
+    def test_path_pattern_is_anchored_like_rglob(self, tmp_path):
+        """Test path globs match at component boundaries and * stays in one component"""
+        from better11.file_index import FileIndex
+
+        root = tmp_path / "tree"
+        _write(root / "sub" / "a.txt", b"1")
+        _write(root / "x" / "sub" / "b.txt", b"2")
+        _write(root / "xsub" / "deep" / "c.txt", b"3")
+        _write(root / "sub" / "deep" / "d.txt", b"4")
+
+        with FileIndex(":memory:") as index:
+            index.update(str(root))
+
+            found = [f.path for f in index.search(str(root), "sub/*.txt")]
+            assert found == sorted(str(p) for p in root.rglob("sub/*.txt"))
+            assert [f.name for f in index.search(str(root), "sub/*.txt", recursive=False)] == ["a.txt"]
+
+    def test_index_search_matches_rglob_results(self, tmp_path):
+        """Test indexed search returns directories as well as files, like rglob"""
+        from better11.file_index import FileIndex
+        from better11.file_manager import FastFileManager
+
+        root = tmp_path / "tree"
+        _write(root / "logs" / "app.log", b"1")
+        _write(root / "logs" / "old" / "x.txt", b"2")
+        _write(root / "readme.txt", b"3")
+
+        with FileIndex(":memory:") as index:
+            for pattern in ("*", "logs", "*.txt", "logs/*"):
+                indexed = FastFileManager(index=index).search_files(str(root), pattern)
+                walked = FastFileManager().search_files(str(root), pattern)
+                assert sorted((f.path, f.is_directory) for f in indexed) == \
+                    sorted((f.path, f.is_directory) for f in walked), pattern
+
+
+class TestHashCache:
+    """Tests for HashCache class"""
+
+    def test_unchanged_file_is_read_once(self, tmp_path):
+        """Test cached digests are reused while the file is unchanged"""
+        from unittest.mock import patch
+        from better11.hash_cache import HashCache
+
+        path = _write(tmp_path / "media.iso", b"payload")
+        cache = HashCache(str(tmp_path / "cache.db"))
+
+        digests = cache.get_hashes(str(path), ("sha256", "md5"))
+        assert digests["sha256"] == hashlib.sha256(b"payload").hexdigest()
+        assert digests["md5"] == hashlib.md5(b"payload").hexdigest()
+
+        with patch("builtins.open", side_effect=AssertionError("file re-read")):
+            assert cache.get_hash(str(path), "sha256") == digests["sha256"]
+        assert cache.hits == 1
+        cache.close()
+
+    def test_cache_persists_across_instances(self, tmp_path):
+        """Test digests survive reopening the database"""
+        from better11.hash_cache import HashCache
+
+        path = _write(tmp_path / "setup.exe", b"installer")
+        HashCache(str(tmp_path / "cache.db")).get_hash(str(path))
+
+        reopened = HashCache(str(tmp_path / "cache.db"))
+        reopened.get_hash(str(path))
+        assert (reopened.hits, reopened.misses) == (1, 0)
+        reopened.close()
+
+    def test_modified_file_is_rehashed(self, tmp_path):
+        """Test a changed mtime invalidates the cached digest"""
+        import os
+        from better11.hash_cache import HashCache
+
+        path = _write(tmp_path / "data.bin", b"old")
+        cache = HashCache(":memory:")
+        cache.get_hash(str(path))
+
+        path.write_bytes(b"new")
+        os.utime(path, ns=(1, 1))
+
+        assert cache.get_hash(str(path)) == hashlib.sha256(b"new").hexdigest()
+        assert len(cache) == 1
+
+    def test_lru_eviction(self, tmp_path):
+        """Test least recently used digests are evicted"""
+        from better11.hash_cache import HashCache
+
+        cache = HashCache(":memory:", max_entries=10)
+        for i in range(12):
+            cache.get_hash(str(_write(tmp_path / f"f{i}", str(i).encode())))
+
+        assert len(cache) <= 10
+
+    def test_database_uses_wal(self, tmp_path):
+        """Test the on-disk cache runs in WAL mode"""
+        from better11.hash_cache import HashCache
+
+        cache = HashCache(str(tmp_path / "cache.db"))
+        assert cache._conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        cache.close()
+
+    def test_checksum_verification_reads_file(self, tmp_path):
+        """Test download verification ignores digests cached for the same metadata"""
+        import os
+        from better11.application_manager import ApplicationManager
+        from better11.hash_cache import get_hash_cache
+
+        path = _write(tmp_path / "setup.exe", b"good")
+        get_hash_cache().get_hash(str(path))
+        stat = os.stat(path)
+        # Same size and mtime, different contents
+        path.write_bytes(b"evil")
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        with pytest.raises(ValueError, match="Checksum mismatch"):
+            ApplicationManager()._verify_checksum(path, hashlib.sha256(b"good").hexdigest())
+
+
+class TestTreeScan:
+    """Tests for the shared scandir walker"""
+
+    def test_walk_files_records(self, tmp_path):
+        """Test walker yields one record per file with stat data"""
+        from better11.file_walker import walk_files
+
+        _write(tmp_path / "a.txt", b"abc")
+        _write(tmp_path / "sub" / "deep" / "b.bin", b"12345")
+
+        records = sorted(walk_files(str(tmp_path)), key=lambda r: r.name)
+
+        assert [(r.name, r.size, r.extension) for r in records] == [
+            ("a.txt", 3, ".txt"),
+            ("b.bin", 5, ".bin"),
+        ]
+        assert records[1].directory == str(tmp_path / "sub" / "deep")
+
+    def test_subscribers_share_one_traversal(self, tmp_path):
+        """Test every subscriber sees the same single pass"""
+        from unittest.mock import patch
+        from better11.file_manager import DirectorySizeCollector, SizeGroupCollector
+        from better11.file_walker import TreeScan
+        import os
+
+        _write(tmp_path / "a.txt", b"abc")
+        _write(tmp_path / "sub" / "b.txt", b"xyz")
+
+        scan = TreeScan(str(tmp_path))
+        sizes = scan.subscribe(SizeGroupCollector())
+        dirs = scan.subscribe(DirectorySizeCollector())
+
+        with patch("better11.file_walker.os.scandir", wraps=os.scandir) as scandir:
+            stats = scan.run()
+
+        assert scandir.call_count == 2
+        assert stats == {'directories': 2, 'files': 2, 'bytes': 6}
+        assert sorted(sizes.files_by_size[3]) == [str(tmp_path / "a.txt"), str(tmp_path / "sub" / "b.txt")]
+        assert dirs.sizes == {str(tmp_path): 3, str(tmp_path / "sub"): 3}
+
+    def test_optimize_directory_reports_duplicates(self, tmp_path):
+        """Test optimize_directory on a single shared scan"""
+        from better11.file_manager import AdvancedFileManager
+
+        _write(tmp_path / "a.bin", b"dup" * 10)
+        _write(tmp_path / "b" / "a.bin", b"dup" * 10)
+
+        results = AdvancedFileManager().optimize_directory(str(tmp_path))
+
+        assert results['duplicates_found'] == 1
+        assert results['space_wasted'] == 30
+        assert results['large_files'] == 0
+
+
+class TestLargeFileAnalyzer:
+    """Tests for LargeFileAnalyzer class"""
+
+    def _tree(self, root):
+        sizes = {
+            "a/one.bin": 10, "a/two.bin": 70, "b/c/three.bin": 40,
+            "b/four.bin": 90, "five.bin": 60, "six.bin": 5,
+        }
+        for name, size in sizes.items():
+            _write(root / name, b"x" * size)
+
+    @pytest.mark.parametrize("parallel", [False, True])
+    def test_returns_largest_files_in_order(self, tmp_path, parallel):
+        """Test top-N results are the N largest regardless of walk order"""
+        from better11.file_manager import LargeFileAnalyzer
+
+        self._tree(tmp_path)
+
+        results = LargeFileAnalyzer().find_large_files(
+            str(tmp_path), min_size_mb=0, limit=3, parallel=parallel
+        )
+
+        assert [r.size for r in results] == [90, 70, 60]
+
+    def test_collector_merge_keeps_top_n(self):
+        """Test merging per-worker heaps"""
+        from better11.file_manager import LargeFileCollector
+        from better11.file_walker import FileRecord
+
+        def record(name, size):
+            return FileRecord(name, name, "", size, 0.0, 0.0, 0.0)
+
+        left = LargeFileCollector(0, limit=2)
+        right = LargeFileCollector(0, limit=2)
+        for r in (record("a", 1), record("b", 5), record("c", 3)):
+            left.add(r)
+        for r in (record("d", 4), record("e", 2)):
+            right.add(r)
+
+        left.merge(right)
+
+        assert [f.name for f in left.results()] == ["b", "d"]
+
+
+class TestDirectorySizeAnalyzer:
+    """Tests for DirectorySizeAnalyzer class"""
+
+    def test_recursive_subtotals(self, tmp_path):
+        """Test totals roll up from leaves to the root"""
+        from better11.directory_sizes import DirectorySizeAnalyzer
+
+        _write(tmp_path / "top.bin", b"x" * 5)
+        _write(tmp_path / "a" / "one.bin", b"x" * 10)
+        _write(tmp_path / "a" / "b" / "two.bin", b"x" * 20)
+        (tmp_path / "empty").mkdir()
+
+        root = DirectorySizeAnalyzer().scan(str(tmp_path))
+
+        assert (root.total_bytes, root.total_files) == (35, 3)
+        nodes = {node.name: node for node in root.iter_nodes()}
+        assert (nodes["a"].total_bytes, nodes["a"].own_bytes, nodes["a"].depth) == (30, 10, 1)
+        assert (nodes["b"].total_bytes, nodes["b"].depth) == (20, 2)
+        assert nodes["empty"].total_files == 0
+
+    def test_snapshot_reuses_unchanged_branches(self, tmp_path):
+        """Test a rescan only relists changed directories"""
+        import os
+        from better11.directory_sizes import DirectorySizeAnalyzer
+
+        tree = tmp_path / "tree"
+        _write(tree / "a" / "one.bin", b"x" * 10)
+        _write(tree / "b" / "two.bin", b"x" * 20)
+        snapshot = str(tmp_path / "snapshot.json")
+
+        DirectorySizeAnalyzer(snapshot).scan(str(tree))
+
+        _write(tree / "b" / "three.bin", b"x" * 30)
+        os.utime(tree / "b", ns=(0, 0))
+
+        analyzer = DirectorySizeAnalyzer(snapshot)
+        root = analyzer.scan(str(tree))
+
+        assert analyzer.last_stats == {'directories_listed': 1, 'directories_reused': 2}
+        assert root.total_bytes == 60
+
+    def test_snapshot_sees_files_rewritten_in_place(self, tmp_path):
+        """Test growing a file is counted although its directory mtime is unchanged"""
+        import os
+        from better11.directory_sizes import DirectorySizeAnalyzer
+
+        tree = tmp_path / "tree"
+        _write(tree / "logs" / "app.log", b"x" * 10)
+        snapshot = str(tmp_path / "snapshot.json")
+        DirectorySizeAnalyzer(snapshot).scan(str(tree))
+
+        mtime_ns = os.stat(tree / "logs").st_mtime_ns
+        with open(tree / "logs" / "app.log", "ab") as f:
+            f.write(b"x" * 90)
+        os.utime(tree / "logs", ns=(mtime_ns, mtime_ns))
+
+        analyzer = DirectorySizeAnalyzer(snapshot)
+        root = analyzer.scan(str(tree))
+
+        assert analyzer.last_stats['directories_listed'] == 0
+        assert root.total_bytes == 100
+
+    def test_directory_tree_with_sizes(self, tmp_path):
+        """Test WinDirStat-style tree sorted by size"""
+        from better11.file_manager import AdvancedFileManager
+
+        _write(tmp_path / "small" / "f.bin", b"x")
+        _write(tmp_path / "big" / "f.bin", b"x" * 100)
+
+        tree = AdvancedFileManager().get_directory_tree(str(tmp_path), max_depth=1, with_sizes=True)
+
+        assert tree['size'] == 101
+        assert [child['name'] for child in tree['children']] == ["big", "small"]
+
+    def test_analyze_directory_size_recursive(self, tmp_path):
+        """Test recursive subtotals through LargeFileAnalyzer"""
+        from better11.file_manager import LargeFileAnalyzer
+
+        _write(tmp_path / "a" / "b" / "f.bin", b"x" * 7)
+
+        sizes = LargeFileAnalyzer().analyze_directory_size(str(tmp_path), recursive=True)
+
+        assert sizes[str(tmp_path)] == 7
+        assert sizes[str(tmp_path / "a")] == 7
+
+
+class TestCopyEngine:
+    """Tests for CopyEngine class"""
+
+    def test_copy_tree_with_progress(self, tmp_path):
+        """Test parallel tree copy reports aggregate progress"""
+        from better11.copy_engine import CopyEngine
+
+        src = tmp_path / "src"
+        payloads = {f"d{i}/f{j}.bin": bytes([i, j]) * 5000 for i in range(3) for j in range(4)}
+        for name, data in payloads.items():
+            _write(src / name, data)
+
+        updates = []
+        engine = CopyEngine(max_workers=4, buffer_size=4096, progress_callback=updates.append)
+        result = engine.copy_tree(str(src), str(tmp_path / "dst"))
+
+        assert result.success
+        assert result.files_copied == 12
+        assert result.bytes_copied == sum(len(d) for d in payloads.values())
+        for name, data in payloads.items():
+            assert (tmp_path / "dst" / name).read_bytes() == data
+        assert updates[-1].files_done == 12
+        assert updates[-1].bytes_done == updates[-1].bytes_total
+
+    def test_copy_into_existing_destination(self, tmp_path):
+        """Test copying merges into an existing directory"""
+        from better11.file_manager import FastFileManager
+
+        _write(tmp_path / "src" / "a.txt", b"new")
+        _write(tmp_path / "dst" / "keep.txt", b"old")
+
+        assert FastFileManager().copy_directory_fast(str(tmp_path / "src"), str(tmp_path / "dst"))
+        assert (tmp_path / "dst" / "a.txt").read_bytes() == b"new"
+        assert (tmp_path / "dst" / "keep.txt").exists()
+
+    def test_fallback_without_kernel_copy(self, tmp_path):
+        """Test buffered copy when zero-copy calls are unavailable"""
+        from unittest.mock import patch
+        from better11.copy_engine import CopyEngine
+
+        src = _write(tmp_path / "a.bin", b"z" * 10000)
+        with patch("better11.copy_engine.os.copy_file_range", side_effect=OSError, create=True), \
+                patch("better11.copy_engine.os.sendfile", side_effect=OSError, create=True):
+            result = CopyEngine(buffer_size=1024).copy_file(str(src), str(tmp_path / "b.bin"))
+
+        assert result.bytes_copied == 10000
+        assert (tmp_path / "b.bin").read_bytes() == b"z" * 10000
+
+    def test_zero_length_kernel_copy_falls_back(self, tmp_path):
+        """Test copy_file_range copying nothing from a non-empty file is not taken as EOF"""
+        from unittest.mock import patch
+        from better11.copy_engine import CopyEngine
+
+        src = _write(tmp_path / "a.bin", b"z" * 10000)
+        with patch("better11.copy_engine.os.copy_file_range", return_value=0, create=True):
+            result = CopyEngine(buffer_size=1024).copy_file(str(src), str(tmp_path / "b.bin"))
+
+        assert result.bytes_copied == 10000
+        assert (tmp_path / "b.bin").read_bytes() == b"z" * 10000
+
+    @pytest.mark.skipif(not hasattr(__import__("os"), "symlink"), reason="Needs symlinks")
+    def test_copy_tree_follows_symlinked_directories(self, tmp_path):
+        """Test linked directories are copied as contents and cycles are skipped"""
+        import os
+        from better11.copy_engine import CopyEngine
+
+        _write(tmp_path / "shared" / "lib.txt", b"lib")
+        _write(tmp_path / "src" / "a.txt", b"a")
+        try:
+            os.symlink(tmp_path / "shared", tmp_path / "src" / "linked", target_is_directory=True)
+            os.symlink(tmp_path / "src", tmp_path / "src" / "loop", target_is_directory=True)
+        except OSError:
+            pytest.skip("Cannot create symlinks")
+
+        result = CopyEngine().copy_tree(str(tmp_path / "src"), str(tmp_path / "dst"))
+
+        assert result.success
+        assert (tmp_path / "dst" / "linked" / "lib.txt").read_bytes() == b"lib"
+        assert not (tmp_path / "dst" / "linked").is_symlink()
+        assert not (tmp_path / "dst" / "loop" / "loop").exists()
+
+    def test_stale_partials_are_removed(self, tmp_path):
+        """Test partial files left by an interrupted copy are cleaned up"""
+        from better11.copy_engine import CopyEngine, DirectorySync, PARTIAL_SUFFIX
+
+        _write(tmp_path / "src" / "a.txt", b"a")
+        _write(tmp_path / "dst" / ("gone.txt" + PARTIAL_SUFFIX), b"half")
+        _write(tmp_path / "mirror" / "sub" / ("gone.txt" + PARTIAL_SUFFIX), b"half")
+
+        CopyEngine().copy_tree(str(tmp_path / "src"), str(tmp_path / "dst"))
+        DirectorySync().sync(str(tmp_path / "src"), str(tmp_path / "mirror"))
+
+        assert not (tmp_path / "dst" / ("gone.txt" + PARTIAL_SUFFIX)).exists()
+        assert not (tmp_path / "mirror" / "sub" / ("gone.txt" + PARTIAL_SUFFIX)).exists()
+
+    def test_rate_limiter_throttles(self):
+        """Test the token bucket delays once the allowance is spent"""
+        from unittest.mock import patch
+        from better11.copy_engine import RateLimiter
+
+        limiter = RateLimiter(1000)
+        with patch("better11.copy_engine.time.sleep") as sleep:
+            limiter.consume(1000)
+            limiter.consume(500)
+
+        assert sleep.call_count == 1
+        assert sleep.call_args[0][0] == pytest.approx(0.5, abs=0.05)
+
+
+class TestDirectorySync:
+    """Tests for DirectorySync class"""
+
+    def test_sync_copies_only_changes_and_deletes_extras(self, tmp_path):
+        """Test incremental sync with a per-file diff"""
+        import os
+        from better11.copy_engine import DirectorySync
+
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        _write(src / "same.txt", b"same")
+        _write(src / "changed.txt", b"v2 longer")
+        _write(src / "sub" / "new.txt", b"new")
+
+        DirectorySync().sync(str(src), str(dst))
+        (src / "changed.txt").write_bytes(b"v3 even longer")
+        _write(src / "sub" / "new2.txt", b"n2")
+        _write(dst / "extra.txt", b"x")
+        _write(dst / "gone" / "old.txt", b"x")
+
+        report = DirectorySync(delete_extras=True).sync(str(src), str(dst))
+        actions = {e.path: (e.action.value, e.reason) for e in report.entries}
+
+        assert actions["same.txt"] == ("skip", "unchanged")
+        assert actions["changed.txt"] == ("update", "size changed")
+        assert actions[os.path.join("sub", "new2.txt")] == ("copy", "new")
+        assert actions["extra.txt"][0] == "delete"
+        assert report.summary()['update'] == 1
+        assert report.copy_result.files_copied == 2
+        assert (dst / "changed.txt").read_bytes() == b"v3 even longer"
+        assert not (dst / "extra.txt").exists()
+        assert not (dst / "gone").exists()
+        assert not (dst / ".better11-sync.journal").exists()
+
+    def test_verify_detects_same_size_content_change(self, tmp_path):
+        """Test hash comparison catches changes size and mtime miss"""
+        import os
+        from better11.copy_engine import DirectorySync
+
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        _write(src / "a.bin", b"AAAA")
+        _write(dst / "a.bin", b"BBBB")
+        stat = os.stat(src / "a.bin")
+        os.utime(dst / "a.bin", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert DirectorySync().plan(str(src), str(dst))[0].action.value == "skip"
+
+        report = DirectorySync(verify=True).sync(str(src), str(dst))
+        assert report.entries[0].reason == "content changed"
+        assert (dst / "a.bin").read_bytes() == b"AAAA"
+
+    def test_resume_from_journal(self, tmp_path):
+        """Test files completed before an interruption are not recopied"""
+        import json
+        from better11.copy_engine import DirectorySync, JOURNAL_NAME
+
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        _write(src / "done.bin", b"1234")
+        _write(src / "todo.bin", b"5678")
+        _write(dst / "done.bin", b"1234")
+        mtime = (src / "done.bin").stat().st_mtime
+        (dst / JOURNAL_NAME).write_text(
+            json.dumps({'source': str(src), 'destination': str(dst)}) + "\n"
+            + json.dumps({'done': "done.bin", 'size': 4, 'mtime': mtime}) + "\n"
+        )
+
+        report = DirectorySync().sync(str(src), str(dst))
+
+        assert report.resumed == 1
+        assert report.copy_result.files_copied == 1
+        assert (dst / "todo.bin").read_bytes() == b"5678"
+        assert not (dst / JOURNAL_NAME).exists()
+
+    def test_journal_ignored_for_changed_source(self, tmp_path):
+        """Test a journaled file is recopied when the source changed since"""
+        import json
+        import os
+        from better11.copy_engine import DirectorySync, JOURNAL_NAME
+
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        _write(src / "a.bin", b"new!")
+        _write(src / "b.bin", b"BBBB")
+        _write(dst / "a.bin", b"old!")
+        os.utime(dst / "a.bin", (1000, 1000))
+        _write(dst / "b.bin", b"XXXX")
+        os.utime(dst / "b.bin", ns=(0, os.stat(src / "b.bin").st_mtime_ns))
+        journal = [
+            {'source': str(src), 'destination': str(dst)},
+            # Copied while a.bin had an older mtime
+            {'done': "a.bin", 'size': 4, 'mtime': 1000.0},
+            {'done': "b.bin", 'size': 4, 'mtime': (src / "b.bin").stat().st_mtime,
+             'sha256': hashlib.sha256(b"XXXX").hexdigest()},
+        ]
+        (dst / JOURNAL_NAME).write_text("".join(json.dumps(line) + "\n" for line in journal))
+
+        entries = {e.path: e for e in DirectorySync().plan(str(src), str(dst))}
+        assert entries["a.bin"].action.value == "update"
+        assert entries["b.bin"].reason == "completed before interruption"
+
+        report = DirectorySync(verify=True).sync(str(src), str(dst))
+        assert report.resumed == 0
+        assert (dst / "a.bin").read_bytes() == b"new!"
+        assert (dst / "b.bin").read_bytes() == b"BBBB"
+
+    def test_verify_ignores_cached_digests(self, tmp_path):
+        """Test verification reads a destination rewritten with the same size and mtime"""
+        import os
+        from better11.copy_engine import DirectorySync
+        from better11.hash_cache import get_hash_cache
+
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        _write(src / "a.bin", b"AAAA")
+        DirectorySync().sync(str(src), str(dst))
+        get_hash_cache().get_hash(str(dst / "a.bin"))
+        stat = os.stat(dst / "a.bin")
+        (dst / "a.bin").write_bytes(b"BBBB")
+        os.utime(dst / "a.bin", ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        report = DirectorySync(verify=True).sync(str(src), str(dst))
+        assert report.entries[0].reason == "content changed"
+        assert (dst / "a.bin").read_bytes() == b"AAAA"
+
+    @pytest.mark.skipif(not hasattr(__import__("os"), "symlink"), reason="Needs symlinks")
+    def test_delete_extras_does_not_follow_destination_links(self, tmp_path):
+        """Test a symlinked directory in the destination is unlinked, not emptied"""
+        import os
+        from better11.copy_engine import DirectorySync, PARTIAL_SUFFIX
+
+        src, dst = tmp_path / "src", tmp_path / "dst"
+        _write(src / "a.txt", b"a")
+        _write(tmp_path / "outside" / "keep.txt", b"keep")
+        _write(tmp_path / "outside" / ("keep.txt" + PARTIAL_SUFFIX), b"half")
+        dst.mkdir()
+        try:
+            os.symlink(tmp_path / "outside", dst / "linked", target_is_directory=True)
+        except (OSError, NotImplementedError):
+            pytest.skip("Cannot create symlinks")
+
+        report = DirectorySync(delete_extras=True).sync(str(src), str(dst))
+        actions = {e.path: (e.action.value, e.reason) for e in report.entries}
+
+        assert report.success
+        assert actions["linked"] == ("delete", "link not in source")
+        assert not os.path.lexists(dst / "linked")
+        assert (tmp_path / "outside" / "keep.txt").read_bytes() == b"keep"
+        assert (tmp_path / "outside" / ("keep.txt" + PARTIAL_SUFFIX)).exists()
+        assert (dst / "a.txt").read_bytes() == b"a"
+
+
+class TestFileCompressor:
+    """Tests for FileCompressor class"""
+
+    def test_compress_directory_parallel_round_trip(self, tmp_path):
+        """Test parallel deflate produces a valid, ordered archive"""
+        import zipfile
+        from better11.file_manager import FileCompressor
+
+        src = tmp_path / "src"
+        payloads = {f"dir{i}/file{i}.txt": (f"line {i}\n" * 2000).encode() for i in range(10)}
+        payloads["media/setup.iso"] = bytes(range(256)) * 100
+        for name, data in payloads.items():
+            _write(src / name, data)
+
+        updates = []
+        compressor = FileCompressor()
+        dst = compressor.compress_directory(
+            str(src), str(tmp_path / "out.zip"), max_workers=4, progress_callback=updates.append
+        )
+
+        with zipfile.ZipFile(dst) as zipf:
+            assert zipf.testzip() is None
+            names = zipf.namelist()
+            assert names == sorted(names)
+            for name, data in payloads.items():
+                assert zipf.read(name) == data
+            assert zipf.getinfo("media/setup.iso").compress_type == zipfile.ZIP_STORED
+            assert zipf.getinfo("dir0/file0.txt").compress_type == zipfile.ZIP_DEFLATED
+
+        assert updates[-1].files_done == len(payloads)
+        assert compressor.last_progress.bytes_read == sum(len(d) for d in payloads.values())
+        assert compressor.last_progress.ratio < 1
+
+    def test_custom_levels(self, tmp_path):
+        """Test level_for can force STORE for every member"""
+        import zipfile
+        from better11.file_manager import FileCompressor
+
+        _write(tmp_path / "src" / "a.txt", b"a" * 1000)
+
+        dst = FileCompressor().compress_directory(
+            str(tmp_path / "src"), str(tmp_path / "out.zip"), level_for=lambda path: 0
+        )
+
+        with zipfile.ZipFile(dst) as zipf:
+            assert zipf.getinfo("a.txt").compress_type == zipfile.ZIP_STORED
+
+    def test_incompressible_member_is_stored_from_first_chunk(self, tmp_path):
+        """Test a member whose first chunk does not compress is stored without a full deflate"""
+        import os
+        import zipfile
+        from better11.zip_engine import READ_CHUNK_SIZE, _encode_member
+
+        data = os.urandom(READ_CHUNK_SIZE) + b"a" * READ_CHUNK_SIZE
+        path = _write(tmp_path / "random.dat", data)
+
+        spool, crc, size, compress_type = _encode_member(str(path), 6)
+        with spool:
+            assert compress_type == zipfile.ZIP_STORED
+            assert size == len(data)
+            assert spool.tell() == len(data)
+
+    def test_falls_back_to_public_write(self, tmp_path):
+        """Test archives are written with ZipFile.write where raw writes are unsupported"""
+        import zipfile
+        from unittest.mock import patch
+        from better11.zip_engine import ParallelZipWriter
+
+        text = _write(tmp_path / "a.txt", b"text " * 1000)
+        iso = _write(tmp_path / "b.iso", b"iso")
+
+        with patch("better11.zip_engine.RAW_WRITE_SUPPORTED", False), \
+                patch("better11.zip_engine._write_raw", side_effect=AssertionError("private API used")):
+            ParallelZipWriter(max_workers=2).write(
+                str(tmp_path / "out.zip"), [(str(text), "a.txt"), (str(iso), "b.iso")]
+            )
+
+        with zipfile.ZipFile(tmp_path / "out.zip") as zipf:
+            assert zipf.testzip() is None
+            assert zipf.read("a.txt") == b"text " * 1000
+            assert zipf.getinfo("a.txt").compress_type == zipfile.ZIP_DEFLATED
+            assert zipf.getinfo("b.iso").compress_type == zipfile.ZIP_STORED
+
+    def _archive(self, path, members):
+        import zipfile
+
+        with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for name, data in members.items():
+                zipf.writestr(name, data)
+        return str(path)
+
+    def test_decompress_parallel_with_filters(self, tmp_path):
+        """Test selective multi-worker extraction"""
+        from better11.file_manager import FileCompressor
+
+        archive = self._archive(tmp_path / "pack.zip", {
+            "drivers/net/a.inf": b"inf", "drivers/net/a.sys": b"sys" * 100,
+            "drivers/gpu/b.inf": b"gpu", "readme.txt": b"hello",
+        })
+        compressor = FileCompressor()
+
+        assert compressor.decompress_file(
+            archive, str(tmp_path / "out"), max_workers=3,
+            include=["drivers/*"], exclude=["*.sys"]
+        )
+
+        assert (tmp_path / "out" / "drivers" / "net" / "a.inf").read_bytes() == b"inf"
+        assert (tmp_path / "out" / "drivers" / "gpu" / "b.inf").exists()
+        assert not (tmp_path / "out" / "drivers" / "net" / "a.sys").exists()
+        assert not (tmp_path / "out" / "readme.txt").exists()
+        assert compressor.last_extraction.filtered == 2
+
+    def test_reextract_skips_matching_files(self, tmp_path):
+        """Test unchanged files are not rewritten"""
+        from better11.file_manager import FileCompressor
+
+        archive = self._archive(tmp_path / "pack.zip", {"a.txt": b"aaa", "b.txt": b"bbb"})
+        compressor = FileCompressor()
+        compressor.decompress_file(archive, str(tmp_path / "out"))
+        (tmp_path / "out" / "b.txt").write_bytes(b"zzz")
+
+        assert compressor.decompress_file(archive, str(tmp_path / "out"))
+
+        assert compressor.last_extraction.skipped == 1
+        assert compressor.last_extraction.extracted == 1
+        assert (tmp_path / "out" / "b.txt").read_bytes() == b"bbb"
+
+    def test_rejects_path_traversal_and_size_limit(self, tmp_path):
+        """Test unsafe archives are refused before writing"""
+        from better11.zip_engine import ParallelZipExtractor, UnsafeArchiveError
+
+        evil = self._archive(tmp_path / "evil.zip", {"../escape.txt": b"x"})
+        with pytest.raises(UnsafeArchiveError):
+            ParallelZipExtractor().extract(evil, str(tmp_path / "out"))
+        assert not (tmp_path / "escape.txt").exists()
+
+        bomb = self._archive(tmp_path / "bomb.zip", {"zeros.bin": b"\0" * 100000})
+        with pytest.raises(UnsafeArchiveError):
+            ParallelZipExtractor(max_total_size=1000).extract(bomb, str(tmp_path / "out"))
+
+    def test_duplicate_member_names_extract_last(self, tmp_path):
+        """Test repeated names are extracted once, keeping the last member"""
+        import os
+        import warnings
+        import zipfile
+        from better11.zip_engine import ParallelZipExtractor
+
+        archive = tmp_path / "dup.zip"
+        with warnings.catch_warnings(), zipfile.ZipFile(archive, "w") as zipf:
+            warnings.simplefilter("ignore")
+            for i in range(8):
+                zipf.writestr("same.txt", f"version {i}" * 1000)
+            zipf.writestr("other.txt", b"other")
+
+        result = ParallelZipExtractor(max_workers=4, skip_existing=False).extract(str(archive), str(tmp_path / "out"))
+
+        assert result.success
+        assert result.extracted == 2
+        assert (tmp_path / "out" / "same.txt").read_text() == "version 7" * 1000
+        assert sorted(os.listdir(tmp_path / "out")) == ["other.txt", "same.txt"]
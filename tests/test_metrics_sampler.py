@@ -0,0 +1,209 @@
+"""
+Tests for metrics_sampler module
+"""
+
+import sys
+import time
+
+import pytest
+
+from better11.metrics_sampler import (
+    METRICS,
+    MetricsSampler,
+    ProcReader,
+    RingBuffer,
+    percentile,
+)
+
+
+class FakeProc:
+    """Writable /proc tree with adjustable counters"""
+
+    def __init__(self, root):
+        self.root = root
+        (root / "net").mkdir()
+        self.write(busy=0, idle=0, available_kb=8 * 1024 * 1024, read_sectors=0, written_sectors=0, recv=0, sent=0)
+
+    def write(self, busy, idle, available_kb, read_sectors, written_sectors, recv, sent):
+        (self.root / "stat").write_text(
+            f"cpu  {busy} 0 0 {idle} 0 0 0 0 0 0\ncpu0 {busy} 0 0 {idle} 0 0 0 0 0 0\n"
+        )
+        (self.root / "meminfo").write_text(
+            f"MemTotal:       16777216 kB\nMemFree:         1000000 kB\nMemAvailable:   {available_kb} kB\n"
+        )
+        (self.root / "diskstats").write_text(
+            f"   8       0 sda 100 0 {read_sectors} 0 50 0 {written_sectors} 0 0 0 0\n"
+            f"   8       1 sda1 100 0 {read_sectors} 0 50 0 {written_sectors} 0 0 0 0\n"
+            f"   7       0 loop0 1 0 999999 0 0 0 0 0 0 0 0\n"
+        )
+        (self.root / "net" / "dev").write_text(
+            "Inter-|   Receive                            |  Transmit\n"
+            " face |bytes    packets errs drop fifo frame compressed multicast|bytes    packets\n"
+            f"    lo: 999999 1 0 0 0 0 0 0 999999 1 0 0 0 0 0 0\n"
+            f"  eth0: {recv} 1 0 0 0 0 0 0 {sent} 1 0 0 0 0 0 0\n"
+        )
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def proc(tmp_path):
+    return FakeProc(tmp_path)
+
+
+class TestRingBuffer:
+    """Tests for the array-backed ring buffer"""
+
+    def test_overwrites_oldest(self):
+        """Test values wrap around once capacity is reached"""
+        buffer = RingBuffer(3)
+        for value in range(5):
+            buffer.append(value)
+
+        assert len(buffer) == 3
+        assert buffer.values() == [2.0, 3.0, 4.0]
+        assert buffer.values(last=2) == [3.0, 4.0]
+        assert buffer[0] == 2.0 and buffer[-1] == 4.0
+
+    def test_percentile(self):
+        """Test percentiles interpolate between samples"""
+        values = [float(v) for v in range(1, 11)]
+
+        assert percentile(values, 50) == 5.5
+        assert percentile(values, 100) == 10.0
+        assert percentile([], 90) == 0.0
+
+
+class TestMetricsSampler:
+    """Tests for rate calculation and windowed queries"""
+
+    def test_rates_from_proc_counters(self, proc):
+        """Test counter deltas become percentages and byte rates"""
+        clock = FakeClock()
+        sampler = MetricsSampler(reader=ProcReader(str(proc.root)), clock=clock)
+
+        assert sampler.sample() is None
+        proc.write(busy=300, idle=100, available_kb=4 * 1024 * 1024,
+                   read_sectors=2048, written_sectors=4096, recv=10000, sent=5000)
+        clock.now += 2
+        values = sampler.sample()
+
+        assert values['cpu_percent'] == 75.0
+        assert values['memory_percent'] == 75.0
+        # Partitions and loop devices are not double counted
+        assert values['disk_read_bps'] == 2048 * 512 / 2
+        assert values['disk_write_bps'] == 4096 * 512 / 2
+        assert values['net_recv_bps'] == 5000.0
+        assert values['net_sent_bps'] == 2500.0
+
+    def test_windows_and_deltas(self, proc):
+        """Test averages, percentiles and before/after comparisons"""
+        clock = FakeClock()
+        sampler = MetricsSampler(reader=ProcReader(str(proc.root)), clock=clock, capacity=50)
+        sampler.sample()
+        busy = idle = 0
+        for second in range(20):
+            # 80% busy for the first 10 seconds, 20% after
+            load = 80 if second < 10 else 20
+            busy += load
+            idle += 100 - load
+            proc.write(busy=busy, idle=idle, available_kb=8 * 1024 * 1024,
+                       read_sectors=0, written_sectors=0, recv=0, sent=0)
+            clock.now += 1
+            sampler.sample()
+
+        assert len(sampler) == 20
+        assert sampler.average('cpu_percent', window=5) == 20.0
+        assert sampler.average('cpu_percent') == 50.0
+        assert sampler.percentile('cpu_percent', 90) == 80.0
+        assert sampler.latest('memory_percent') == 50.0
+
+        delta = sampler.compare(before_start=100.0, change=110.5)
+        assert delta.before['cpu_percent'] == 80.0
+        assert delta.after['cpu_percent'] == 20.0
+        assert delta.change['cpu_percent'] == -60.0
+        assert "CPU 80.0% -> 20.0%" in delta.describe()
+
+    def test_history_is_bounded(self, proc):
+        """Test old samples are dropped at capacity"""
+        clock = FakeClock()
+        sampler = MetricsSampler(reader=ProcReader(str(proc.root)), clock=clock, capacity=4)
+        for _ in range(10):
+            clock.now += 1
+            sampler.sample()
+
+        assert len(sampler) == 4
+        assert all(len(sampler.history(metric)) == 4 for metric in METRICS)
+
+    def test_unknown_metric(self, proc):
+        """Test querying an unknown metric raises KeyError"""
+        sampler = MetricsSampler(reader=ProcReader(str(proc.root)))
+
+        with pytest.raises(KeyError):
+            sampler.history('gpu_percent')
+
+    def test_measure_windows_exclude_the_action(self, proc):
+        """Test the after window starts once the action returns and the sampler is stopped"""
+        from unittest.mock import patch
+
+        clock = FakeClock()
+        sampler = MetricsSampler(reader=ProcReader(str(proc.root)), clock=clock, interval=1.0)
+        counters = {'busy': 0, 'idle': 0}
+        load = {'percent': 50}
+
+        def advance(seconds):
+            for _ in range(int(seconds)):
+                counters['busy'] += load['percent']
+                counters['idle'] += 100 - load['percent']
+                proc.write(busy=counters['busy'], idle=counters['idle'], available_kb=8 * 1024 * 1024,
+                           read_sectors=0, written_sectors=0, recv=0, sent=0)
+                clock.now += 1
+                sampler.sample()
+
+        def action():
+            # The action itself keeps the CPU busy, then leaves it quieter
+            load['percent'] = 90
+            advance(10)
+            load['percent'] = 20
+            return "applied"
+
+        with patch.object(MetricsSampler, '_run', lambda self: self._stop.wait()), \
+                patch("better11.metrics_sampler.time.sleep", side_effect=advance):
+            result, delta = sampler.measure(action, baseline=5, settle=5)
+
+        assert result == "applied"
+        assert delta.before['cpu_percent'] == 50.0
+        assert delta.after['cpu_percent'] == 20.0
+        assert not sampler.running
+
+    def test_measure_stops_sampler_on_error(self, proc):
+        """Test a failing action does not leave the sampler running"""
+        sampler = MetricsSampler(reader=ProcReader(str(proc.root)), interval=0.01)
+
+        def fail():
+            raise RuntimeError("tweak failed")
+
+        with pytest.raises(RuntimeError):
+            sampler.measure(fail, baseline=0, settle=0)
+        assert not sampler.running
+
+    @pytest.mark.skipif(not sys.platform.startswith("linux"), reason="Reads the live /proc")
+    def test_background_sampling(self):
+        """Test the background thread records samples and measures an action"""
+        sampler = MetricsSampler(interval=0.02)
+
+        result, delta = sampler.measure(lambda: "done", baseline=0.15, settle=0.15)
+        sampler.stop()
+
+        assert result == "done"
+        assert not sampler.running
+        assert len(sampler) >= 5
+        assert set(delta.before) == set(METRICS)
+        assert set(delta.after) == set(METRICS)
+        assert 0.0 <= sampler.latest('cpu_percent') <= 100.0
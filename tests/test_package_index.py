@@ -0,0 +1,110 @@
+"""
+Tests for package_index module
+"""
+
+import json
+import random
+import string
+import time
+
+import pytest
+
+from better11.package_index import PackageSearchIndex
+from better11.package_manager import Package, PackageManager
+
+
+def package(package_id, name=None, manager=PackageManager.WINGET, publisher="", description="", version="1.0"):
+    return Package(name=name or package_id, package_id=package_id, version=version, manager=manager,
+                   publisher=publisher, description=description)
+
+
+@pytest.fixture
+def index():
+    index = PackageSearchIndex()
+    index.update_catalog(PackageManager.WINGET, [
+        package("Microsoft.VisualStudioCode", "Microsoft Visual Studio Code", publisher="Microsoft Corporation",
+                description="Code editing. Redefined."),
+        package("Mozilla.Firefox", "Mozilla Firefox", publisher="Mozilla", description="Fast web browser"),
+        package("Git.Git", "Git", publisher="The Git Development Community", description="Version control"),
+    ])
+    index.update_catalog(PackageManager.PIP, [
+        package("gitpython", "GitPython", PackageManager.PIP, description="Python Git Library"),
+        package("requests", manager=PackageManager.PIP, description="HTTP for Humans"),
+    ])
+    return index
+
+
+class TestPackageSearchIndex:
+    """Tests for the local package search index"""
+
+    def test_exact_id_ranks_first(self, index):
+        """Test an exact name match outranks description matches"""
+        results = [p.package_id for p in index.search("git")]
+
+        assert results[0] == "Git.Git"
+        assert "gitpython" in results
+
+    def test_prefix_while_typing(self, index):
+        """Test the last term matches as a prefix"""
+        assert [p.package_id for p in index.search("fire")] == ["Mozilla.Firefox"]
+        assert [p.package_id for p in index.search("visual stu")] == ["Microsoft.VisualStudioCode"]
+
+    def test_fuzzy_match(self, index):
+        """Test a misspelled term still finds the package"""
+        assert [p.package_id for p in index.search("firefix browser")] == ["Mozilla.Firefox"]
+        assert [p.package_id for p in index.search("reqests")] == ["requests"]
+
+    def test_publisher_and_manager_filter(self, index):
+        """Test publisher tokens are searchable and results filter by manager"""
+        assert [p.package_id for p in index.search("mozilla")] == ["Mozilla.Firefox"]
+        assert [p.package_id for p in index.search("git", manager=PackageManager.PIP)] == ["gitpython"]
+
+    def test_incremental_update(self, index):
+        """Test only changed packages are re-indexed and removed ones disappear"""
+        stats = index.update_catalog(PackageManager.PIP, [
+            package("gitpython", "GitPython", PackageManager.PIP, description="Python Git Library"),
+            package("httpx", manager=PackageManager.PIP, description="Next generation HTTP client"),
+        ])
+
+        assert stats == {'added': 1, 'updated': 0, 'removed': 1, 'unchanged': 1}
+        assert index.search("requests") == []
+        assert [p.package_id for p in index.search("http")] == ["httpx"]
+
+    def test_snapshot_and_dump(self, tmp_path):
+        """Test the index reloads from its snapshot and reads WinGet-style dumps"""
+        dump = tmp_path / "winget.json"
+        dump.write_text(json.dumps([
+            {"PackageIdentifier": "7zip.7zip", "PackageName": "7-Zip", "Publisher": "Igor Pavlov",
+             "PackageVersion": "23.01", "ShortDescription": "File archiver"}
+        ]))
+        first = PackageSearchIndex(str(tmp_path / "index.json"))
+        first.load_dump(PackageManager.WINGET, str(dump))
+        first.save()
+
+        second = PackageSearchIndex(str(tmp_path / "index.json"))
+        assert second.load()
+        found = second.search("archiver")
+        assert [(p.package_id, p.version, p.manager) for p in found] == [
+            ("7zip.7zip", "23.01", PackageManager.WINGET)
+        ]
+
+    def test_queries_under_10ms(self):
+        """Test prefix and fuzzy queries stay fast on a large catalog"""
+        rng = random.Random(7)
+        words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(5000)]
+        index = PackageSearchIndex()
+        index.update_catalog(PackageManager.CHOCOLATEY, [
+            package(f"{rng.choice(words)}.{rng.choice(words)}{i}", manager=PackageManager.CHOCOLATEY,
+                    description=" ".join(rng.choices(words, k=8)))
+            for i in range(20000)
+        ])
+        index.search("warm")
+
+        for query in (words[0][:2], words[1], words[2][:-1] + "q", f"{words[3]} {words[4][:3]}"):
+            timings = []
+            for _ in range(3):
+                start = time.perf_counter()
+                index.search(query)
+                timings.append(time.perf_counter() - start)
+            assert min(timings) < 0.01, query
+
@@ -0,0 +1,580 @@
+"""
+Tests for package_manager module
+"""
+
+import os
+import json
+import time
+import threading
+from typing import List, Optional
+
+import pytest
+
+from better11.command_backend import FakeBackend, Transcript
+from better11.package_manager import (
+    BasePackageManager,
+    Package,
+    PackageCache,
+    PackageManager,
+    PackageStatus,
+    UnifiedPackageManager,
+)
+
+
+class FakeManager(BasePackageManager):
+    """In-memory package manager used to exercise UnifiedPackageManager"""
+
+    def __init__(self, manager_type: PackageManager, packages=None, delay: float = 0.0,
+                 available: bool = True):
+        super().__init__()
+        self.manager_type = manager_type
+        self.packages = packages or []
+        self.delay = delay
+        self.available = available
+        self.calls = []
+
+    def is_available(self) -> bool:
+        self.calls.append("is_available")
+        return self.available
+
+    def search(self, query: str, limit: int = 50) -> List[Package]:
+        self.calls.append("search")
+        time.sleep(self.delay)
+        return [p for p in self.packages if query in p.name][:limit]
+
+    def list_installed(self) -> List[Package]:
+        self.calls.append("list_installed")
+        time.sleep(self.delay)
+        return list(self.packages)
+
+    def install(self, package_id: str, version: Optional[str] = None) -> bool:
+        self.calls.append(("install", package_id, version))
+        return True
+
+    def uninstall(self, package_id: str) -> bool:
+        self.calls.append(("uninstall", package_id))
+        return True
+
+    def update(self, package_id: Optional[str] = None) -> bool:
+        self.calls.append(("update", package_id))
+        return True
+
+
+def make_package(name: str, manager: PackageManager, version: str = "1.0") -> Package:
+    return Package(name=name, package_id=name, version=version, manager=manager,
+                   status=PackageStatus.INSTALLED)
+
+
+@pytest.fixture
+def unified(tmp_path):
+    manager = UnifiedPackageManager(cache_dir=str(tmp_path / "cache"))
+    manager.managers = {
+        PackageManager.WINGET: FakeManager(
+            PackageManager.WINGET, [make_package("git", PackageManager.WINGET)], delay=0.2),
+        PackageManager.PIP: FakeManager(
+            PackageManager.PIP, [make_package("gitpython", PackageManager.PIP)]),
+        PackageManager.NPM: FakeManager(PackageManager.NPM, available=False),
+    }
+    return manager
+
+
+class TestUnifiedPackageManagerFanOut:
+    """Tests for concurrent search and listing"""
+
+    def test_search_runs_managers_concurrently(self, unified):
+        """Test results from every available manager are merged"""
+        results = unified.search("git")
+
+        assert set(results) == {PackageManager.WINGET, PackageManager.PIP}
+        assert unified.managers[PackageManager.NPM].calls == ["is_available"]
+
+    def test_iter_search_yields_fast_managers_first(self, unified):
+        """Test a slow manager does not delay the others"""
+        order = [mgr for mgr, _ in unified.iter_search("git")]
+
+        assert order == [PackageManager.PIP, PackageManager.WINGET]
+
+    def test_timeout_abandons_slow_manager(self, unified):
+        """Test managers exceeding the timeout are dropped"""
+        unified.managers[PackageManager.WINGET].delay = 2.0
+
+        started = time.monotonic()
+        results = unified.list_all_installed(timeout=0.5)
+
+        assert time.monotonic() - started < 1.5
+        assert list(results) == [PackageManager.PIP]
+
+    def test_timeout_kills_abandoned_commands(self, unified, tmp_path):
+        """Test processes of a timed-out manager are killed, not left running"""
+        import signal
+        import sys
+        from better11.command_backend import AsyncioBackend
+
+        pid_file = tmp_path / "pid"
+        script = f"import os, time; open({str(pid_file)!r}, 'w').write(str(os.getpid())); time.sleep(30)"
+
+        class HungManager(FakeManager):
+            def list_installed(self):
+                self._run_command([sys.executable, "-c", script], check=False)
+                return [make_package("late", PackageManager.WINGET)]
+
+        backend = AsyncioBackend()
+        unified.managers[PackageManager.WINGET] = HungManager(PackageManager.WINGET)
+        unified.managers[PackageManager.WINGET].backend = backend
+
+        results = unified.list_all_installed(timeout=1.0)
+        assert list(results) == [PackageManager.PIP]
+
+        pid = int(pid_file.read_text())
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            try:
+                os.kill(pid, 0)
+            except OSError:
+                break
+            time.sleep(0.05)
+        else:
+            os.kill(pid, signal.SIGKILL)
+            pytest.fail("abandoned command is still running")
+
+
+class TestCapabilityRegistry:
+    """Tests for memoized availability probes"""
+
+    def test_probe_is_cached_until_ttl(self, unified):
+        """Test repeated queries reuse one availability probe"""
+        unified.search("git")
+        unified.search("git")
+        unified.list_all_installed()
+
+        assert unified.managers[PackageManager.PIP].calls.count("is_available") == 1
+
+        unified.capabilities.invalidate(PackageManager.PIP)
+        unified.search("git")
+        assert unified.managers[PackageManager.PIP].calls.count("is_available") == 2
+
+    def test_missing_executable_spawns_nothing(self):
+        """Test shutil.which short-circuits the version command"""
+        from unittest.mock import patch
+        from better11.package_manager import WinGetManager
+
+        backend = FakeBackend()
+        mgr = WinGetManager(backend=backend)
+        with patch("better11.package_manager.shutil.which", return_value=None):
+            assert mgr.probe() == (False, None, "")
+        assert backend.calls == []
+
+    def test_probe_records_path_and_version(self):
+        """Test version and executable path are captured"""
+        from unittest.mock import patch
+        from better11.package_manager import CapabilityRegistry, ChocolateyManager
+
+        backend = FakeBackend([Transcript(["choco", "--version"], stdout="2.2.2\n")])
+        managers = {PackageManager.CHOCOLATEY: ChocolateyManager(backend=backend)}
+        registry = CapabilityRegistry(managers)
+        registry.invalidate()
+        with patch("better11.package_manager.shutil.which", return_value="C:/choco/choco.exe"):
+            capability = registry.probe_all()[PackageManager.CHOCOLATEY]
+            registry.probe_all()
+
+        assert capability.available
+        assert capability.executable == "C:/choco/choco.exe"
+        assert capability.version == "2.2.2"
+        assert len(backend.calls) == 1
+        registry.invalidate()
+
+
+class TestInventory:
+    """Tests for installed-package snapshots"""
+
+    def test_refresh_reports_diff(self, unified):
+        """Test snapshots persist and diffs track added, removed and changed"""
+        first = unified.refresh_inventory()
+        assert [p.name for p in first[PackageManager.PIP].added] == ["gitpython"]
+
+        pip = unified.managers[PackageManager.PIP]
+        pip.packages = [
+            make_package("gitpython", PackageManager.PIP, version="2.0"),
+            make_package("requests", PackageManager.PIP),
+        ]
+        second = unified.refresh_inventory()[PackageManager.PIP]
+
+        assert [p.name for p in second.added] == ["requests"]
+        assert [(old.version, new.version) for old, new in second.changed] == [("1.0", "2.0")]
+        assert second.removed == []
+
+    def test_get_installed_uses_snapshot(self, unified):
+        """Test cached inventory avoids re-listing"""
+        unified.get_installed(PackageManager.PIP)
+        unified.get_installed(PackageManager.PIP)
+
+        assert unified.managers[PackageManager.PIP].calls.count("list_installed") == 1
+
+    def test_pip_update_all_is_one_batched_command(self):
+        """Test bulk pip upgrade issues a single install -U"""
+        from better11.package_manager import PipManager
+
+        outdated = json.dumps([{"name": "a", "version": "1"}, {"name": "b", "version": "1"}])
+        backend = FakeBackend([
+            Transcript(["python", "-m", "pip", "list", "--outdated"], stdout=outdated),
+            Transcript(["python", "-m", "pip", "install", "--upgrade"]),
+        ])
+        assert PipManager(python_exe="python", backend=backend).update()
+
+        assert backend.calls == [
+            ["python", "-m", "pip", "list", "--outdated", "--format=json"],
+            ["python", "-m", "pip", "install", "--upgrade", "a", "b"],
+        ]
+
+
+class TestPackageCache:
+    """Tests for the content-addressed package cache"""
+
+    @pytest.fixture
+    def installer(self, tmp_path):
+        path = tmp_path / "setup.exe"
+        path.write_bytes(b"installer" * 1000)
+        return path
+
+    def test_identical_payloads_stored_once(self, tmp_path, installer):
+        """Test the same installer under two versions shares one blob"""
+        cache = PackageCache(str(tmp_path / "cache"))
+        first = cache.cache_package(make_package("tool", PackageManager.WINGET, "1.0"), str(installer))
+        second = cache.cache_package(make_package("tool", PackageManager.CHOCOLATEY, "1.1"), str(installer))
+
+        assert first.checksum == second.checksum
+        assert len(list(cache.blobs.iter_blobs())) == 1
+        assert open(second.cache_path, "rb").read() == installer.read_bytes()
+
+        found = cache.get_cached_package(PackageManager.WINGET, "tool", "1.0")
+        assert found.package.manager == PackageManager.WINGET
+
+    def test_versions_with_same_file_name_do_not_collide(self, tmp_path):
+        """Test two releases of one installer keep separate files"""
+        cache = PackageCache(str(tmp_path / "cache"))
+        old_path = tmp_path / "v1" / "setup.exe"
+        new_path = tmp_path / "v2" / "setup.exe"
+        for path, data in ((old_path, b"old" * 100), (new_path, b"new" * 100)):
+            path.parent.mkdir()
+            path.write_bytes(data)
+
+        old = cache.cache_package(make_package("tool", PackageManager.WINGET, "1.0"), str(old_path))
+        new = cache.cache_package(make_package("tool", PackageManager.WINGET, "2.0"), str(new_path))
+        assert old.cache_path != new.cache_path
+        assert sorted(os.listdir(cache.feed_dir(PackageManager.WINGET))) == ["setup-1.0.exe", "setup-2.0.exe"]
+
+        # Evicting the old release leaves the new one intact
+        cache._drop_entries([("winget", "tool", "1.0")])
+        assert open(new.cache_path, "rb").read() == b"new" * 100
+        assert os.listdir(cache.feed_dir(PackageManager.WINGET)) == ["setup-2.0.exe"]
+
+    def test_recaching_releases_replaced_payload(self, tmp_path):
+        """Test caching a version again drops the payload it replaced"""
+        from better11.blob_store import BlobStore
+
+        cache = PackageCache(str(tmp_path / "cache"))
+        for data in (b"first" * 100, b"second" * 100):
+            path = tmp_path / "setup.msi"
+            path.write_bytes(data)
+            cached = cache.cache_package(make_package("tool", PackageManager.WINGET), str(path))
+
+        assert [digest for digest, _ in cache.blobs.iter_blobs()] == [cached.checksum]
+        assert os.listdir(cache.feed_dir(PackageManager.WINGET)) == ["setup-1.0.msi"]
+        assert open(cached.cache_path, "rb").read() == b"second" * 100
+        assert not os.stat(cached.cache_path).st_mode & 0o222
+
+        # Entries whose payload is gone are not listed
+        BlobStore.unlink(cached.cache_path)
+        assert cache.list_cached() == []
+
+    def test_cached_files_are_read_only(self, tmp_path, installer):
+        """Test hardlinked payloads cannot be modified in place"""
+        cache = PackageCache(str(tmp_path / "cache"))
+        cached = cache.cache_package(make_package("tool", PackageManager.WINGET), str(installer))
+
+        assert not os.stat(cached.cache_path).st_mode & 0o222
+        assert cache.clear_cache() == installer.stat().st_size
+
+    def test_size_limit_evicts_least_recently_used(self, tmp_path):
+        """Test inserting past the size limit evicts the oldest payload"""
+        cache = PackageCache(str(tmp_path / "cache"), max_size_bytes=2500)
+        for name in ("a", "b", "c"):
+            path = tmp_path / f"{name}.msi"
+            path.write_bytes(name.encode() * 1000)
+            cache.cache_package(make_package(name, PackageManager.WINGET), str(path))
+            if name == "a":
+                cache.store.touch(("winget", "a", "1.0"), time.time() - 100)
+            if name == "b":
+                # Touch a so b becomes the least recently used
+                cache.get_cached_package(PackageManager.WINGET, "a", "1.0")
+
+        assert [c.package.name for c in cache.list_cached()] == ["a", "c"]
+        assert cache.blobs.total_size() == 2000
+
+    def test_prune_by_age(self, tmp_path, installer):
+        """Test entries unused for longer than max_age_days are removed"""
+        cache = PackageCache(str(tmp_path / "cache"))
+        cached = cache.cache_package(make_package("old", PackageManager.PIP), str(installer))
+        cache.store.touch(("pip", "old", "1.0"), time.time() - 40 * 86400)
+
+        assert cache.prune(max_age_days=30) == installer.stat().st_size
+        assert cache.list_cached() == []
+        assert not os.path.exists(cached.cache_path)
+
+    def test_clear_cache_deletes_payloads(self, tmp_path, installer):
+        """Test clearing one manager removes its files but keeps shared payloads"""
+        cache = PackageCache(str(tmp_path / "cache"))
+        winget = cache.cache_package(make_package("tool", PackageManager.WINGET), str(installer))
+        choco = cache.cache_package(make_package("tool", PackageManager.CHOCOLATEY), str(installer))
+
+        assert cache.clear_cache(PackageManager.WINGET) == 0
+        assert not os.path.exists(winget.cache_path)
+        assert os.path.exists(choco.cache_path)
+
+        assert cache.clear_cache() == installer.stat().st_size
+        assert not os.path.exists(choco.cache_path)
+        assert list(cache.blobs.iter_blobs()) == []
+
+    def test_migrates_json_metadata(self, tmp_path, installer):
+        """Test a legacy cache_metadata.json is imported and set aside"""
+        cache_dir = tmp_path / "cache"
+        legacy_path = cache_dir / "winget" / "tool" / "setup.exe"
+        legacy_path.parent.mkdir(parents=True)
+        legacy_path.write_bytes(installer.read_bytes())
+        package = make_package("tool", PackageManager.WINGET)
+        (cache_dir / "cache_metadata.json").write_text(json.dumps({
+            "winget:tool:1.0": {
+                "package": package.to_dict(),
+                "cache_path": str(legacy_path),
+                "cache_date": "2024-01-01T00:00:00",
+                "checksum": "abc"
+            }
+        }))
+
+        cache = PackageCache(str(cache_dir))
+
+        assert [c.package.package_id for c in cache.list_cached()] == ["tool"]
+        assert not (cache_dir / "cache_metadata.json").exists()
+        assert (cache_dir / "cache_metadata.json.migrated").exists()
+        assert cache.clear_cache() == 0
+        assert not legacy_path.exists()
+
+    def test_concurrent_writers(self, tmp_path):
+        """Test two cache instances on one directory both persist their entries"""
+        first = PackageCache(str(tmp_path / "cache"))
+        second = PackageCache(str(tmp_path / "cache"))
+
+        def fill(cache, prefix):
+            for i in range(20):
+                path = tmp_path / f"{prefix}{i}.bin"
+                path.write_bytes(f"{prefix}{i}".encode())
+                cache.cache_package(make_package(f"{prefix}{i}", PackageManager.PIP), str(path))
+
+        threads = [threading.Thread(target=fill, args=(c, p)) for c, p in ((first, "a"), (second, "b"))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(PackageCache(str(tmp_path / "cache")).list_cached()) == 40
+
+
+class DownloadingManager(FakeManager):
+    """Fake manager that produces artifacts and installs them from a feed"""
+
+    def download(self, package_id, version, dest_dir):
+        self.calls.append("download")
+        path = os.path.join(dest_dir, f"{package_id}-{version}.pkg")
+        with open(path, "w") as f:
+            f.write(f"{package_id} {version}")
+        return [(make_package(package_id, self.manager_type, version), path)]
+
+    def install_from_feed(self, package, artifact, feed_dir):
+        self.calls.append(("install_from_feed", os.path.basename(artifact), os.listdir(feed_dir)))
+        return True
+
+    def install(self, package_id, version=None):
+        self.calls.append("install")
+        return True
+
+
+class TestOfflineInstall:
+    """Tests for installing from the package cache"""
+
+    def test_prefetch_downloads_once_for_shared_cache(self, tmp_path):
+        """Test machines sharing a cache directory download each package once"""
+        machines = []
+        for _ in range(3):
+            unified = UnifiedPackageManager(cache_dir=str(tmp_path / "share"))
+            unified.managers = {PackageManager.NPM: DownloadingManager(PackageManager.NPM)}
+            machines.append(unified)
+
+        for unified in machines:
+            assert unified.install(PackageManager.NPM, "left-pad", "1.3.0", prefetch=True)
+
+        calls = [c for u in machines for c in u.managers[PackageManager.NPM].calls]
+        assert calls.count("download") == 1
+        assert calls.count("install") == 0
+        assert ("install_from_feed", "left-pad-1.3.0.pkg", ["left-pad-1.3.0.pkg"]) in calls
+
+    def test_prefetch_runs_in_parallel(self, tmp_path):
+        """Test prefetch fetches several packages and reports each"""
+        unified = UnifiedPackageManager(cache_dir=str(tmp_path / "cache"))
+        unified.managers = {PackageManager.PIP: DownloadingManager(PackageManager.PIP)}
+
+        results = unified.prefetch([(PackageManager.PIP, name, "1.0") for name in ("a", "b", "c")])
+
+        assert sorted(c.package.package_id for c in results.values()) == ["a", "b", "c"]
+        assert len(unified.cache.list_cached(PackageManager.PIP)) == 3
+
+    def test_cache_miss_falls_back_to_network(self, unified):
+        """Test an uncached package installs normally"""
+        unified.managers[PackageManager.PIP] = DownloadingManager(PackageManager.PIP)
+
+        assert unified.install(PackageManager.PIP, "requests", "2.31.0")
+        assert unified.managers[PackageManager.PIP].calls[-1] == "install"
+
+    def test_pip_artifact_identity(self):
+        """Test wheel and sdist names map to name and version"""
+        from better11.package_manager import PipManager
+
+        assert PipManager._artifact_identity("requests-2.31.0-py3-none-any.whl") == ("requests", "2.31.0")
+        assert PipManager._artifact_identity("charset_normalizer-3.3.2.tar.gz") == ("charset_normalizer", "3.3.2")
+        assert PipManager._artifact_identity("notes.txt") is None
+
+    def test_appx_feed_install_quotes_path(self):
+        """Test a cached MSIX path is passed to PowerShell as a literal"""
+        import subprocess
+        from unittest.mock import MagicMock
+        from better11.package_manager import WinGetManager
+
+        mgr = WinGetManager(backend=FakeBackend())
+        mgr._run_command = MagicMock(return_value=subprocess.CompletedProcess([], 0, "", ""))
+        package = make_package("App", PackageManager.WINGET)
+
+        assert mgr.install_from_feed(package, "C:\\feed\\O'Brien\u2019s App.msix", "C:\\feed")
+
+        command = mgr._run_command.call_args[0][0][-1]
+        assert command == "Add-AppxPackage -LiteralPath 'C:\\feed\\O''Brien\u2019\u2019s App.msix'"
+
+
+class TimedManager(FakeManager):
+    """Fake manager that records install windows and can fail packages"""
+
+    def __init__(self, manager_type, delay=0.1, fail=()):
+        super().__init__(manager_type, delay=delay)
+        self.fail = set(fail)
+        self.windows = {}
+        self._lock = threading.Lock()
+
+    def install(self, package_id, version=None):
+        start = time.perf_counter()
+        time.sleep(self.delay)
+        with self._lock:
+            self.windows[package_id] = (start, time.perf_counter())
+        return package_id not in self.fail
+
+
+def overlaps(a, b):
+    return a[0] < b[1] and b[0] < a[1]
+
+
+class TestBatchInstall:
+    """Tests for dependency-aware batch installs"""
+
+    @pytest.fixture
+    def batch(self, tmp_path):
+        unified = UnifiedPackageManager(cache_dir=str(tmp_path / "cache"))
+        unified.managers = {
+            PackageManager.WINGET: TimedManager(PackageManager.WINGET),
+            PackageManager.PIP: TimedManager(PackageManager.PIP, fail={"broken"}),
+        }
+        return unified
+
+    def test_dependencies_install_first(self, batch):
+        """Test dependents start after their dependencies finish"""
+        base = make_package("base", PackageManager.PIP)
+        app = make_package("app", PackageManager.PIP)
+        app.dependencies = ["base"]
+
+        report = batch.install_batch([app, base], concurrency={PackageManager.PIP: 4})
+
+        windows = batch.managers[PackageManager.PIP].windows
+        assert report.success
+        assert windows["base"][1] <= windows["app"][0]
+        assert report.outcomes[(PackageManager.PIP, "app")].duration >= 0.1
+
+    def test_independent_managers_run_concurrently(self, batch):
+        """Test installs of different managers overlap while WinGet stays serialized"""
+        packages = [make_package(n, PackageManager.WINGET) for n in ("w1", "w2")]
+        packages += [make_package(n, PackageManager.PIP) for n in ("p1", "p2")]
+
+        report = batch.install_batch(packages, concurrency={
+            PackageManager.WINGET: 4, PackageManager.PIP: 2
+        })
+
+        winget = batch.managers[PackageManager.WINGET].windows
+        pip = batch.managers[PackageManager.PIP].windows
+        assert report.success
+        assert not overlaps(winget["w1"], winget["w2"])
+        assert overlaps(pip["p1"], pip["p2"])
+        assert report.duration < 0.35
+
+    def test_chocolatey_is_serialized(self, tmp_path):
+        """Test Chocolatey installs never overlap, whatever limit is requested"""
+        unified = UnifiedPackageManager(cache_dir=str(tmp_path / "cache"))
+        unified.managers = {PackageManager.CHOCOLATEY: TimedManager(PackageManager.CHOCOLATEY, delay=0.05)}
+        packages = [make_package(f"c{i}", PackageManager.CHOCOLATEY) for i in range(4)]
+
+        report = unified.install_batch(packages, concurrency={PackageManager.CHOCOLATEY: 4})
+
+        windows = sorted(unified.managers[PackageManager.CHOCOLATEY].windows.values())
+        peak = max(sum(1 for other in windows if overlaps(window, other)) for window in windows)
+        assert report.success
+        assert peak == 1
+
+    def test_failure_skips_dependents(self, batch):
+        """Test packages depending on a failed install are skipped"""
+        broken = make_package("broken", PackageManager.PIP)
+        child = make_package("child", PackageManager.PIP)
+        child.dependencies = ["broken"]
+        grandchild = make_package("grandchild", PackageManager.WINGET)
+        grandchild.dependencies = ["child"]
+        other = make_package("other", PackageManager.WINGET)
+
+        report = batch.install_batch([broken, child, grandchild, other])
+
+        assert [o.package.package_id for o in report.failed] == ["broken"]
+        assert sorted(o.package.package_id for o in report.skipped) == ["child", "grandchild"]
+        assert [o.package.package_id for o in report.succeeded] == ["other"]
+        assert "grandchild" not in batch.managers[PackageManager.WINGET].windows
+
+    def test_cycle_is_rejected(self, batch):
+        """Test a dependency cycle raises before installing anything"""
+        a = make_package("a", PackageManager.PIP)
+        b = make_package("b", PackageManager.PIP)
+        a.dependencies = ["b"]
+        b.dependencies = ["a"]
+
+        with pytest.raises(ValueError, match="a, b"):
+            batch.install_batch([a, b])
+        assert batch.managers[PackageManager.PIP].windows == {}
+
+
+class TestQuickSearch:
+    """Tests for the local search index wired into UnifiedPackageManager"""
+
+    def test_search_results_feed_index(self, tmp_path):
+        """Test live search results become available to quick_search"""
+        unified = UnifiedPackageManager(cache_dir=str(tmp_path / "cache"))
+        unified.managers = {
+            PackageManager.PIP: FakeManager(PackageManager.PIP, [make_package("rich", PackageManager.PIP)])
+        }
+
+        assert unified.quick_search("rich") == []
+        unified.search("rich")
+        assert [p.package_id for p in unified.quick_search("ric")] == ["rich"]
+
+        unified.refresh_search_index()
+        reloaded = UnifiedPackageManager(cache_dir=str(tmp_path / "cache"))
+        assert [p.package_id for p in reloaded.quick_search("rich")] == ["rich"]
@@ -0,0 +1,125 @@
+"""
+Tests for package_parsers module
+"""
+
+import time
+from pathlib import Path
+
+from better11.command_backend import FakeBackend, Transcript
+from better11.package_manager import ChocolateyManager, PackageStatus, WinGetManager
+from better11.package_parsers import parse_choco_output, parse_winget_table
+
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "package_manager"
+
+
+def read_fixture(name: str) -> str:
+    return (FIXTURES / name).read_bytes().decode("utf-8")
+
+
+class TestWinGetParser:
+    """Tests for WinGet table parsing"""
+
+    def test_list_keeps_names_with_spaces(self):
+        """Test names with spaces, truncation and wide characters parse intact"""
+        rows = parse_winget_table(read_fixture("winget_list.txt"))
+
+        assert len(rows) == 9
+        assert rows[0].name == "Microsoft Visual Studio Code"
+        assert rows[0].package_id == "Microsoft.VisualStudioCode"
+        assert rows[0].version == "1.85.1"
+        assert rows[0].available == "1.86.0"
+        assert rows[2].name == "Mozilla Firefox (x64 en-US)"
+        assert rows[5].name == "微信"
+        assert rows[5].package_id == "Tencent.WeChat"
+        assert rows[5].source == "winget"
+        assert rows[7].package_id == "Microsoft.VCRedist.2015+.x64"
+        assert rows[7].source is None
+        assert rows[8].package_id == "Steam App 730"
+        assert rows[8].name == "Counter-Strike 2"
+
+    def test_search_reads_match_column(self):
+        """Test search tables map the Match column"""
+        rows = parse_winget_table(read_fixture("winget_search.txt"))
+
+        assert [r.package_id for r in rows] == [
+            "Python.Python.3.12", "Python.Launcher", "Python.Python.3.11"
+        ]
+        assert rows[0].match == "Tag: python"
+        assert rows[1].match is None
+
+    def test_skips_footer_spanning_columns(self):
+        """Test free text crossing column boundaries is not read as a row"""
+        header = f"{'Name':<20}{'Id':<20}{'Version':<10}Available"
+        output = "\n".join([
+            header,
+            "-" * len(header),
+            f"{'Git':<20}{'Git.Git':<20}{'2.43.0':<10}2.44.0",
+            "The following packages have an upgrade available, but require explicit targeting:",
+        ])
+
+        assert [r.package_id for r in parse_winget_table(output)] == ["Git.Git"]
+
+    def test_ignores_output_without_table(self):
+        """Test messages with no header produce no rows"""
+        assert parse_winget_table("No installed package found matching input criteria.") == []
+
+    def test_large_table_is_linear(self):
+        """Test 10k rows parse quickly and completely"""
+        header = f"{'Name':<40}{'Id':<40}{'Version':<16}Source"
+        body = "\n".join(
+            f"{'Package number ' + str(i):<40}{'Vendor.Package' + str(i):<40}{'1.0.' + str(i):<16}winget"
+            for i in range(10000)
+        )
+        output = f"{header}\n{'-' * len(header)}\n{body}\n"
+
+        start = time.perf_counter()
+        rows = parse_winget_table(output)
+        elapsed = time.perf_counter() - start
+
+        assert len(rows) == 10000
+        assert rows[-1].name == "Package number 9999"
+        assert elapsed < 2.0
+
+    def test_manager_uses_parser(self):
+        """Test WinGetManager.list_installed builds packages from the table"""
+        backend = FakeBackend([Transcript(["winget", "list"], stdout=read_fixture("winget_list.txt"))])
+        packages = WinGetManager(backend=backend).list_installed()
+
+        assert packages[0].status == PackageStatus.UPDATE_AVAILABLE
+        assert packages[1].name == "Git"
+        assert packages[1].status == PackageStatus.INSTALLED
+
+
+class TestChocolateyParser:
+    """Tests for Chocolatey limit-output parsing"""
+
+    def test_list_and_search(self):
+        """Test records parse and warnings are skipped"""
+        installed = parse_choco_output(read_fixture("choco_list.txt"))
+        found = parse_choco_output(read_fixture("choco_search.txt"))
+
+        assert [r.package_id for r in installed][:3] == ["chocolatey", "chocolatey-core.extension", "git"]
+        assert [(r.package_id, r.version) for r in found] == [
+            ("python", "3.12.1"), ("python3", "3.12.1"), ("python2", "2.7.18")
+        ]
+
+    def test_outdated_fields(self):
+        """Test outdated records carry available version and pin state"""
+        rows = parse_choco_output(read_fixture("choco_outdated.txt"))
+
+        assert rows[0].available == "2.44.0"
+        assert not rows[0].pinned
+        assert rows[1].pinned
+
+    def test_list_command_depends_on_version(self):
+        """Test --local-only is only passed to choco before 2.0"""
+        backend = FakeBackend([Transcript(["choco", "list"], stdout=read_fixture("choco_list.txt"))])
+        manager = ChocolateyManager(backend=backend)
+        manager._major = 1
+        packages = manager.list_installed()
+        manager._major = 2
+        manager.list_installed()
+
+        assert backend.calls == [["choco", "list", "-r", "--local-only"], ["choco", "list", "-r"]]
+        assert len(packages) == 5
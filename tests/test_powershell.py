@@ -0,0 +1,144 @@
+"""Tests for the persistent PowerShell host pool."""
+import base64
+import subprocess
+import threading
+import time
+
+import pytest
+
+from system_tools.powershell import PowerShellPool, powershell_command, stand_in_command
+from system_tools.sysinfo import SystemInfoManager
+
+
+@pytest.fixture
+def pool():
+    """Pool of stand-in hosts."""
+    with PowerShellPool(size=2, command=stand_in_command(), timeout=10) as pool:
+        yield pool
+
+
+class TestPowerShellPool:
+    """Test PowerShellPool against the stand-in host."""
+
+    def test_round_trip(self, pool):
+        """Test output and exit codes come back like subprocess.run."""
+        result = pool.run("print('{\"Name\": \"host\"}')")
+        assert isinstance(result, subprocess.CompletedProcess)
+        assert result.returncode == 0
+        assert result.stdout == '{"Name": "host"}\n'
+
+        assert pool.run("print('done'); import sys; sys.exit(3)").returncode == 3
+
+    def test_exit_keeps_output(self, pool):
+        """Test an explicit exit code is returned with the output before it."""
+        result = pool.run("print('partial'); import sys; sys.exit(4)")
+
+        assert result.returncode == 4
+        assert result.stdout == "partial\n"
+
+    def test_non_terminating_error_fails(self, pool):
+        """Test a non-terminating error gives exit code 1 and keeps output."""
+        result = pool.run("print('rows'); write_error('access denied')")
+
+        assert result.returncode == 1
+        assert result.stdout == "rows\n"
+        assert "access denied" in result.stderr
+        # The host survives non-terminating errors
+        assert pool.spawned == 1
+
+    def test_explicit_exit_overrides_errors(self, pool):
+        """Test an explicit exit 0 wins over earlier non-terminating errors."""
+        result = pool.run("write_error('ignored'); import sys; sys.exit(0)")
+
+        assert result.returncode == 0
+
+    def test_host_is_reused(self, pool):
+        """Test requests share one running host and its state."""
+        pool.run("import os; counter = 1")
+        result = pool.run("counter += 1; print(counter, os.getpid())")
+
+        assert result.stdout.split()[0] == "2"
+        assert pool.spawned == 1
+
+    def test_error_recycles_host(self, pool):
+        """Test a terminating error is reported and the host replaced."""
+        result = pool.run("raise ValueError('bad query')")
+        assert result.returncode == 1
+        assert "bad query" in result.stderr
+
+        assert pool.run("print('again')").stdout == "again\n"
+        assert pool.spawned == 2
+
+    def test_timeout_recycles_host(self, pool):
+        """Test a hung script raises TimeoutExpired and its host is killed."""
+        start = time.perf_counter()
+        with pytest.raises(subprocess.TimeoutExpired):
+            pool.run("import time; time.sleep(30)", timeout=0.5)
+
+        assert time.perf_counter() - start < 5
+        assert pool.run("print('ok')").returncode == 0
+        assert pool.spawned == 2
+
+    def test_crash_is_reported(self, pool):
+        """Test a host that dies mid-request yields a failed result."""
+        result = pool.run("import os; os._exit(5)")
+
+        assert result.returncode == 1
+        assert "exited" in result.stderr
+        assert pool.run("print('ok')").returncode == 0
+
+    def test_max_uses(self):
+        """Test hosts are replaced after max_uses requests."""
+        with PowerShellPool(size=1, command=stand_in_command(), max_uses=2) as pool:
+            for _ in range(5):
+                pool.run("pass")
+
+            assert pool.spawned == 3
+
+    def test_concurrent_requests(self, pool):
+        """Test requests run in parallel up to the pool size."""
+        pool.warm()
+        results = []
+
+        def query():
+            results.append(pool.run("import time; time.sleep(0.5); print('x')"))
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=query) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert [r.stdout for r in results] == ["x\n"] * 4
+        assert time.perf_counter() - start < 1.9
+        assert pool.spawned == 2
+
+    def test_closed_pool_rejects_requests(self, pool):
+        """Test requests after close raise RuntimeError."""
+        pool.close()
+        with pytest.raises(RuntimeError):
+            pool.run("pass")
+
+    def test_powershell_command_encodes_host(self):
+        """Test the real host loop is passed as an encoded command."""
+        command = powershell_command()
+        assert command[0] == "powershell"
+        assert command[-2] == "-EncodedCommand"
+
+        script = base64.b64decode(command[-1]).decode("utf-16-le")
+        # Scripts run from a .ps1 so "exit N" sets $LASTEXITCODE, and
+        # non-terminating errors are reported through HadErrors
+        assert "& $Path" in script
+        assert "HadErrors" in script
+
+
+class TestPowerShellInjection:
+    """Test system tools receive the pool through their constructor."""
+
+    def test_tool_uses_injected_pool(self, pool):
+        """Test run_powershell goes to the injected pool."""
+        manager = SystemInfoManager(powershell=pool)
+
+        assert manager.powershell is pool
+        assert manager.run_powershell("print('via pool')").stdout == "via pool\n"
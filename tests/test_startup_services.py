@@ -0,0 +1,128 @@
+"""Tests for collecting auto-start services."""
+import json
+import subprocess
+import threading
+import time
+from unittest.mock import patch
+
+from system_tools.startup import (
+    StartupLocation,
+    StartupManager,
+    parse_sc_query,
+    parse_sc_start_type,
+    parse_service_records,
+)
+
+
+SERVICES_JSON = json.dumps([
+    {"Name": "Spooler", "DisplayName": "Print Spooler", "StartMode": "Auto", "State": "Running",
+     "DelayedAutoStart": False},
+    {"Name": "wuauserv", "DisplayName": "Windows Update", "StartMode": "Manual", "State": "Stopped"},
+    {"Name": "edgeupdate", "DisplayName": "Microsoft Edge Update Service", "StartMode": "Auto",
+     "State": "Stopped", "DelayedAutoStart": True},
+])
+
+SC_QUERY_OUTPUT = """
+SERVICE_NAME: Spooler
+DISPLAY_NAME: Print Spooler
+        TYPE               : 110  WIN32_OWN_PROCESS  (interactive)
+        STATE              : 4  RUNNING
+                                (STOPPABLE, NOT_PAUSABLE, IGNORES_SHUTDOWN)
+
+SERVICE_NAME: wuauserv
+DISPLAY_NAME: Windows Update
+        TYPE               : 20  WIN32_SHARE_PROCESS
+        STATE              : 1  STOPPED
+"""
+
+SC_QC_OUTPUT = """[SC] QueryServiceConfig SUCCESS
+
+SERVICE_NAME: {name}
+        TYPE               : 110  WIN32_OWN_PROCESS  (interactive)
+        START_TYPE         : {start}
+        ERROR_CONTROL      : 1   NORMAL
+"""
+
+
+class ServicePool:
+    """Stand-in for PowerShellPool answering the bulk service query."""
+
+    def __init__(self, stdout="", error=None):
+        self.stdout = stdout
+        self.error = error
+        self.scripts = []
+
+    def run(self, script, timeout=None):
+        self.scripts.append(script)
+        if self.error:
+            raise self.error
+        return subprocess.CompletedProcess(script, 0, self.stdout, "")
+
+
+class TestServiceQuery:
+    """Test collecting auto-start services."""
+
+    def test_parse_service_records(self):
+        """Test bulk JSON output parses, including a single object."""
+        records = parse_service_records(SERVICES_JSON)
+
+        assert [r.name for r in records] == ["Spooler", "wuauserv", "edgeupdate"]
+        assert records[0].auto_start and records[0].running
+        assert not records[1].auto_start
+        assert records[2].delayed_auto_start
+        assert len(parse_service_records(json.dumps({"Name": "Solo", "StartMode": "Auto"}))) == 1
+        assert parse_service_records("") == []
+
+    def test_parse_sc_output(self):
+        """Test the sc fallback parsers."""
+        services = parse_sc_query(SC_QUERY_OUTPUT)
+
+        assert services == [
+            {"name": "Spooler", "display_name": "Print Spooler", "state": "Running"},
+            {"name": "wuauserv", "display_name": "Windows Update", "state": "Stopped"},
+        ]
+        assert parse_sc_start_type(SC_QC_OUTPUT.format(name="x", start="2   AUTO_START  (DELAYED)")) == "Auto"
+        assert parse_sc_start_type(SC_QC_OUTPUT.format(name="x", start="3   DEMAND_START")) == "Manual"
+
+    @patch('system_tools.startup.subprocess.run')
+    @patch('system_tools.startup.platform.system', return_value="Windows")
+    def test_bulk_query_runs_once(self, mock_system, mock_run):
+        """Test every service comes from one query and no sc processes."""
+        pool = ServicePool(SERVICES_JSON)
+        items = StartupManager(powershell=pool)._get_service_items()
+
+        assert len(pool.scripts) == 1
+        assert "Win32_Service" in pool.scripts[0]
+        mock_run.assert_not_called()
+        assert [(i.name, i.command, i.enabled) for i in items] == [
+            ("Print Spooler", "Service: Spooler", True),
+            ("Microsoft Edge Update Service", "Service: edgeupdate", False),
+        ]
+        assert all(i.location == StartupLocation.SERVICES for i in items)
+
+    @patch('system_tools.startup.platform.system', return_value="Windows")
+    def test_sc_fallback_runs_concurrently(self, mock_system):
+        """Test sc qc calls overlap when the bulk query is unavailable."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def fake_run(cmd, **kwargs):
+            if cmd[:2] == ["sc", "query"]:
+                return subprocess.CompletedProcess(cmd, 0, SC_QUERY_OUTPUT, "")
+            with lock:
+                active.append(cmd[2])
+                peak.append(len(active))
+            time.sleep(0.1)
+            with lock:
+                active.remove(cmd[2])
+            start = "2   AUTO_START" if cmd[2] == "Spooler" else "3   DEMAND_START"
+            return subprocess.CompletedProcess(cmd, 0, SC_QC_OUTPUT.format(name=cmd[2], start=start), "")
+
+        pool = ServicePool(error=FileNotFoundError("powershell"))
+        with patch('system_tools.startup.subprocess.run', side_effect=fake_run) as mock_run:
+            items = StartupManager(powershell=pool)._get_service_items()
+
+        assert mock_run.call_count == 3
+        assert max(peak) == 2
+        assert [(i.name, i.enabled) for i in items] == [("Print Spooler", True)]
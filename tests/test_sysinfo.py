@@ -1,5 +1,7 @@
 """Tests for System Information gathering."""
+import json
 import platform
+import subprocess
 from datetime import datetime
 from unittest.mock import patch
 
@@ -15,6 +17,9 @@ from system_tools.sysinfo import (
     BIOSInfo,
     SystemSummary,
     SystemInfoManager,
+    SUMMARY_SECTIONS,
+    SystemInfoCache,
+    build_section_script,
 )
 
 
@@ -319,6 +324,161 @@ class TestSystemInfoManager:
         manager.validate_environment()
 
 
+class RecordingPool:
+    """Stand-in for PowerShellPool that returns a canned JSON document."""
+
+    def __init__(self, document):
+        self.document = document
+        self.scripts = []
+
+    def run(self, script, timeout=None):
+        self.scripts.append(script)
+        return subprocess.CompletedProcess(script, 0, json.dumps(self.document), "")
+
+
+SECTIONS_DOCUMENT = {
+    "computer": {"Domain": "WORKGROUP", "Manufacturer": "Contoso", "Model": "Desk 1"},
+    "windows": {"Version": "10.0.22631", "Build": "22631", "Edition": "Microsoft Windows 11 Pro",
+                "LastBoot": "2024-01-01T08:00:00+00:00"},
+    "cpu": {"Name": " Contoso CPU ", "Cores": 8, "Logical": 16, "MaxClock": 4000},
+    "cpu_load": {"Usage": 12},
+    "memory": {"Total": 16 * 1024 ** 3, "Type": 26},
+    "memory_usage": {"Available": 4 * 1024 ** 3},
+    "gpus": [{"Name": "Contoso GPU", "DriverDate": "2023-06-01T00:00:00+00:00"}],
+    "storage": [{"Name": "PHYSICALDRIVE0", "Model": "Contoso NVMe 1TB", "Size": "1000204886016"}],
+    "network": [],
+    "bios": None,
+}
+
+
+class TestBatchedSummary:
+    """Test that the summary is collected by one PowerShell invocation."""
+
+    def test_section_script_covers_every_section(self):
+        """Test the combined script queries each section once."""
+        script = build_section_script(SUMMARY_SECTIONS)
+
+        for name in SUMMARY_SECTIONS:
+            assert script.count(f"$Sections['{name}'] = ") == 2
+        assert "Win32_BIOS" in script
+        assert script.rstrip().endswith("ConvertTo-Json -Depth 5 -Compress")
+
+    @patch('system_tools.sysinfo.platform.system', return_value="Windows")
+    def test_summary_uses_one_invocation(self, mock_system):
+        """Test every section is parsed from a single JSON document."""
+        pool = RecordingPool(SECTIONS_DOCUMENT)
+        summary = SystemInfoManager(powershell=pool, cache=SystemInfoCache()).get_system_summary()
+
+        assert len(pool.scripts) == 1
+        assert summary.manufacturer == "Contoso"
+        assert summary.windows.edition == "Microsoft Windows 11 Pro"
+        assert summary.windows.uptime_hours > 0
+        assert summary.cpu.name == "Contoso CPU"
+        assert summary.memory.type_name == "DDR4"
+        assert summary.memory.usage_percent == 75.0
+        assert summary.gpus[0].driver_date.year == 2023
+        assert summary.storage[0].media_type == "NVMe"
+        assert summary.storage[0].size_bytes == 1000204886016
+        assert summary.network == []
+        # A failed section falls back to empty defaults
+        assert summary.bios.manufacturer == ""
+
+    @patch('system_tools.sysinfo.platform.system', return_value="Windows")
+    def test_single_section_query(self, mock_system):
+        """Test individual getters query only their own section."""
+        pool = RecordingPool({"cpu": SECTIONS_DOCUMENT["cpu"], "cpu_load": {"Usage": 12}})
+        cpu = SystemInfoManager(powershell=pool, cache=SystemInfoCache()).get_cpu_info()
+
+        assert cpu.cores == 8
+        assert cpu.current_usage == 12.0
+        assert "Win32_Processor" in pool.scripts[0]
+        assert "Win32_BIOS" not in pool.scripts[0]
+
+
+class FakeClock:
+    """Controllable replacement for time.time."""
+
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestSystemInfoCache:
+    """Test the tiered section cache."""
+
+    def test_sections_expire_by_volatility(self):
+        """Test live sections expire in seconds, static ones stay."""
+        clock = FakeClock()
+        cache = SystemInfoCache(clock=clock, boot_time=lambda: 500.0)
+        cache.update({"bios": {"Version": "1.0"}, "storage": [], "cpu_load": {"Usage": 5}, "cpu": None})
+
+        clock.now += 10
+        assert cache.get("bios") == {"Version": "1.0"}
+        assert cache.get("storage") == []
+        assert cache.get("cpu_load") is None
+        assert cache.get("cpu_load", allow_stale=True) == {"Usage": 5}
+        assert not cache.contains("cpu")
+
+        clock.now += 600
+        assert not cache.is_fresh("storage")
+        assert cache.is_fresh("bios")
+
+    def test_persists_until_boot_time_changes(self, tmp_path):
+        """Test entries survive a restart but not a reboot."""
+        path = str(tmp_path / "sysinfo.json")
+        SystemInfoCache(path, boot_time=lambda: 500.0).update({"bios": {"Version": "1.0"}})
+
+        assert SystemInfoCache(path, boot_time=lambda: 520.0).get("bios") == {"Version": "1.0"}
+        assert SystemInfoCache(path, boot_time=lambda: 90_000.0).get("bios") is None
+
+    def test_unknown_boot_time_is_not_persisted(self, tmp_path):
+        """Test nothing is written when reboots cannot be detected."""
+        path = tmp_path / "sysinfo.json"
+        SystemInfoCache(str(path), boot_time=lambda: None).update({"bios": {}})
+
+        assert not path.exists()
+
+    @patch('system_tools.sysinfo.platform.system', return_value="Windows")
+    def test_refresh_queries_only_expired_sections(self, mock_system):
+        """Test a later summary re-reads only live counters."""
+        clock = FakeClock()
+        document = dict(SECTIONS_DOCUMENT, bios={"Manufacturer": "Contoso"})
+        pool = RecordingPool(document)
+        manager = SystemInfoManager(powershell=pool, cache=SystemInfoCache(clock=clock, boot_time=lambda: 0.0))
+
+        manager.get_system_summary()
+        clock.now += 10
+        summary = manager.get_system_summary()
+
+        assert len(pool.scripts) == 2
+        assert "$Sections['cpu_load']" in pool.scripts[1]
+        assert "$Sections['memory_usage']" in pool.scripts[1]
+        assert "Win32_BIOS" not in pool.scripts[1]
+        assert summary.bios.manufacturer == "Contoso"
+
+    @patch('system_tools.sysinfo.platform.system', return_value="Windows")
+    def test_quick_summary_served_from_cache(self, mock_system):
+        """Test the quick summary re-queries only live counters once sections are cached."""
+        clock = FakeClock()
+        pool = RecordingPool(SECTIONS_DOCUMENT)
+        manager = SystemInfoManager(powershell=pool, cache=SystemInfoCache(clock=clock, boot_time=lambda: 0.0))
+        manager.get_quick_summary()
+        pool.document = {"bios": None, "cpu_load": {"Usage": 50}, "memory_usage": {"Available": 8 * 1024 ** 3}}
+
+        clock.now += 3600
+        quick = manager.get_quick_summary()
+
+        assert quick["CPU"] == "Contoso CPU"
+        assert quick["RAM"] == "16.0 GB (50% used)"
+        # Live counters and the section that failed the first time are asked for again
+        assert len(pool.scripts) == 2
+        assert "Win32_BIOS" in pool.scripts[1]
+        assert "$Sections['memory_usage']" in pool.scripts[1]
+        assert "$Sections['cpu']" not in pool.scripts[1]
+
+
 # Windows-specific tests
 @pytest.mark.skipif(platform.system() != "Windows", reason="Windows-specific test")
 class TestSystemInfoManagerWindows: